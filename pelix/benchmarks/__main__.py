@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# -- Content-Encoding: UTF-8 --
+"""
+Runs the Pelix benchmarks and prints their results in JSON format
+
+:author: Thomas Calmant
+:copyright: Copyright 2017, Thomas Calmant
+:license: Apache License 2.0
+:version: 0.6.6
+
+..
+
+    Copyright 2017 Thomas Calmant
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+# Standard library
+import argparse
+import json
+import platform
+import sys
+
+# Pelix
+import pelix.benchmarks.memory as memory
+import pelix.benchmarks.startup as startup
+
+# Module version
+__version_info__ = (0, 6, 6)
+__version__ = ".".join(str(x) for x in __version_info__)
+
+# Documentation strings format
+__docformat__ = "restructuredtext en"
+
+# ------------------------------------------------------------------------------
+
+
+def parse_property(value):
+    """
+    Parses a framework property given as a ``name=value`` argument
+
+    :param value: Argument value
+    :return: A (name, value) tuple
+    :raise argparse.ArgumentTypeError: Invalid argument
+    """
+    name, sep, prop_value = value.partition("=")
+    if not sep or not name:
+        raise argparse.ArgumentTypeError(
+            "Properties must be given as name=value")
+    return name.strip(), prop_value.strip()
+
+
+def main(argv=None):
+    """
+    Entry point
+
+    :param argv: Script arguments (None for sys.argv)
+    :return: An exit code or None
+    """
+    parser = argparse.ArgumentParser(
+        prog="pelix.benchmarks",
+        description="Times the life cycle of a framework hosting generated "
+                    "bundles and iPOPO components, or measures the memory "
+                    "footprint of iPOPO components")
+    parser.add_argument("benchmark", nargs="?", default="startup",
+                        choices=("startup", "memory"),
+                        help="Benchmark to run (startup by default)")
+    parser.add_argument("-b", "--bundles", type=int, default=50,
+                        help="Number of generated bundles")
+    parser.add_argument("-c", "--components", type=int, default=5,
+                        help="Number of components per bundle")
+    parser.add_argument("-d", "--dependencies", type=int, default=2,
+                        help="Number of service dependencies per component")
+    parser.add_argument("-i", "--instances", type=int, default=10000,
+                        help="Number of components instantiated by the "
+                             "memory benchmark")
+    parser.add_argument("-r", "--runs", type=int, default=5,
+                        help="Number of measured runs")
+    parser.add_argument("-p", "--property", dest="properties",
+                        action="append", type=parse_property, default=[],
+                        metavar="NAME=VALUE",
+                        help="Framework property (can be repeated)")
+    parser.add_argument("-o", "--output", default=None,
+                        help="Output file (standard output by default)")
+    args = parser.parse_args(argv)
+
+    for name in ("bundles", "components", "instances", "runs"):
+        if getattr(args, name) < 1:
+            parser.error("The number of {0} must be positive".format(name))
+    if args.dependencies < 0:
+        parser.error("The number of dependencies can't be negative")
+
+    if args.benchmark == "memory":
+        results = memory.run_benchmark(args.instances, dict(args.properties))
+    else:
+        results = startup.run_benchmark(
+            args.bundles, args.components, args.dependencies, args.runs,
+            dict(args.properties))
+    results["environment"] = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "pelix": __version__}
+
+    content = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as filep:
+            filep.write(content)
+    else:
+        print(content)
+
+
+if __name__ == '__main__':
+    # Run the entry point
+    sys.exit(main() or 0)
@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# -- Content-Encoding: UTF-8 --
+"""
+Benchmark of the memory footprint of iPOPO components: instantiates many
+lightweight components and measures the memory allocated for each of them
+(component instance, iPOPO bookkeeping and provided service).
+
+:author: Thomas Calmant
+:copyright: Copyright 2017, Thomas Calmant
+:license: Apache License 2.0
+:version: 0.6.6
+
+..
+
+    Copyright 2017 Thomas Calmant
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+# Standard library
+import gc
+
+try:
+    # Python 3.4+
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+# Pelix
+from pelix.framework import FrameworkFactory, create_framework
+from pelix.ipopo.constants import use_ipopo
+from pelix.ipopo.decorators import ComponentFactory, Property, Provides, \
+    Requires
+
+# Module version
+__version_info__ = (0, 6, 6)
+__version__ = ".".join(str(x) for x in __version_info__)
+
+# Documentation strings format
+__docformat__ = "restructuredtext en"
+
+# ------------------------------------------------------------------------------
+
+FACTORY = "pelix.benchmarks.memory.factory"
+""" Name of the factory of the measured components """
+
+SPEC_PROVIDED = "pelix.benchmarks.memory.provided"
+""" Specification provided by the measured components """
+
+SPEC_REQUIRED = "pelix.benchmarks.memory.required"
+""" Specification required (optionally) by the measured components """
+
+# ------------------------------------------------------------------------------
+
+
+@ComponentFactory(FACTORY)
+@Provides(SPEC_PROVIDED)
+@Requires("_dependency", SPEC_REQUIRED, optional=True)
+@Property("_value", "benchmark.value", 0)
+class _LightweightComponent(object):
+    """
+    A lightweight component: one property, one provided service and one
+    optional dependency
+    """
+    def __init__(self):
+        """
+        Sets up members
+        """
+        self._dependency = None
+        self._value = 0
+
+# ------------------------------------------------------------------------------
+
+
+def run_benchmark(instances, properties=None):
+    """
+    Measures the memory allocated by the instantiation of components
+
+    :param instances: Number of components to instantiate
+    :param properties: Framework properties
+    :return: A dictionary with the parameters, the total number of bytes
+             allocated by the components and the number of bytes per component
+    :raise RuntimeError: The tracemalloc module is not available
+    """
+    if tracemalloc is None:
+        raise RuntimeError("The memory benchmark requires the tracemalloc "
+                           "module (Python 3.4+)")
+
+    framework = create_framework(["pelix.ipopo.core"], properties)
+    try:
+        framework.start()
+        context = framework.get_bundle_context()
+        with use_ipopo(context) as ipopo:
+            ipopo.register_factory(context, _LightweightComponent)
+
+            gc.collect()
+            tracemalloc.start()
+            try:
+                before = tracemalloc.get_traced_memory()[0]
+                for idx in range(instances):
+                    ipopo.instantiate(
+                        FACTORY, "pelix.benchmarks.memory.{0}".format(idx))
+
+                gc.collect()
+                allocated = tracemalloc.get_traced_memory()[0] - before
+            finally:
+                tracemalloc.stop()
+
+            valid = len(ipopo.get_instances())
+
+        if valid != instances:
+            raise ValueError("Only {0} components out of {1} have been "
+                             "instantiated".format(valid, instances))
+    finally:
+        FrameworkFactory.delete_framework(framework)
+
+    return {"benchmark": "memory",
+            "parameters": {"instances": instances,
+                           "properties": dict(properties or {})},
+            "total": allocated,
+            "per_instance": allocated / float(instances)}
@@ -0,0 +1,226 @@
+#!/usr/bin/env python
+# -- Content-Encoding: UTF-8 --
+"""
+Benchmark of the life cycle of a framework: generates bundles providing
+iPOPO components which depend on the services of the previous bundles, then
+times the creation, start, validation of the components, stop and deletion of
+the framework.
+
+:author: Thomas Calmant
+:copyright: Copyright 2017, Thomas Calmant
+:license: Apache License 2.0
+:version: 0.6.6
+
+..
+
+    Copyright 2017 Thomas Calmant
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+# Standard library
+import sys
+import time
+import types
+
+try:
+    # Python 3.3+
+    _timer = time.perf_counter
+except AttributeError:
+    _timer = time.time
+
+# Pelix
+from pelix.framework import FrameworkFactory, create_framework
+from pelix.ipopo.decorators import ComponentFactory, Instantiate, Provides, \
+    Requires, Validate
+
+# Module version
+__version_info__ = (0, 6, 6)
+__version__ = ".".join(str(x) for x in __version_info__)
+
+# Documentation strings format
+__docformat__ = "restructuredtext en"
+
+# ------------------------------------------------------------------------------
+
+PHASES = ("create", "start", "validation", "stop", "delete")
+""" Measured phases, in order """
+
+# ------------------------------------------------------------------------------
+
+
+class _ValidationCounter(object):
+    """
+    Counts the validated components and keeps the time of the last validation
+    """
+    def __init__(self):
+        """
+        Sets up members
+        """
+        self.count = 0
+        self.last = None
+
+    def validated(self):
+        """
+        Called back by a component when it is validated
+        """
+        self.count += 1
+        self.last = _timer()
+
+
+def _specification(run, bundle, component):
+    """
+    Returns the specification provided by a generated component
+    """
+    return "pelix.benchmarks.spec.{0}.{1}.{2}".format(run, bundle, component)
+
+
+def _make_component(module_name, run, bundle, component, dependencies,
+                    counter):
+    """
+    Generates a component class
+
+    :param module_name: Name of the module of the class
+    :param run: Index of the run
+    :param bundle: Index of the bundle
+    :param component: Index of the component in its bundle
+    :param dependencies: Number of service dependencies
+    :param counter: The _ValidationCounter of the run
+    :return: The manipulated class
+    """
+    @Validate
+    def validate(self, context):
+        """
+        Component validated
+        """
+        counter.validated()
+
+    name = "Component{0}".format(component)
+    clazz = type(name, (object,), {"__module__": module_name,
+                                    "validate": validate})
+
+    # Depend on the components of the previous bundles, to avoid cycles
+    for dependency in range(dependencies):
+        target = bundle - dependency - 1
+        if target < 0:
+            break
+        clazz = Requires("_dep{0}".format(dependency),
+                         _specification(run, target, component))(clazz)
+
+    clazz = Provides(_specification(run, bundle, component))(clazz)
+    clazz = Instantiate("{0}-{1}".format(module_name, component))(clazz)
+    return ComponentFactory("{0}-factory-{1}".format(
+        module_name, component))(clazz)
+
+
+def generate_bundles(run, bundles, components, dependencies, counter):
+    """
+    Generates the modules of the bundles of a run and stores them in
+    ``sys.modules``
+
+    :param run: Index of the run
+    :param bundles: Number of bundles
+    :param components: Number of components per bundle
+    :param dependencies: Number of service dependencies per component
+    :param counter: The _ValidationCounter of the run
+    :return: The names of the generated modules
+    """
+    names = []
+    for bundle in range(bundles):
+        module_name = "_pelix_benchmark_{0}_{1}".format(run, bundle)
+        module_ = types.ModuleType(module_name)
+        for component in range(components):
+            clazz = _make_component(module_name, run, bundle, component,
+                                    dependencies, counter)
+            setattr(module_, clazz.__name__, clazz)
+
+        sys.modules[module_name] = module_
+        names.append(module_name)
+
+    return names
+
+
+def run_once(run, bundles, components, dependencies, properties=None):
+    """
+    Times the life cycle of a framework with generated bundles
+
+    :param run: Index of the run
+    :param bundles: Number of bundles
+    :param components: Number of components per bundle
+    :param dependencies: Number of service dependencies per component
+    :param properties: Framework properties
+    :return: A dictionary: phase -> duration in seconds
+    :raise ValueError: Some components have not been validated
+    """
+    counter = _ValidationCounter()
+    names = generate_bundles(run, bundles, components, dependencies, counter)
+    try:
+        start = _timer()
+        framework = create_framework(
+            ["pelix.ipopo.core"] + names, properties)
+        created = _timer()
+        framework.start()
+        started = _timer()
+
+        if counter.count != bundles * components:
+            FrameworkFactory.delete_framework(framework)
+            raise ValueError("Only {0} components out of {1} have been "
+                             "validated".format(counter.count,
+                                                bundles * components))
+
+        framework.stop()
+        stopped = _timer()
+        FrameworkFactory.delete_framework(framework)
+        deleted = _timer()
+    finally:
+        for name in names:
+            sys.modules.pop(name, None)
+
+    return {"create": created - start,
+            "start": started - created,
+            "validation": counter.last - created,
+            "stop": stopped - started,
+            "delete": deleted - stopped}
+
+
+def run_benchmark(bundles, components, dependencies, runs=1,
+                  properties=None):
+    """
+    Runs the life cycle benchmark
+
+    :param bundles: Number of bundles
+    :param components: Number of components per bundle
+    :param dependencies: Number of service dependencies per component
+    :param runs: Number of runs
+    :param properties: Framework properties
+    :return: A dictionary with the parameters, the results of each run
+             and the minimum, mean and maximum duration of each phase
+    """
+    results = [run_once(run, bundles, components, dependencies, properties)
+               for run in range(runs)]
+
+    summary = {}
+    for phase in PHASES:
+        values = [result[phase] for result in results]
+        summary[phase] = {"min": min(values),
+                          "mean": sum(values) / len(values),
+                          "max": max(values)}
+
+    return {"benchmark": "startup",
+            "parameters": {"bundles": bundles,
+                           "components": components,
+                           "dependencies": dependencies,
+                           "runs": runs,
+                           "properties": dict(properties or {})},
+            "runs": results,
+            "summary": summary}
@@ -59,6 +59,21 @@ It must be an object with the following methods:
 * stop(BundleContext)
 """
 
+START_LEVEL = "__pelix_start_level__"
+"""
+Name of the module member giving the start level of a bundle: an integer,
+1 by default.
+When the framework starts its bundles in parallel, it starts those of a level
+once all the bundles of the lower levels have been started.
+"""
+
+BUNDLE_REQUIRES = "__pelix_requires__"
+"""
+Name of the module member listing the symbolic names of the bundles which must
+be started before this one, when the framework starts its bundles in
+parallel. Only the bundles with the same start level are considered.
+"""
+
 OBJECTCLASS = "objectClass"
 """
 Property containing the list of specifications (strings) provided by a service
@@ -98,6 +113,13 @@ This allows the framework to detect service factories and prototype service
 factories.
 """
 
+SERVICE_PLACEHOLDER = "pelix.service.placeholder"
+"""
+Property set to True on the services registered by the framework as
+placeholders of the services of a lazy bundle. Getting such a service
+activates the bundle and returns the real service.
+"""
+
 FRAMEWORK_UID = "framework.uid"
 """
 Framework instance "unique" identifier. Used in Remote Services to identify
@@ -106,6 +128,70 @@ It can be generated or be forced using the framework initialization properties.
 This property is constant during the life of a framework instance.
 """
 
+LDAP_FILTER_CACHE_SIZE = "pelix.ldapfilter.cache.size"
+"""
+Framework property indicating the maximum number of parsed LDAP filter strings
+kept in the process-wide cache of :mod:`pelix.ldapfilter`.
+The cache is disabled if this value is 0.
+"""
+
+REGISTRY_INDEXED_PROPERTIES = "pelix.registry.indexes"
+"""
+Framework property listing the service properties indexed by the service
+registry, as a list or a comma-separated string.
+Lookups with an LDAP filter containing equality criteria on those properties
+only test the services having the requested values.
+"""
+
+FRAMEWORK_MODULES_INDEX = "pelix.framework.modules.index"
+"""
+Framework property giving the path to a file where the content of the folders
+visited by ``install_package()`` and ``install_visiting()`` is cached.
+Only the folders which have been modified since the previous visit are
+scanned again.
+"""
+
+FRAMEWORK_PROFILE = "pelix.framework.profile"
+"""
+Framework property activating the boot profiler when set to True.
+The profiler records the time spent importing bundles, calling their
+activators and instantiating and validating iPOPO components.
+"""
+
+FRAMEWORK_START_THREADS = "pelix.framework.start.threads"
+"""
+Framework property giving the number of threads starting the bundles when the
+framework starts. Bundles are started one at a time, in installation order,
+if this value is not greater than 1 (default).
+"""
+
+REGISTRY_CHANGES_SIZE = "pelix.registry.changes.size"
+"""
+Framework property giving the number of modifications kept in the change feed
+of the service registry (1024 by default, 0 to disable the feed).
+"""
+
+SERVICE_EVENTS_ASYNC = "pelix.services.events.async"
+"""
+Framework property allowing service listeners to receive their events
+asynchronously, when they ask for it while registering.
+Those events are delivered in order, by a pool of threads.
+Events are delivered synchronously if this property is not set to True.
+"""
+
+SERVICE_EVENTS_QUEUE_SIZE = "pelix.services.events.queue.size"
+"""
+Framework property giving the maximum number of events waiting to be
+delivered to an asynchronous service listener (1000 by default, 0 for no
+limit). The thread firing an event waits while the queue is full.
+"""
+
+SERVICE_EVENTS_THREADS = "pelix.services.events.threads"
+"""
+Framework property giving the maximum number of threads delivering events to
+asynchronous service listeners (4 by default).
+"""
+
 # ------------------------------------------------------------------------------
 
 SCOPE_SINGLETON = "singleton"
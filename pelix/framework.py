@@ -31,6 +31,7 @@ Pelix is a Python framework that aims to act as OSGi as much as possible
 import collections
 import importlib
 import inspect
+import json
 import logging
 import os
 import sys
@@ -40,19 +41,26 @@ import uuid
 
 # Standard typing module should be optional
 try:
-    from typing import Any, List, Optional, Set, Union
+    from typing import Any, Callable, List, Optional, Set, Tuple, Union
 except ImportError:
     pass
 
 # Pelix beans and constants
-from pelix.constants import ACTIVATOR, ACTIVATOR_LEGACY, FRAMEWORK_UID, \
-    BundleException, FrameworkException
+from pelix.constants import ACTIVATOR, ACTIVATOR_LEGACY, BUNDLE_REQUIRES, \
+    FRAMEWORK_MODULES_INDEX, FRAMEWORK_PROFILE, FRAMEWORK_START_THREADS, \
+    FRAMEWORK_UID, LDAP_FILTER_CACHE_SIZE, OBJECTCLASS, \
+    SERVICE_EVENTS_ASYNC, SERVICE_EVENTS_QUEUE_SIZE, SERVICE_EVENTS_THREADS, \
+    SERVICE_PLACEHOLDER, START_LEVEL, BundleException, FrameworkException
 from pelix.internals.events import BundleEvent, ServiceEvent
+from pelix.internals.profiler import BootProfiler, KIND_ACTIVATOR, \
+    KIND_IMPORT
 from pelix.internals.registry import EventDispatcher, ServiceRegistry, \
     ServiceReference, ServiceRegistration
 
 # Pelix utility modules
 from pelix.utilities import is_string
+import pelix.ldapfilter
+import pelix.threadpool
 
 
 if hasattr(importlib, "reload"):
@@ -83,17 +91,19 @@ else:
         return imp.reload(module_)
 
 
-def walk_modules(path):
+def _scan_folder(path):
+    # type: (str) -> Tuple[List[Tuple[str, bool]], List[str]]
     """
-    Code from ``pkgutil.ImpImporter.iter_modules()``: walks through a folder
-    and yields all loadable packages and modules.
+    Code from ``pkgutil.ImpImporter.iter_modules()``: lists the loadable
+    packages and modules of a folder.
 
     :param path: Path where to look for modules
-    :return: Generator to walk through found packages and modules
+    :return: A 2-tuple: the list of (name, is_package) tuples of the found
+             modules and the list of the names of the sub-folders which have
+             been checked for an ``__init__`` module
     """
-    if path is None or not os.path.isdir(path):
-        return
-
+    modules = []
+    folders = []
     yielded = set()
     try:
         file_names = os.listdir(path)
@@ -114,6 +124,7 @@ def walk_modules(path):
 
         if not modname and os.path.isdir(file_path) and '.' not in filename:
             modname = filename
+            folders.append(filename)
             try:
                 dir_contents = os.listdir(file_path)
             except OSError:
@@ -131,7 +142,23 @@ def walk_modules(path):
 
         if modname and '.' not in modname:
             yielded.add(modname)
-            yield modname, is_package
+            modules.append((modname, is_package))
+
+    return modules, folders
+
+
+def walk_modules(path):
+    """
+    Walks through a folder and yields all loadable packages and modules.
+
+    :param path: Path where to look for modules
+    :return: Generator to walk through found packages and modules
+    """
+    if path is None or not os.path.isdir(path):
+        return
+
+    for item in _scan_folder(path)[0]:
+        yield item
 
 # ------------------------------------------------------------------------------
 
@@ -149,13 +176,236 @@ _logger = logging.getLogger("pelix.main")
 # ------------------------------------------------------------------------------
 
 
+def _import_bundle_module(name, path=None, profiler=None):
+    # type: (str, Optional[str], Optional[BootProfiler]) -> types.ModuleType
+    """
+    Imports the module of a bundle, if necessary
+
+    :param name: Name of the module
+    :param path: Preferred path to load the module
+    :param profiler: Boot profiler timing the import (optional)
+    :return: The module
+    :raise BundleException: Error importing the module
+    """
+    step = profiler.start(KIND_IMPORT, name) if profiler is not None \
+        else None
+    try:
+        if path:
+            # Use the given path in priority
+            sys.path.insert(0, path)
+
+        try:
+            # The module has already been loaded
+            module_ = sys.modules[name]
+        except KeyError:
+            # Load the module
+            #  __import__(name) -> package level
+            # import_module -> module level
+            module_ = importlib.import_module(name)
+    except (ImportError, IOError) as ex:
+        # Error importing the module
+        raise BundleException("Error installing bundle {0}: {1}"
+                              .format(name, ex))
+    finally:
+        if path:
+            # Clean up the path. The loaded module(s) might
+            # have changed the path content, so do not use an
+            # index
+            sys.path.remove(path)
+
+        if step is not None:
+            profiler.stop(step)
+
+    # Add the module to sys.modules, just to be sure
+    sys.modules[name] = module_
+    return module_
+
+
+class ModulesIndex(object):
+    """
+    On-disk cache of the content of the folders visited by
+    ``install_visiting()`` and ``install_package()``.
+
+    Each folder entry is associated to the modification time of the folder
+    and of its sub-folders: a folder is scanned again only if one of them has
+    changed, e.g. when a module has been added or an ``__init__`` module
+    created.
+    """
+    FORMAT_VERSION = 1
+    """ Version of the format of the index file """
+
+    def __init__(self, filename):
+        # type: (str) -> None
+        """
+        Loads the index from the given file, if it exists
+
+        :param filename: Path to the index file
+        """
+        self.__filename = filename
+        self.__folders = {}
+        self.__dirty = False
+        self.__lock = threading.Lock()
+
+        try:
+            with open(filename) as filep:
+                content = json.load(filep)
+        except (IOError, OSError):
+            # No index yet
+            return
+        except ValueError as ex:
+            _logger.warning("Invalid modules index %s: %s", filename, ex)
+            return
+
+        try:
+            if content.get("version") == self.FORMAT_VERSION:
+                self.__folders = dict(content["folders"])
+        except (AttributeError, KeyError, TypeError) as ex:
+            _logger.warning("Invalid modules index %s: %s", filename, ex)
+
+    @staticmethod
+    def __get_mtime(path):
+        # type: (str) -> Optional[float]
+        """
+        Returns the modification time of the given path
+
+        :param path: A file or folder path
+        :return: The modification time, or None if it can't be read
+        """
+        try:
+            return os.stat(path).st_mtime
+        except OSError:
+            return None
+
+    def __is_valid(self, path, entry):
+        # type: (str, dict) -> bool
+        """
+        Checks if the given folder entry is still valid
+
+        :param path: Path of the folder
+        :param entry: Index entry of the folder
+        :return: True if neither the folder nor its sub-folders have changed
+        """
+        if self.__get_mtime(path) != entry["mtime"]:
+            return False
+
+        for name, mtime in entry["folders"].items():
+            if self.__get_mtime(os.path.join(path, name)) != mtime:
+                return False
+
+        return True
+
+    def get_modules(self, path):
+        # type: (str) -> List[Tuple[str, bool]]
+        """
+        Returns the loadable modules and packages of the given folder, using
+        the index if it is up to date
+
+        :param path: Absolute path to a folder
+        :return: A list of (name, is_package) tuples
+        """
+        with self.__lock:
+            entry = self.__folders.get(path)
+            try:
+                if entry is not None and self.__is_valid(path, entry):
+                    return [(name, bool(is_package))
+                            for name, is_package in entry["modules"]]
+            except (AttributeError, KeyError, TypeError, ValueError):
+                # Invalid entry: scan the folder again
+                pass
+
+            # Read the modification time before scanning, to scan again if
+            # the folder is modified meanwhile
+            mtime = self.__get_mtime(path)
+            modules, folders = _scan_folder(path)
+            self.__folders[path] = {
+                "mtime": mtime,
+                "folders": dict((name, self.__get_mtime(
+                    os.path.join(path, name))) for name in folders),
+                "modules": modules}
+            self.__dirty = True
+            return modules
+
+    def save(self):
+        # type: () -> bool
+        """
+        Writes the index to its file, if it has been modified
+
+        :return: True if the file has been written
+        """
+        with self.__lock:
+            if not self.__dirty:
+                return False
+
+            try:
+                with open(self.__filename, "w") as filep:
+                    json.dump({"version": self.FORMAT_VERSION,
+                               "folders": self.__folders}, filep)
+            except (IOError, OSError) as ex:
+                _logger.warning("Error writing the modules index %s: %s",
+                                self.__filename, ex)
+                return False
+
+            self.__dirty = False
+            return True
+
+# ------------------------------------------------------------------------------
+
+
+class _ServicePlaceholder(object):
+    """
+    Service object registered in place of a service of a lazy bundle, until
+    its activation. Consumers never get it: ``get_service()`` on its
+    reference gives the real service.
+    """
+    __slots__ = ("__bundle", "__specification")
+
+    def __init__(self, bundle, specification):
+        # type: (Bundle, str) -> None
+        """
+        :param bundle: The lazy bundle providing the service
+        :param specification: The specification of the service
+        """
+        self.__bundle = bundle
+        self.__specification = specification
+
+    def __str__(self):
+        """
+        String representation
+        """
+        return "ServicePlaceholder({0}, {1})".format(
+            self.__specification, self.__bundle.get_symbolic_name())
+
+    __repr__ = __str__
+
+    def get_bundle(self):
+        # type: () -> Bundle
+        """
+        Retrieves the lazy bundle providing the service
+
+        :return: A Bundle object
+        """
+        return self.__bundle
+
+    def get_specification(self):
+        # type: () -> str
+        """
+        Retrieves the specification of the service
+
+        :return: A specification name
+        """
+        return self.__specification
+
+# ------------------------------------------------------------------------------
+
+
 class Bundle(object):
     """
     Represents a "bundle" in Pelix
     """
     __slots__ = ("_lock", "__context", "__id", "__module", "__name",
                  "__framework", "_state", "__registered_services",
-                 "__registration_lock")
+                 "__registration_lock", "__lazy_specifications", "__lazy_path",
+                 "__placeholders")
 
     UNINSTALLED = 1
     """ The bundle is uninstalled and may not be used """
@@ -175,15 +425,19 @@ class Bundle(object):
     ACTIVE = 32
     """ The bundle is now running """
 
-    def __init__(self, framework, bundle_id, name, module_):
-        # type: (Framework, int, str, types.ModuleType) -> None
+    def __init__(self, framework, bundle_id, name, module_,
+                 lazy_specifications=None, lazy_path=None):
+        # type: (Framework, int, str, Optional[types.ModuleType], Optional[tuple], Optional[str]) -> None
         """
         Sets up the bundle descriptor
 
         :param framework: The host framework
         :param bundle_id: The ID of the bundle in the host framework
         :param name: The bundle symbolic name
-        :param module_: The bundle module
+        :param module_: The bundle module (None for a lazy bundle)
+        :param lazy_specifications: Specifications of the services provided by
+                                    a lazy bundle
+        :param lazy_path: Preferred path to load the module of a lazy bundle
         """
         # A re-entrant lock for synchronization
         self._lock = threading.RLock()
@@ -201,6 +455,11 @@ class Bundle(object):
         self.__registered_services = set()  # type: Set[ServiceRegistration]
         self.__registration_lock = threading.Lock()
 
+        # Lazy activation
+        self.__lazy_specifications = lazy_specifications
+        self.__lazy_path = lazy_path
+        self.__placeholders = []  # type: List[ServiceRegistration]
+
     def __str__(self):
         """
         String representation
@@ -286,15 +545,51 @@ class Bundle(object):
         return getattr(self.__module, '__file__', "")
 
     def get_module(self):
+        # type: () -> Optional[types.ModuleType]
+        """
+        Retrieves the Python module corresponding to the bundle.
 
-        # type: () -> types.ModuleType
+        The module of a lazy bundle waiting for its activation (started, in
+        STARTING state) is imported and the bundle is activated by this call,
+        i.e. its activator is called in the caller thread. The module of a
+        lazy bundle which has not been started is not imported: None is
+        returned in that case.
+
+        :return: The Python module, or None
+        :raise BundleException: Error activating a lazy bundle
         """
-        Retrieves the Python module corresponding to the bundle
+        if self.__module is None and self.__is_lazy_waiting():
+            self._lazy_activate()
+        return self.__module
 
-        :return: The Python module
+    def _get_loaded_module(self):
+        # type: () -> Optional[types.ModuleType]
+        """
+        Retrieves the Python module corresponding to the bundle, without
+        activating a lazy bundle (**internal**)
+
+        :return: The Python module, or None if it has not been imported yet
         """
         return self.__module
 
+    def is_lazy(self):
+        # type: () -> bool
+        """
+        Checks if the bundle has a lazy activation policy
+
+        :return: True if the bundle is activated on its first use
+        """
+        return self.__lazy_specifications is not None
+
+    def __is_lazy_waiting(self):
+        # type: () -> bool
+        """
+        Checks if the bundle is a started lazy bundle, waiting for its first
+        use to be activated
+        """
+        return self.__module is None and self._state == Bundle.STARTING \
+            and self.__lazy_specifications is not None
+
     def get_registered_services(self):
         # type: () -> List[ServiceReference]
         """
@@ -397,32 +692,99 @@ class Bundle(object):
             self._state = Bundle.STARTING
             self._fire_bundle_event(BundleEvent.STARTING)
 
-            # Call the activator, if any
-            starter = self.__get_activator_method('start')
-            if starter is not None:
-                try:
-                    # Call the start method
-                    starter(self.__context)
-                except (FrameworkException, BundleException):
-                    # Restore previous state
-                    self._state = previous_state
+            if self.__module is None:
+                # Lazy bundle: stay in STARTING state until the first use of
+                # one of the placeholders of its services
+                self.__placeholders = \
+                    self.__framework._register_placeholders(
+                        self, self.__lazy_specifications)
+                return
 
-                    # Re-raise directly Pelix exceptions
-                    _logger.exception("Pelix error raised by %s while "
-                                      "starting", self.__name)
-                    raise
-                except Exception as ex:
-                    # Restore previous state
-                    self._state = previous_state
+            self.__activate(previous_state)
 
-                    # Raise the error
-                    _logger.exception("Error raised by %s while starting",
-                                      self.__name)
-                    raise BundleException(ex)
+    def __activate(self, previous_state):
+        # type: (int) -> None
+        """
+        Calls the activator of the bundle and sets it in ACTIVE state.
+        The bundle lock must be held by the caller.
 
-            # Bundle is now active
-            self._state = Bundle.ACTIVE
-            self._fire_bundle_event(BundleEvent.STARTED)
+        :param previous_state: State to restore on error
+        :raise BundleException: The activator failed
+        """
+        # Call the activator, if any
+        starter = self.__get_activator_method('start')
+        if starter is not None:
+            profiler = self.__framework.get_profiler()
+            step = profiler.start(KIND_ACTIVATOR, self.__name) \
+                if profiler is not None else None
+            try:
+                # Call the start method
+                starter(self.__context)
+            except (FrameworkException, BundleException):
+                # Restore previous state
+                self._state = previous_state
+
+                # Re-raise directly Pelix exceptions
+                _logger.exception("Pelix error raised by %s while "
+                                  "starting", self.__name)
+                raise
+            except Exception as ex:
+                # Restore previous state
+                self._state = previous_state
+
+                # Raise the error
+                _logger.exception("Error raised by %s while starting",
+                                  self.__name)
+                raise BundleException(ex)
+            finally:
+                if step is not None:
+                    profiler.stop(step)
+
+        # Bundle is now active
+        self._state = Bundle.ACTIVE
+        self._fire_bundle_event(BundleEvent.STARTED)
+
+    def _lazy_activate(self):
+        # type: () -> None
+        """
+        Loads the module of a lazy bundle waiting for its activation, calls
+        its activator then unregisters the placeholders of its services.
+        Does nothing if the bundle is not waiting for its activation.
+
+        :raise BundleException: Error loading or activating the bundle
+        """
+        with self._lock:
+            if not self.__is_lazy_waiting():
+                return
+
+            try:
+                self.__module = _import_bundle_module(
+                    self.__name, self.__lazy_path,
+                    self.__framework.get_profiler())
+                self.__activate(Bundle.RESOLVED)
+            except (FrameworkException, BundleException):
+                # Activation failed: stop the bundle
+                self.__module = None
+                self._state = Bundle.RESOLVED
+                self.__unregister_placeholders()
+                raise
+
+            # Real services are registered: remove the placeholders
+            self.__unregister_placeholders()
+
+    def __unregister_placeholders(self):
+        # type: () -> None
+        """
+        Unregisters the placeholders of the services of a lazy bundle
+        """
+        placeholders = self.__placeholders
+        self.__placeholders = []
+        for registration in placeholders:
+            try:
+                registration.unregister()
+            except BundleException:
+                # Already unregistered
+                pass
 
     def stop(self):
         """
@@ -430,12 +792,15 @@ class Bundle(object):
 
         :raise BundleException: The bundle activator failed.
         """
-        if self._state != Bundle.ACTIVE:
+        if self._state != Bundle.ACTIVE and not self.__is_lazy_waiting():
             # Invalid state
             return
 
         exception = None
         with self._lock:
+            # Forget the placeholders (unregistered with other services)
+            self.__placeholders = []
+
             # Store the bundle current state
             previous_state = self._state
 
@@ -473,6 +838,9 @@ class Bundle(object):
             # Remove remaining services (the hard way)
             self.__unregister_services()
 
+            # Release the services it got through placeholders
+            self.__framework._release_placeholders(self)
+
             # Bundle is now stopped and all its services have been unregistered
             self._state = Bundle.RESOLVED
             self._fire_bundle_event(BundleEvent.STOPPED)
@@ -510,7 +878,7 @@ class Bundle(object):
         Uninstalls the bundle
         """
         with self._lock:
-            if self._state == Bundle.ACTIVE:
+            if self._state == Bundle.ACTIVE or self.__is_lazy_waiting():
                 self.stop()
 
             # Change the bundle state
@@ -525,7 +893,7 @@ class Bundle(object):
         """
         with self._lock:
             # Was it active ?
-            restart = self._state == Bundle.ACTIVE
+            restart = self._state == Bundle.ACTIVE or self.__is_lazy_waiting()
 
             # Send the update event
             self._fire_bundle_event(BundleEvent.UPDATE_BEGIN)
@@ -538,6 +906,13 @@ class Bundle(object):
                 self._fire_bundle_event(BundleEvent.UPDATE_FAILED)
                 raise
 
+            if self.__module is None:
+                # Lazy bundle not yet loaded: nothing to reload
+                if restart:
+                    self.start()
+                self._fire_bundle_event(BundleEvent.UPDATED)
+                return
+
             # Change the source file age
             module_stat = None
             module_file = getattr(self.__module, "__file__", None)
@@ -633,26 +1008,101 @@ class Framework(Bundle):
         # Properties lock
         self.__properties_lock = threading.Lock()
 
+        # Size of the parsed LDAP filters cache: the cache is process-wide,
+        # so keep the previous size to restore it on deletion
+        self._previous_cache_size = None
+        cache_size = self.get_property(LDAP_FILTER_CACHE_SIZE)
+        if cache_size is not None:
+            try:
+                cache_size = int(cache_size)
+            except (TypeError, ValueError):
+                _logger.warning("Invalid LDAP filter cache size: %s",
+                                cache_size)
+            else:
+                self._previous_cache_size = \
+                    pelix.ldapfilter.get_cache_info()["max_size"]
+                pelix.ldapfilter.set_cache_size(cache_size)
+
         # Bundles (start at 1, as 0 is reserved for the framework itself)
         self.__next_bundle_id = 1
 
         # Bundle ID -> Bundle object
         self.__bundles = {}
 
+        # Bundle symbolic name -> Bundle object
+        self.__bundles_names = {}
+
         # Bundles lock
         self.__bundles_lock = threading.RLock()
 
+        # Modules index, used when visiting folders
+        index_file = self.get_property(FRAMEWORK_MODULES_INDEX)
+        self.__modules_index = ModulesIndex(index_file) if index_file \
+            else None
+
+        # Boot profiler
+        self._profiler = BootProfiler() \
+            if self.__get_flag(FRAMEWORK_PROFILE) else None
+
         # Event dispatcher
-        self._dispatcher = EventDispatcher()
+        self._dispatcher = self.__make_dispatcher()
 
         # Service registry
         self._registry = ServiceRegistry(self)
         self.__unregistering_services = {}
 
+        # (Bundle, Placeholder reference) -> [real service references]
+        self.__placeholders_refs = {}
+        self.__placeholders_lock = threading.Lock()
+
         # The wait_for_stop event (initially stopped)
         self._fw_stop_event = threading.Event()
         self._fw_stop_event.set()
 
+        # Parallel start: flag and end signal (shares the framework lock),
+        # and flag of the threads of the start pool starting a bundle
+        self.__parallel_start = False
+        self.__start_condition = threading.Condition(self._lock)
+        self.__start_local = threading.local()
+
+    def __get_flag(self, name):
+        # type: (str) -> bool
+        """
+        Reads a boolean framework property, which can be given as a string
+
+        :param name: Name of the property
+        :return: The boolean value of the property (False if not set)
+        """
+        value = self.get_property(name)
+        if is_string(value):
+            return value.strip().lower() in ("true", "1")
+        return bool(value)
+
+    def __make_dispatcher(self):
+        # type: () -> EventDispatcher
+        """
+        Prepares the event dispatcher according to the framework properties
+
+        :return: The event dispatcher
+        """
+        async_events = self.__get_flag(SERVICE_EVENTS_ASYNC)
+
+        settings = {}
+        for name, key, default, minimum in (
+                (SERVICE_EVENTS_QUEUE_SIZE, "queue_size", 1000, 0),
+                (SERVICE_EVENTS_THREADS, "max_threads", 4, 1)):
+            value = self.get_property(name)
+            try:
+                value = int(value) if value is not None else default
+                if value < minimum:
+                    raise ValueError(value)
+            except (TypeError, ValueError):
+                _logger.warning("Invalid value for %s: %s", name, value)
+                value = default
+            settings[key] = value
+
+        return EventDispatcher(async_events=async_events, **settings)
+
     def add_property(self, name, value):
         # type: (str, object) -> bool
         """
@@ -726,13 +1176,7 @@ class Framework(Bundle):
             return self
 
         with self.__bundles_lock:
-            for bundle in self.__bundles.values():
-                if bundle_name == bundle.get_symbolic_name():
-                    # Found !
-                    return bundle
-
-            # Not found...
-            return None
+            return self.__bundles_names.get(bundle_name)
 
     def get_bundles(self):
         # type: () -> List[Bundle]
@@ -774,6 +1218,17 @@ class Framework(Bundle):
         with self.__properties_lock:
             return tuple(self.__properties.keys())
 
+    def get_profiler(self):
+        # type: () -> Optional[BootProfiler]
+        """
+        Returns the boot profiler of the framework, which is only active if
+        the ``pelix.framework.profile`` property was set to True when the
+        framework was created.
+
+        :return: The boot profiler, or None
+        """
+        return self._profiler
+
     def get_service(self, bundle, reference):
         # type: (Bundle, ServiceReference) -> object
         """
@@ -795,7 +1250,97 @@ class Framework(Bundle):
             # Unregistering service, just give it
             return self.__unregistering_services[reference]
         except KeyError:
-            return self._registry.get_service(bundle, reference)
+            pass
+
+        if reference.get_property(SERVICE_PLACEHOLDER):
+            return self.__get_placeholder_service(bundle, reference)
+
+        return self._registry.get_service(bundle, reference)
+
+    def __get_placeholder_service(self, bundle, reference):
+        # type: (Bundle, ServiceReference) -> object
+        """
+        Activates the lazy bundle providing the given placeholder and returns
+        the real service replacing it
+
+        :param bundle: The bundle requiring the service
+        :param reference: The reference to a placeholder
+        :return: The real service
+        :raise BundleException: Error activating the bundle or no service
+                                replaces the placeholder
+        """
+        provider = reference.get_bundle()
+        provider._lazy_activate()
+
+        # Look for the real service
+        specification = reference.get_property(OBJECTCLASS)[0]
+        for svc_ref in provider.get_registered_services() or ():
+            if specification in svc_ref.get_property(OBJECTCLASS) \
+                    and not svc_ref.get_property(SERVICE_PLACEHOLDER):
+                break
+        else:
+            raise BundleException(
+                "Bundle {0} didn't register a {1} service"
+                .format(provider.get_symbolic_name(), specification))
+
+        service = self._registry.get_service(bundle, svc_ref)
+        with self.__placeholders_lock:
+            self.__placeholders_refs.setdefault(
+                (bundle, reference), []).append(svc_ref)
+        return service
+
+    def unget_service(self, bundle, reference):
+        # type: (Bundle, ServiceReference) -> bool
+        """
+        Disables a reference to the service
+
+        :param bundle: The bundle which used the service
+        :param reference: A service reference
+        :return: True if the bundle was using this reference, else False
+        """
+        if reference.get_property(SERVICE_PLACEHOLDER):
+            # Release the real service given for a placeholder
+            key = (bundle, reference)
+            with self.__placeholders_lock:
+                try:
+                    svc_refs = self.__placeholders_refs[key]
+                except KeyError:
+                    return False
+
+                reference = svc_refs.pop()
+                if not svc_refs:
+                    del self.__placeholders_refs[key]
+
+        return self._registry.unget_service(bundle, reference)
+
+    def _release_placeholders(self, bundle):
+        # type: (Bundle) -> None
+        """
+        Releases the real services a stopping bundle got through placeholders
+        and forgets about them
+
+        :param bundle: The stopping bundle
+        """
+        with self.__placeholders_lock:
+            keys = [key for key in self.__placeholders_refs
+                    if key[0] is bundle]
+            svc_refs = [svc_ref for key in keys
+                        for svc_ref in self.__placeholders_refs.pop(key)]
+
+        for svc_ref in svc_refs:
+            self._registry.unget_service(bundle, svc_ref)
+
+    def get_service_changes(self, since_generation):
+        # type: (int) -> Tuple[int, Optional[List[Tuple[int, int, ServiceReference]]]]
+        """
+        Returns the modifications of the service registry made after the
+        given generation (see ``ServiceRegistry.get_changes()``)
+
+        :param since_generation: Generation of the last synchronization
+        :return: A (current generation, changes) tuple, where changes is None
+                 if the caller must look for all services again
+        """
+        return self._registry.get_changes(since_generation)
 
     def get_symbolic_name(self):
         # type: () -> str
@@ -825,38 +1370,15 @@ class Framework(Bundle):
         """
         with self.__bundles_lock:
             # A bundle can't be installed twice
-            for bundle in self.__bundles.values():
-                if bundle.get_symbolic_name() == name:
-                    _logger.debug('Already installed bundle: %s', name)
-                    return bundle
-
-            # Load the module
             try:
-                if path:
-                    # Use the given path in priority
-                    sys.path.insert(0, path)
-
-                try:
-                    # The module has already been loaded
-                    module_ = sys.modules[name]
-                except KeyError:
-                    # Load the module
-                    #  __import__(name) -> package level
-                    # import_module -> module level
-                    module_ = importlib.import_module(name)
-            except (ImportError, IOError) as ex:
-                # Error importing the module
-                raise BundleException("Error installing bundle {0}: {1}"
-                                      .format(name, ex))
-            finally:
-                if path:
-                    # Clean up the path. The loaded module(s) might
-                    # have changed the path content, so do not use an
-                    # index
-                    sys.path.remove(path)
+                bundle = self.__bundles_names[name]
+                _logger.debug('Already installed bundle: %s', name)
+                return bundle
+            except KeyError:
+                pass
 
-            # Add the module to sys.modules, just to be sure
-            sys.modules[name] = module_
+            # Load the module
+            module_ = _import_bundle_module(name, path, self._profiler)
 
             # Compute the bundle ID
             bundle_id = self.__next_bundle_id
@@ -866,6 +1388,7 @@ class Framework(Bundle):
 
             # Store the bundle
             self.__bundles[bundle_id] = bundle
+            self.__bundles_names[name] = bundle
 
             # Update the bundle ID counter
             self.__next_bundle_id += 1
@@ -875,6 +1398,73 @@ class Framework(Bundle):
         self._dispatcher.fire_bundle_event(event)
         return bundle
 
+    def install_lazy_bundle(self, name, specifications, path=None):
+        # type: (str, List[Union[str, type]], str) -> Bundle
+        """
+        Installs a bundle with a lazy activation policy: its module is not
+        imported until its activation.
+
+        When the bundle is started, the framework registers a placeholder for
+        each of the given service specifications. The module is imported and
+        the bundle activated on the first call to ``get_service()`` on one of
+        those placeholders, or to ``Bundle.get_module()``. The activator
+        must register the real services, which replace the placeholders.
+
+        If a bundle with the same name is already installed, it is returned.
+
+        :param name: A bundle name
+        :param specifications: Specifications of the services provided by
+                               the bundle
+        :param path: Preferred path to load the module
+        :return: The installed Bundle object
+        :raise BundleException: Invalid specifications
+        """
+        if not name or not is_string(name):
+            raise BundleException("Invalid bundle name: {0}".format(name))
+
+        specs = []
+        for spec in specifications or ():
+            if inspect.isclass(spec):
+                spec = spec.__name__
+            if not spec or not is_string(spec):
+                raise BundleException(
+                    "Invalid specification: {0}".format(spec))
+            specs.append(spec)
+
+        with self.__bundles_lock:
+            # A bundle can't be installed twice
+            try:
+                bundle = self.__bundles_names[name]
+                _logger.debug('Already installed bundle: %s', name)
+                return bundle
+            except KeyError:
+                pass
+
+            bundle_id = self.__next_bundle_id
+            bundle = Bundle(self, bundle_id, name, None, tuple(specs), path)
+            self.__bundles[bundle_id] = bundle
+            self.__bundles_names[name] = bundle
+            self.__next_bundle_id += 1
+
+        # Fire the bundle installed event
+        event = BundleEvent(BundleEvent.INSTALLED, bundle)
+        self._dispatcher.fire_bundle_event(event)
+        return bundle
+
+    def _register_placeholders(self, bundle, specifications):
+        # type: (Bundle, tuple) -> List[ServiceRegistration]
+        """
+        Registers the placeholders of the services of a lazy bundle
+
+        :param bundle: A lazy bundle
+        :param specifications: The specifications of its services
+        :return: The registrations of the placeholders
+        """
+        return self.register_services(
+            bundle, [(spec, _ServicePlaceholder(bundle, spec),
+                      {SERVICE_PLACEHOLDER: True})
+                     for spec in specifications])
+
     def install_package(self, path, recursive=False, prefix=None):
         # type: (str, bool, str) -> tuple
         """
@@ -968,12 +1558,37 @@ class Framework(Bundle):
         if prefix is None:
             prefix = os.path.basename(path)
 
+        try:
+            return self.__install_visiting(path, visitor, prefix)
+        finally:
+            if self.__modules_index is not None:
+                # Keep track of the visited folders
+                self.__modules_index.save()
+
+    def __install_visiting(self, path, visitor, prefix):
+        # type: (str, Callable[[str, bool, str], bool], str) -> tuple
+        """
+        Recursively installs the modules found in the given path if they are
+        accepted by the visitor. Parameters have been checked by
+        install_visiting().
+
+        :param path: Absolute search path
+        :param visitor: The visiting callable
+        :param prefix: Prefix for all found modules
+        :return: A 2-tuple, with the list of installed bundles and the list
+                 of failed modules names
+        """
         bundles = set()
         failed = set()
 
+        if self.__modules_index is not None:
+            modules = self.__modules_index.get_modules(path)
+        else:
+            modules = walk_modules(path)
+
         with self.__bundles_lock:
             # Walk through the folder to find modules
-            for name, is_package in walk_modules(path):
+            for name, is_package in modules:
                 # Ignore '__main__' modules
                 if name == '__main__':
                     continue
@@ -989,7 +1604,7 @@ class Framework(Bundle):
                             # Visit the package
                             sub_path = os.path.join(path, name)
                             sub_bundles, sub_failed = \
-                                self.install_visiting(
+                                self.__install_visiting(
                                     sub_path, visitor, fullname)
                             bundles.update(sub_bundles)
                             failed.update(sub_failed)
@@ -1006,22 +1621,18 @@ class Framework(Bundle):
 
         return bundles, failed
 
-    def register_service(self, bundle, clazz, service, properties, send_event,
-                         factory=False, prototype=False):
-        # type: (Bundle, Union[List[Any], type, str], object, dict, bool, bool, bool) -> ServiceRegistration
+    @staticmethod
+    def __prepare_registration(bundle, clazz, service, properties):
+        # type: (Bundle, Union[List[Any], type, str], object, dict) -> tuple
         """
-        Registers a service and calls the listeners
+        Checks the registration parameters of a service
 
         :param bundle: The bundle registering the service
         :param clazz: Name(s) of the interface(s) implemented by service
         :param service: The service to register
         :param properties: Service properties
-        :param send_event: If not, doesn't trigger a service registered event
-        :param factory: If True, the given service is a service factory
-        :param prototype: If True, the given service is a prototype service
-                          factory (the factory argument is considered True)
-        :return: A ServiceRegistration object
-        :raise BundleException: An error occurred while registering the service
+        :return: A (list of specifications, copy of the properties) tuple
+        :raise BundleException: Invalid registration parameters
         """
         if bundle is None or service is None or not clazz:
             raise BundleException("Invalid registration parameters")
@@ -1053,6 +1664,28 @@ class Framework(Bundle):
             # Class OK
             classes.append(svc_clazz)
 
+        return classes, properties
+
+    def register_service(self, bundle, clazz, service, properties, send_event,
+                         factory=False, prototype=False):
+        # type: (Bundle, Union[List[Any], type, str], object, dict, bool, bool, bool) -> ServiceRegistration
+        """
+        Registers a service and calls the listeners
+
+        :param bundle: The bundle registering the service
+        :param clazz: Name(s) of the interface(s) implemented by service
+        :param service: The service to register
+        :param properties: Service properties
+        :param send_event: If not, doesn't trigger a service registered event
+        :param factory: If True, the given service is a service factory
+        :param prototype: If True, the given service is a prototype service
+                          factory (the factory argument is considered True)
+        :return: A ServiceRegistration object
+        :raise BundleException: An error occurred while registering the service
+        """
+        classes, properties = self.__prepare_registration(
+            bundle, clazz, service, properties)
+
         # Make the service registration
         registration = self._registry.register(
             bundle, classes, properties, service, factory, prototype)
@@ -1068,16 +1701,84 @@ class Framework(Bundle):
 
         return registration
 
+    def register_services(self, bundle, services, send_event=True):
+        # type: (Bundle, List[tuple], bool) -> List[ServiceRegistration]
+        """
+        Registers multiple services at once, then calls the listeners with
+        the batch of REGISTERED events
+
+        :param bundle: The bundle registering the services
+        :param services: A list of (clazz, service, properties) tuples,
+                         optionally followed by the factory and prototype
+                         flags (see ``register_service()``)
+        :param send_event: If not, doesn't trigger service registered events
+        :return: The list of ServiceRegistration objects, in the order of the
+                 given services
+        :raise BundleException: Invalid registration parameters (no service
+                                is registered)
+        """
+        to_register = []
+        for entry in services:
+            clazz, service, properties = entry[:3]
+            factory = len(entry) > 3 and bool(entry[3])
+            prototype = len(entry) > 4 and bool(entry[4])
+            classes, properties = self.__prepare_registration(
+                bundle, clazz, service, properties)
+            to_register.append(
+                (classes, properties, service, factory, prototype))
+
+        if not to_register:
+            return []
+
+        # Register all services at once
+        registrations = self._registry.register_many(bundle, to_register)
+
+        # Update the bundle registration information
+        for registration in registrations:
+            bundle._registered_service(registration)
+
+        if send_event:
+            # Call the listeners
+            self._dispatcher.fire_service_events(
+                [ServiceEvent(ServiceEvent.REGISTERED,
+                              registration.get_reference())
+                 for registration in registrations])
+
+        return registrations
+
     def start(self):
         # type: () -> bool
         """
         Starts the framework
 
+        By default, bundles are started one at a time, in installation order.
+        If the ``pelix.framework.start.threads`` property is greater than 1,
+        bundles are started by a pool of threads, by increasing start level
+        (see ``START_LEVEL``): the bundles of a level are started in parallel,
+        once the bundles they require (see ``BUNDLE_REQUIRES``) are started.
+
+        In both modes, the STARTING event of the framework is fired first and
+        the STARTING and STARTED events of a bundle are fired in the thread
+        starting it. In parallel mode, the events of independent bundles of a
+        level might interleave, but the STARTED event of a bundle is always
+        fired before the STARTING event of the bundles requiring it or having
+        a higher start level.
+
+        In parallel mode, the framework lock is released while the pool
+        threads call the activators, so that they can call the framework
+        without a deadlock. As in sequential mode, the ``stop()``,
+        ``update()`` and ``start()`` methods of the framework do nothing when
+        they are called by an activator while the framework is starting.
+        Calls from other threads wait for the end of the start before taking
+        effect. An activator must raise a ``FrameworkException`` with the
+        ``needs_stop`` flag to stop the framework.
+
         :return: True if the bundle has been started, False if it was already
                  running
         :raise BundleException: A bundle failed to start
         """
         with self._lock:
+            self.__wait_parallel_start()
             if self._state in (Bundle.STARTING, Bundle.ACTIVE):
                 # Already started framework
                 return False
@@ -1091,25 +1792,216 @@ class Framework(Bundle):
                 BundleEvent(BundleEvent.STARTING, self))
 
             # Start all registered bundles (use a copy, just in case...)
-            for bundle in self.__bundles.copy().values():
-                try:
-                    bundle.start()
-                except FrameworkException as ex:
-                    # Important error
-                    _logger.exception("Important error starting bundle: %s",
-                                      bundle)
-                    if ex.needs_stop:
-                        # Stop the framework (has to be in active state)
-                        self._state = Bundle.ACTIVE
-                        self.stop()
-                        return False
-                except BundleException:
-                    # A bundle failed to start : just log
-                    _logger.exception("Error starting bundle: %s", bundle)
-
-            # Bundle is now active
+            bundles = list(self.__bundles.copy().values())
+            nb_threads = self.__get_start_threads()
+            if nb_threads <= 1 or len(bundles) <= 1:
+                needs_stop = False
+                for bundle in bundles:
+                    if self.__start_bundle(bundle):
+                        needs_stop = True
+                        break
+
+                return self.__end_start(needs_stop)
+
+            # Other threads calling the framework wait for the end of the
+            # start (see __wait_parallel_start())
+            self.__parallel_start = True
+
+        # Release the lock while the pool threads call the activators
+        needs_stop = True
+        try:
+            needs_stop = self.__start_parallel(bundles, nb_threads)
+        finally:
+            with self._lock:
+                self.__parallel_start = False
+                self.__start_condition.notify_all()
+                result = self.__end_start(needs_stop)
+
+        return result
+
+    def __wait_parallel_start(self):
+        # type: () -> None
+        """
+        Waits for the end of a parallel start of the framework, unless the
+        caller is a thread of the start pool, e.g. an activator. The framework
+        lock must be held by the caller.
+        """
+        while self.__parallel_start \
+                and not getattr(self.__start_local, "starting", False):
+            self.__start_condition.wait()
+
+    def __end_start(self, needs_stop):
+        # type: (bool) -> bool
+        """
+        Sets the framework in ACTIVE state once its bundles have been started,
+        or stops it. The framework lock must be held by the caller.
+
+        :param needs_stop: If True, a bundle asked to stop the framework
+        :return: True if the framework is active
+        """
+        if needs_stop:
+            # Stop the framework (has to be in active state)
             self._state = Bundle.ACTIVE
-            return True
+            self.stop()
+            return False
+
+        # Bundle is now active
+        self._state = Bundle.ACTIVE
+        return True
+
+    def __get_start_threads(self):
+        # type: () -> int
+        """
+        Returns the number of threads to use to start the bundles
+
+        :return: The number of threads (1 to start bundles sequentially)
+        """
+        nb_threads = self.get_property(FRAMEWORK_START_THREADS)
+        if nb_threads is None:
+            return 1
+
+        try:
+            return max(int(nb_threads), 1)
+        except (TypeError, ValueError):
+            _logger.warning("Invalid number of start threads: %s", nb_threads)
+            return 1
+
+    @staticmethod
+    def __start_bundle(bundle):
+        # type: (Bundle) -> bool
+        """
+        Starts a bundle while starting the framework, logging errors
+
+        :param bundle: The bundle to start
+        :return: True if the framework must be stopped
+        """
+        try:
+            bundle.start()
+        except FrameworkException as ex:
+            # Important error
+            _logger.exception("Important error starting bundle: %s", bundle)
+            return ex.needs_stop
+        except BundleException:
+            # A bundle failed to start : just log
+            _logger.exception("Error starting bundle: %s", bundle)
+
+        return False
+
+    def __start_parallel(self, bundles, nb_threads):
+        # type: (List[Bundle], int) -> bool
+        """
+        Starts the given bundles with a pool of threads, level by level
+
+        :param bundles: The bundles to start
+        :param nb_threads: Maximum number of threads
+        :return: True if the framework must be stopped
+        """
+        # Group bundles by start level
+        levels = {}
+        for bundle in bundles:
+            level = getattr(bundle._get_loaded_module(), START_LEVEL, 1)
+            try:
+                level = int(level)
+            except (TypeError, ValueError):
+                _logger.warning("Invalid start level for %s: %s",
+                                bundle.get_symbolic_name(), level)
+                level = 1
+            levels.setdefault(level, []).append(bundle)
+
+        pool = pelix.threadpool.ThreadPool(
+            nb_threads, 0, logname="pelix-framework-start")
+        pool.start()
+        try:
+            for level in sorted(levels):
+                if self.__start_level(levels[level], pool):
+                    return True
+        finally:
+            pool.stop()
+
+        return False
+
+    def __start_level(self, bundles, pool):
+        # type: (List[Bundle], pelix.threadpool.ThreadPool) -> bool
+        """
+        Starts the bundles of a start level with the given pool of threads.
+        Bundles are started as soon as the bundles they require are started.
+
+        :param bundles: The bundles of the level
+        :param pool: The thread pool
+        :return: True if the framework must be stopped
+        """
+        by_name = dict((bundle.get_symbolic_name(), bundle)
+                       for bundle in bundles)
+
+        # Bundle -> required bundles not yet started
+        waiting = {}
+        # Bundle -> bundles requiring it
+        dependents = {}
+        for bundle in bundles:
+            names = getattr(bundle._get_loaded_module(), BUNDLE_REQUIRES,
+                            None) or ()
+            if is_string(names):
+                names = (names,)
+
+            required = set()
+            for name in names:
+                other = by_name.get(name)
+                if other is not None and other is not bundle:
+                    required.add(other)
+                    dependents.setdefault(other, []).append(bundle)
+            waiting[bundle] = required
+
+        condition = threading.Condition()
+        ready = [bundle for bundle in bundles if not waiting[bundle]]
+        pending = set(bundles)
+        # Number of bundles being started, framework stop request
+        status = {"running": 0, "needs_stop": False}
+
+        def start_bundle(bundle):
+            """
+            Starts a bundle then releases the bundles requiring it
+            """
+            needs_stop = True
+            self.__start_local.starting = True
+            try:
+                needs_stop = self.__start_bundle(bundle)
+            finally:
+                self.__start_local.starting = False
+                with condition:
+                    status["running"] -= 1
+                    if needs_stop:
+                        status["needs_stop"] = True
+
+                    for other in dependents.get(bundle, ()):
+                        required = waiting[other]
+                        required.discard(bundle)
+                        if not required:
+                            ready.append(other)
+
+                    condition.notify_all()
+
+        with condition:
+            while True:
+                if not status["needs_stop"]:
+                    for bundle in ready:
+                        if bundle in pending:
+                            pending.remove(bundle)
+                            status["running"] += 1
+                            pool.enqueue(start_bundle, bundle)
+                    del ready[:]
+
+                if status["running"]:
+                    # Wait for a bundle to be started
+                    condition.wait()
+                elif pending and not status["needs_stop"]:
+                    # Requirements cycle: start the first waiting bundle
+                    bundle = min(pending, key=Bundle.get_bundle_id)
+                    _logger.warning("Cycle in the requirements of %s",
+                                    bundle.get_symbolic_name())
+                    waiting[bundle].clear()
+                    ready.append(bundle)
+                else:
+                    return status["needs_stop"]
 
     def stop(self):
         # type: () -> bool
@@ -1119,6 +2011,7 @@ class Framework(Bundle):
         :return: True if the framework stopped, False it wasn't running
         """
         with self._lock:
+            self.__wait_parallel_start()
             if self._state != Bundle.ACTIVE:
                 # Invalid state
                 return False
@@ -1140,7 +2033,10 @@ class Framework(Bundle):
                 bundle = self.__bundles.get(bid)
                 bid -= 1
 
-                if bundle is None or bundle.get_state() != Bundle.ACTIVE:
+                if bundle is None or not (
+                        bundle.get_state() == Bundle.ACTIVE
+                        or (bundle.get_state() == Bundle.STARTING
+                            and bundle.is_lazy())):
                     # Ignore inactive bundle
                     continue
 
@@ -1156,6 +2052,9 @@ class Framework(Bundle):
             self._dispatcher.fire_bundle_event(
                 BundleEvent(BundleEvent.STOPPED, self))
 
+            # Deliver the pending asynchronous service events
+            self._dispatcher.flush_service_events()
+
             # All bundles have been stopped, release "wait_for_stop"
             self._fw_stop_event.set()
 
@@ -1208,8 +2107,9 @@ class Framework(Bundle):
             self._dispatcher.fire_bundle_event(
                 BundleEvent(BundleEvent.UNINSTALLED, bundle))
 
-            # Remove it from the dictionary
+            # Remove it from the dictionaries
             del self.__bundles[bundle_id]
+            self.__bundles_names.pop(bundle.get_symbolic_name(), None)
 
             # Remove it from the system => avoid unintended behaviors and
             # forces a complete module reload if it is re-installed
@@ -1258,6 +2158,44 @@ class Framework(Bundle):
         del self.__unregistering_services[reference]
         return True
 
+    def unregister_services(self, registrations):
+        # type: (List[ServiceRegistration]) -> bool
+        """
+        Unregisters multiple services at once, then calls the listeners with
+        the batch of UNREGISTERING events
+
+        :param registrations: The ServiceRegistration objects of the services
+                              to unregister
+        :raise BundleException: Invalid reference (no service is
+                                unregistered)
+        """
+        registrations = list(registrations)
+        if not registrations:
+            return True
+
+        # Remove the services from the registry
+        references = [registration.get_reference()
+                      for registration in registrations]
+        svc_instances = self._registry.unregister_many(references)
+
+        # Keep a track of the unregistering references
+        for reference, svc_instance in zip(references, svc_instances):
+            self.__unregistering_services[reference] = svc_instance
+
+        # Call the listeners
+        self._dispatcher.fire_service_events(
+            [ServiceEvent(ServiceEvent.UNREGISTERING, reference)
+             for reference in references])
+
+        for registration, reference in zip(registrations, references):
+            # Update the bundle registration information
+            reference.get_bundle()._unregistered_service(registration)
+
+            # Remove the unregistering reference
+            del self.__unregistering_services[reference]
+
+        return True
+
     def _hide_bundle_services(self, bundle):
         # type: (Bundle) -> List[ServiceReference]
         """
@@ -1276,6 +2214,7 @@ class Framework(Bundle):
                                 starting the framework.
         """
         with self._lock:
+            self.__wait_parallel_start()
             if self._state == Bundle.ACTIVE:
                 self.stop()
                 self.start()
@@ -1360,7 +2299,7 @@ class BundleContext(object):
         return self.__framework._dispatcher.add_framework_listener(listener)
 
     def add_service_listener(self, listener, ldap_filter=None,
-                             specification=None):
+                             specification=None, asynchronous=False):
         """
         Registers a service listener
 
@@ -1374,15 +2313,39 @@ class BundleContext(object):
                '''
                # ...
 
+        The listener can also implement a ``services_changed(events)``
+        method, to be notified with a list of events when services are
+        registered or unregistered in bulk.
+
+        If *asynchronous* is True and if the ``pelix.services.events.async``
+        framework property is set, the events are queued and delivered in
+        order by a pool of threads: the listener doesn't block the thread
+        firing the event, but the service might have been modified or
+        unregistered when the listener is notified.
+        Use ``flush_service_events()`` to wait for their delivery.
+
         :param listener: The listener to register
         :param ldap_filter: Filter that must match the service properties
                             (optional, None to accept all services)
         :param specification: The specification that must provide the service
                               (optional, None to accept all services)
+        :param asynchronous: If True, asks for an asynchronous delivery of the
+                             events
         :return: True if the listener has been successfully registered
         """
         return self.__framework._dispatcher.add_service_listener(
-            listener, specification, ldap_filter)
+            listener, specification, ldap_filter, asynchronous)
+
+    def flush_service_events(self, timeout=None):
+        # type: (Optional[float]) -> bool
+        """
+        Waits for the service events queued for asynchronous listeners to be
+        delivered
+
+        :param timeout: Maximum time to wait (in seconds, None for no limit)
+        :return: True if the events have been delivered, False on timeout
+        """
+        return self.__framework._dispatcher.flush_service_events(timeout)
 
     def get_all_service_references(self, clazz, ldap_filter=None):
         """
@@ -1456,6 +2419,27 @@ class BundleContext(object):
         """
         return self.__framework.get_service(self.__bundle, reference)
 
+    def get_service_changes(self, since_generation=0):
+        # type: (int) -> Tuple[int, Optional[List[Tuple[int, int, ServiceReference]]]]
+        """
+        Returns the modifications of the service registry made after the
+        given generation, to synchronize a view of the registry without
+        looking for all the services again.
+
+        The changes are (generation, kind, reference) tuples, where kind is
+        ``ServiceEvent.REGISTERED``, ``ServiceEvent.MODIFIED`` or
+        ``ServiceEvent.UNREGISTERING``. If the registry doesn't know all the
+        changes made since the given generation, the changes are None: the
+        caller must then look for all services
+        (``get_all_service_references(None)``) and use the returned
+        generation for its next call: the changes made during that look up
+        will be returned again by the next call.
+
+        :param since_generation: Generation returned by the previous call
+        :return: A (current generation, changes) tuple
+        """
+        return self.__framework.get_service_changes(since_generation)
+
     def get_service_reference(self, clazz, ldap_filter=None):
         # type: (Optional[str], Optional[str]) -> Optional[ServiceReference]
         """
@@ -1520,6 +2504,22 @@ class BundleContext(object):
         """
         return self.__framework.install_bundle(name, path)
 
+    def install_lazy_bundle(self, name, specifications, path=None):
+        # type: (str, List[Union[str, type]], str) -> Bundle
+        """
+        Installs a bundle with a lazy activation policy, without importing
+        its module (see ``Framework.install_lazy_bundle()``)
+
+        :param name: The name of the bundle to install
+        :param specifications: Specifications of the services provided by
+                               the bundle
+        :param path: Preferred path to load the module
+        :return: The installed Bundle object
+        :raise BundleException: Invalid specifications
+        """
+        return self.__framework.install_lazy_bundle(
+            name, specifications, path)
+
     def install_package(self, path, recursive=False):
         # type: (str, bool) -> tuple
         """
@@ -1577,6 +2577,27 @@ class BundleContext(object):
             self.__bundle, clazz, service, properties, send_event,
             factory, prototype)
 
+    def register_services(self, services, send_event=True):
+        # type: (List[tuple], bool) -> List[ServiceRegistration]
+        """
+        Registers multiple services at once.
+
+        The service listeners are notified once all services have been
+        registered: those implementing a ``services_changed(events)`` method
+        receive all their events in a single call.
+
+        :param services: A list of (clazz, service, properties) tuples,
+                         optionally followed by the factory and prototype
+                         flags, like the arguments of ``register_service()``
+        :param send_event: If not, doesn't trigger service registered events
+        :return: The list of ServiceRegistration objects, in the order of the
+                 given services
+        :raise BundleException: An error occurred while registering the
+                                services (none is registered)
+        """
+        return self.__framework.register_services(
+            self.__bundle, services, send_event)
+
     def remove_bundle_listener(self, listener):
         """
         Unregisters the given bundle listener
@@ -1605,6 +2626,23 @@ class BundleContext(object):
         """
         return self.__framework._dispatcher.remove_service_listener(listener)
 
+    def unregister_services(self, registrations):
+        # type: (List[ServiceRegistration]) -> bool
+        """
+        Unregisters multiple services at once.
+
+        The service listeners are notified once all services have been
+        removed from the registry: those implementing a
+        ``services_changed(events)`` method receive all their events in a
+        single call.
+
+        :param registrations: The ServiceRegistration objects of the services
+                              to unregister
+        :return: True on success
+        :raise BundleException: Unknown service (none is unregistered)
+        """
+        return self.__framework.unregister_services(registrations)
+
     def unget_service(self, reference):
         # type: (ServiceReference) -> bool
         """
@@ -1613,8 +2651,7 @@ class BundleContext(object):
         :return: True if the bundle was using this reference, else False
         """
         # Lose the dependency
-        return self.__framework._registry.unget_service(
-            self.__bundle, reference)
+        return self.__framework.unget_service(self.__bundle, reference)
 
 # ------------------------------------------------------------------------------
 
@@ -1688,6 +2725,11 @@ class FrameworkFactory(object):
             # Clear the event dispatcher
             framework._dispatcher.clear()
 
+            # Restore the size of the LDAP filters cache
+            if framework._previous_cache_size is not None:
+                pelix.ldapfilter.set_cache_size(
+                    framework._previous_cache_size)
+
             # Clear the singleton
             cls.__singleton = None
             return True
@@ -1698,8 +2740,9 @@ class FrameworkFactory(object):
 
 
 def create_framework(bundles, properties=None,
-                     auto_start=False, wait_for_stop=False, auto_delete=False):
-    # type: (Union[list, tuple], dict, bool, bool, bool) -> Framework
+                     auto_start=False, wait_for_stop=False, auto_delete=False,
+                     start_threads=None):
+    # type: (Union[list, tuple], dict, bool, bool, bool, int) -> Framework
     """
     Creates a Pelix framework, installs the given bundles and returns its
     instance reference.
@@ -1710,6 +2753,8 @@ def create_framework(bundles, properties=None,
     If *auto_delete* is True, the framework will be deleted once it has
     stopped, and the method will return None.
     This requires *wait_for_stop* and *auto_start* to be True.
+    If *start_threads* is greater than 1, the framework will start its bundles
+    in parallel with that many threads (see ``Framework.start()``).
 
     :param bundles: Bundles to initially install (shouldn't be empty if
                     *wait_for_stop* is True)
@@ -1718,6 +2763,8 @@ def create_framework(bundles, properties=None,
     :param wait_for_stop: If True, the method will return only when the
                           framework will have stopped
     :param auto_delete: If True, deletes the framework once it stopped.
+    :param start_threads: Number of threads starting the bundles (sets the
+                          ``pelix.framework.start.threads`` property)
     :return: The framework instance
     :raise ValueError: Only one framework can run at a time
     """
@@ -1725,6 +2772,11 @@ def create_framework(bundles, properties=None,
     if FrameworkFactory.is_framework_running(None):
         raise ValueError('A framework is already running')
 
+    if start_threads is not None:
+        # Use a copy of the properties
+        properties = dict(properties or {})
+        properties[FRAMEWORK_START_THREADS] = start_threads
+
     # Create the framework
     framework = FrameworkFactory.get_framework(properties)
 
@@ -0,0 +1,188 @@
+#!/usr/bin/env python
+# -- Content-Encoding: UTF-8 --
+"""
+Asyncio event loop run in a dedicated thread, used by iPOPO to execute the
+coroutines returned by component callbacks.
+
+The loop thread is started on the first submitted coroutine: the framework
+doesn't start any thread if no component uses coroutines.
+
+:author: Thomas Calmant
+:copyright: Copyright 2017, Thomas Calmant
+:license: Apache License 2.0
+:version: 0.6.6
+
+..
+
+    Copyright 2017 Thomas Calmant
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+# Standard library
+import logging
+import threading
+
+# Standard typing module should be optional
+try:
+    from typing import Any, Optional
+except ImportError:
+    pass
+
+try:
+    # Python 3.5+
+    import asyncio
+    import concurrent.futures
+    from asyncio import run_coroutine_threadsafe
+except ImportError:
+    asyncio = None
+
+# ------------------------------------------------------------------------------
+
+# Module version
+__version_info__ = (0, 6, 6)
+__version__ = ".".join(str(x) for x in __version_info__)
+
+# Documentation strings format
+__docformat__ = "restructuredtext en"
+
+# ------------------------------------------------------------------------------
+
+_logger = logging.getLogger(__name__)
+
+# ------------------------------------------------------------------------------
+
+
+def is_coroutine(obj):
+    # type: (Any) -> bool
+    """
+    Tests if the given object is a coroutine object, i.e. the result of the
+    call to an ``async def`` function
+
+    :param obj: An object
+    :return: True if the object can be given to EventLoopThread.submit()
+    """
+    return asyncio is not None and asyncio.iscoroutine(obj)
+
+
+class EventLoopThread(object):
+    """
+    An asyncio event loop running in its own daemon thread
+    """
+    def __init__(self, name="pelix-asyncio"):
+        # type: (str) -> None
+        """
+        :param name: Name of the loop thread
+        """
+        self.__name = name
+        self.__lock = threading.Lock()
+        self.__loop = None
+        self.__thread = None  # type: threading.Thread
+
+        # Futures of the coroutines which are still running
+        self.__pending = set()
+
+    def is_running(self):
+        # type: () -> bool
+        """
+        Checks if the loop thread is running
+        """
+        return self.__loop is not None
+
+    def __run(self, loop, ready):
+        """
+        Body of the loop thread
+
+        :param loop: The event loop to run
+        :param ready: Event set once the loop is running
+        """
+        asyncio.set_event_loop(loop)
+        loop.call_soon(ready.set)
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
+
+    def __done(self, future):
+        """
+        A submitted coroutine has ended
+        """
+        with self.__lock:
+            self.__pending.discard(future)
+
+    def submit(self, coroutine):
+        # type: (Any) -> concurrent.futures.Future
+        """
+        Schedules the given coroutine in the event loop, starting the loop
+        thread if necessary
+
+        :param coroutine: A coroutine object
+        :return: A ``concurrent.futures.Future`` giving the result of the
+                 coroutine. Its callbacks are called in the loop thread.
+        :raise RuntimeError: asyncio is not available
+        """
+        if asyncio is None:
+            raise RuntimeError("asyncio is not available")
+
+        with self.__lock:
+            if self.__loop is None:
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+                thread = threading.Thread(target=self.__run,
+                                          args=(loop, ready),
+                                          name=self.__name)
+                thread.daemon = True
+                thread.start()
+                ready.wait()
+
+                self.__loop = loop
+                self.__thread = thread
+
+            future = run_coroutine_threadsafe(coroutine, self.__loop)
+            self.__pending.add(future)
+
+        future.add_done_callback(self.__done)
+        return future
+
+    def stop(self, timeout=None):
+        # type: (Optional[float]) -> None
+        """
+        Waits for the running coroutines to end, then stops the loop thread.
+        The coroutines still running after the timeout are cancelled.
+
+        :param timeout: Maximum time to wait for the coroutines (in seconds)
+        """
+        with self.__lock:
+            loop = self.__loop
+            thread = self.__thread
+            pending = list(self.__pending)
+            self.__loop = None
+            self.__thread = None
+
+        if loop is None:
+            # Not running
+            return
+
+        if thread is not threading.current_thread():
+            if pending:
+                _, not_done = concurrent.futures.wait(pending, timeout)
+                for future in not_done:
+                    _logger.warning("Cancelling a coroutine still running "
+                                    "after %s seconds", timeout)
+                    future.cancel()
+
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+        else:
+            # Called from a coroutine: can't wait for the loop
+            loop.call_soon(loop.stop)
@@ -0,0 +1,281 @@
+#!/usr/bin/env python
+# -- Content-Encoding: UTF-8 --
+"""
+Boot profiler for Pelix: records the duration of the imports of bundles, of
+the calls to their activators and of the instantiation and validation of
+iPOPO components.
+
+:author: Thomas Calmant
+:copyright: Copyright 2017, Thomas Calmant
+:license: Apache License 2.0
+:version: 0.6.6
+
+..
+
+    Copyright 2017 Thomas Calmant
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+# Standard library
+import json
+import threading
+import time
+
+try:
+    # Python 3.3+
+    _timer = time.perf_counter
+except AttributeError:
+    _timer = time.time
+
+# ------------------------------------------------------------------------------
+
+# Module version
+__version_info__ = (0, 6, 6)
+__version__ = ".".join(str(x) for x in __version_info__)
+
+# Documentation strings format
+__docformat__ = "restructuredtext en"
+
+# ------------------------------------------------------------------------------
+
+KIND_IMPORT = "import"
+""" Import of the module of a bundle """
+
+KIND_ACTIVATOR = "activator"
+""" Call to the start() method of a bundle activator """
+
+KIND_INSTANTIATE = "instantiate"
+""" Instantiation of an iPOPO component """
+
+KIND_VALIDATE = "validate"
+""" Call to the validation callback of an iPOPO component """
+
+DEFAULT_MAX_STEPS = 10000
+""" Default maximum number of steps recorded by a profiler """
+
+# ------------------------------------------------------------------------------
+
+
+class _Step(object):
+    """
+    A profiled step
+    """
+    __slots__ = ('index', 'kind', 'name', 'thread', 'parent', 'start',
+                 'duration', 'children_time')
+
+    def __init__(self, index, kind, name, thread, parent, start):
+        """
+        Sets up members
+
+        :param index: Index of the step in the profile
+        :param kind: Kind of step
+        :param name: Name of the profiled element
+        :param thread: Name of the thread executing the step
+        :param parent: Enclosing step in the same thread (or None)
+        :param start: Start time of the step
+        """
+        self.index = index
+        self.kind = kind
+        self.name = name
+        self.thread = thread
+        self.parent = parent
+        self.start = start
+        self.duration = None
+        self.children_time = 0.
+
+    def to_dict(self, origin):
+        """
+        Converts the step to a dictionary
+
+        :param origin: Time of creation of the profiler
+        :return: A dictionary
+        """
+        duration = self.duration or 0.
+        return {"index": self.index,
+                "kind": self.kind,
+                "name": self.name,
+                "thread": self.thread,
+                "parent": self.parent.index if self.parent is not None
+                else None,
+                "start": self.start - origin,
+                "duration": duration,
+                "self": max(duration - self.children_time, 0.)}
+
+
+class BootProfiler(object):
+    """
+    Records the duration of the steps of the boot of a framework.
+
+    Steps are nested per thread: the time spent in a step started while
+    another one was running in the same thread is not counted in the
+    *self* time of the enclosing step.
+    """
+    def __init__(self, max_steps=DEFAULT_MAX_STEPS):
+        """
+        :param max_steps: Maximum number of steps to record
+        """
+        self.__origin = _timer()
+        self.__started = time.time()
+        self.__max_steps = max_steps
+        self.__steps = []
+        self.__dropped = 0
+        self.__lock = threading.Lock()
+        self.__local = threading.local()
+
+    def start(self, kind, name):
+        """
+        Starts a step
+
+        :param kind: Kind of step (KIND_* constants)
+        :param name: Name of the profiled element
+        :return: The step object to give to ``stop()``, or None if the
+                 profile is full
+        """
+        local = self.__local
+        parent = getattr(local, "current", None)
+
+        with self.__lock:
+            if len(self.__steps) >= self.__max_steps:
+                self.__dropped += 1
+                return None
+
+            step = _Step(len(self.__steps), kind, name,
+                         threading.current_thread().name, parent, None)
+            self.__steps.append(step)
+
+        local.current = step
+        step.start = _timer()
+        return step
+
+    def stop(self, step):
+        """
+        Ends a step
+
+        :param step: The object returned by ``start()``
+        """
+        if step is None:
+            return
+
+        step.duration = _timer() - step.start
+        if step.parent is not None:
+            step.parent.children_time += step.duration
+        self.__local.current = step.parent
+
+    def get_steps(self):
+        """
+        Returns the ended steps, in order of start
+
+        :return: A list of dictionaries, with the index, kind, name, thread,
+                 parent (index), start (seconds since the creation of the
+                 profiler), duration and self (time spent outside of
+                 nested steps) of each step
+        """
+        with self.__lock:
+            steps = self.__steps[:]
+
+        return [step.to_dict(self.__origin) for step in steps
+                if step.duration is not None]
+
+    def get_top(self, count=10):
+        """
+        Returns the steps where most time has been spent
+
+        :param count: Maximum number of steps to return
+        :return: A list of step dictionaries, sorted by decreasing self time
+        """
+        steps = self.get_steps()
+        steps.sort(key=lambda step: step["self"], reverse=True)
+        return steps[:count]
+
+    def get_critical_path(self):
+        """
+        Returns the chain of steps which determined the end of the boot,
+        whatever the threads executing them.
+
+        The chain is built backwards from the outermost step which ended
+        last: each step is preceded by the outermost step, of any thread,
+        which ended last before it started, i.e. the one it might have
+        waited for. The nested steps of each step of the chain are computed
+        the same way and follow their parent in the result.
+
+        :return: A list of step dictionaries, in order of start
+        """
+        children = {}
+        for step in self.get_steps():
+            children.setdefault(step["parent"], []).append(step)
+
+        path = []
+        self.__add_chain(path, children, None, None)
+        return path
+
+    def __add_chain(self, path, children, parent, end):
+        """
+        Appends to the given path the chain of the steps nested in the given
+        one (or of the outermost steps), ending before the given time
+
+        :param path: The list of step dictionaries to complete
+        :param children: Parent index → nested step dictionaries
+        :param parent: Index of the enclosing step (None for the outermost
+                       steps)
+        :param end: Time when the chain must be ended (None for no limit)
+        """
+        candidates = children.get(parent)
+        if not candidates:
+            return
+
+        chain = []
+        while True:
+            ended = [step for step in candidates
+                     if end is None or step["start"] + step["duration"] <= end]
+            if not ended:
+                break
+
+            step = max(ended, key=lambda item: (
+                item["start"] + item["duration"], item["duration"]))
+            chain.append(step)
+            end = step["start"]
+
+        for step in reversed(chain):
+            path.append(step)
+            self.__add_chain(path, children, step["index"],
+                             step["start"] + step["duration"])
+
+    def to_dict(self):
+        """
+        Returns the whole profile as a dictionary
+
+        :return: A dictionary with the start time of the profiler (seconds
+                 since epoch), its steps and the number of dropped steps
+        """
+        return {"started": self.__started,
+                "steps": self.get_steps(),
+                "dropped": self.__dropped}
+
+    def to_json(self, indent=None):
+        """
+        Returns the whole profile in JSON format
+
+        :param indent: JSON indentation
+        :return: The JSON representation of the profile
+        """
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def export(self, filename):
+        """
+        Writes the profile to the given file, in JSON format
+
+        :param filename: Path to the output file
+        """
+        with open(filename, "w") as filep:
+            filep.write(self.to_json(indent=2))
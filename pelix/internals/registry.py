@@ -27,18 +27,28 @@ Service registry and event dispatcher for Pelix.
 
 # Standard library
 import bisect
+import collections
 import logging
 import threading
+import time
+
+try:
+    # Python 3.3+
+    from types import MappingProxyType
+except ImportError:
+    MappingProxyType = None
 
 # Pelix beans
 from pelix.constants import OBJECTCLASS, SERVICE_ID, SERVICE_RANKING, \
     SERVICE_BUNDLEID, SERVICE_SCOPE, SCOPE_SINGLETON, SCOPE_BUNDLE, \
-    SCOPE_PROTOTYPE, BundleException
+    SCOPE_PROTOTYPE, REGISTRY_CHANGES_SIZE, REGISTRY_INDEXED_PROPERTIES, \
+    BundleException
 from pelix.internals.events import ServiceEvent
 
 # Pelix utility modules
 from pelix.utilities import is_string
 import pelix.ldapfilter as ldapfilter
+import pelix.threadpool
 
 # ------------------------------------------------------------------------------
 
@@ -194,12 +204,42 @@ class _FactoryCounter(object):
 # ------------------------------------------------------------------------------
 
 
+class _ReadOnlyDict(dict):
+    """
+    Read-only dictionary, used when ``types.MappingProxyType`` is missing
+    """
+    __slots__ = ()
+
+    def __read_only(self, *args, **kwargs):
+        """
+        Refuses any modification
+        """
+        raise TypeError("Service properties view is read-only")
+
+    __setitem__ = __delitem__ = __read_only
+    clear = pop = popitem = setdefault = update = __read_only
+
+
+def _freeze_properties(properties):
+    """
+    Returns a read-only snapshot of the given properties
+
+    :param properties: A dictionary
+    :return: A read-only mapping
+    """
+    if MappingProxyType is not None:
+        return MappingProxyType(properties.copy())
+
+    return _ReadOnlyDict(properties)
+
+
 class ServiceReference(object):
     """
     Represents a reference to a service
     """
-    __slots__ = ("__bundle", "__properties", "__service_id", "__sort_key",
-                 "__using_bundles", "_props_lock", "__usage_lock")
+    __slots__ = ("__bundle", "__properties", "__properties_view",
+                 "__service_id", "__sort_key", "__using_bundles",
+                 "_props_lock", "__usage_lock")
 
     def __init__(self, bundle, properties):
         """
@@ -224,6 +264,7 @@ class ServiceReference(object):
         # Service details
         self.__bundle = bundle
         self.__properties = properties
+        self.__properties_view = _freeze_properties(properties)
         self.__service_id = properties[SERVICE_ID]
 
         # Bundle object -> Usage Counter object
@@ -307,8 +348,17 @@ class ServiceReference(object):
 
         :return: A copy of the service properties
         """
-        with self._props_lock:
-            return self.__properties.copy()
+        return dict(self.__properties_view)
+
+    def get_properties_view(self):
+        """
+        Returns a read-only snapshot of the service properties, shared by all
+        callers. The snapshot is never modified: a new one is created each
+        time the service properties are updated.
+
+        :return: A read-only mapping of the service properties
+        """
+        return self.__properties_view
 
     def get_property(self, name):
         """
@@ -316,8 +366,7 @@ class ServiceReference(object):
 
         :return: The property value, None if not found
         """
-        with self._props_lock:
-            return self.__properties.get(name)
+        return self.__properties_view.get(name)
 
     def get_property_keys(self):
         """
@@ -325,8 +374,7 @@ class ServiceReference(object):
 
         :return: An array of property keys.
         """
-        with self._props_lock:
-            return tuple(self.__properties.keys())
+        return tuple(self.__properties_view.keys())
 
     def is_factory(self):
         """
@@ -381,6 +429,14 @@ class ServiceReference(object):
         with self.__usage_lock:
             self.__using_bundles.setdefault(bundle, _UsageCounter()).inc()
 
+    def _update_properties_view(self):
+        """
+        Replaces the properties snapshot after the modification of the
+        service properties. The caller must hold the properties lock.
+        This method should only be used by the framework.
+        """
+        self.__properties_view = _freeze_properties(self.__properties)
+
     def __compute_key(self):
         """
         Computes the sort key according to the service properties
@@ -423,7 +479,9 @@ class ServiceRegistration(object):
         :param reference: A service reference
         :param properties: A reference to the ServiceReference properties
                            dictionary object
-        :param update_callback: Method to call when the sort key is modified
+        :param update_callback: Method to call when the properties have been
+                                modified, with the service reference as
+                                argument
         """
         self.__framework = framework
         self.__reference = reference  # type: ServiceReference
@@ -489,10 +547,10 @@ class ServiceRegistration(object):
             # Update the properties
             previous = self.__properties.copy()
             self.__properties.update(properties)
+            self.__reference._update_properties_view()
 
-            if self.__reference.needs_sort_update():
-                # The sort key and the registry must be updated
-                self.__update_callback(self.__reference)
+            # Update the registry (sort key and indexes)
+            self.__update_callback(self.__reference)
 
             # Trigger a new computation in the framework
             event = ServiceEvent(ServiceEvent.MODIFIED, self.__reference,
@@ -514,39 +572,326 @@ class _Listener(object):
     Keeps information about a listener
     """
     # Try to reduce memory footprint (stored instances)
-    __slots__ = ('listener', 'specification', 'ldap_filter')
+    __slots__ = ('listener', 'specification', 'ldap_filter', 'filter_key',
+                 'term', 'delivery')
 
-    def __init__(self, listener, specification, ldap_filter):
+    def __init__(self, listener, specification, ldap_filter, delivery=None):
         """
         Sets up members
 
         :param listener: Listener instance
         :param specification: Specification to listen to
         :param ldap_filter: LDAP filter on service properties
+        :param delivery: Queue of the events to deliver asynchronously
+                         (None for a synchronous delivery)
         """
         self.listener = listener
         self.specification = specification
         self.ldap_filter = ldap_filter
+        self.delivery = delivery
+
+        # Key shared by the listeners with an equivalent filter
+        self.filter_key = _filter_key(ldap_filter, self)
+
+        # (property name, value) equality required by the filter, or None
+        self.term = _filter_term(ldap_filter, specification)
+
+
+def _filter_key(ldap_filter, default):
+    """
+    Computes the key used to share the result of the evaluation of equivalent
+    filters during the notification of an event: their string form, if it
+    describes them without ambiguity (i.e. filters made by the parser)
+
+    :param ldap_filter: An LDAP filter (or None)
+    :param default: Key to use if the filter can't be shared
+    :return: The filter key
+    """
+    if ldap_filter is None:
+        return None
+
+    to_check = [ldap_filter]
+    while to_check:
+        current = to_check.pop()
+        if isinstance(current, ldapfilter.LDAPFilter):
+            to_check.extend(current.subfilters)
+            continue
+
+        if not ldapfilter.is_parsable(current):
+            # Not a criterion the parser would have made
+            return default
+
+    return str(ldap_filter)
+
+
+def _filter_term(ldap_filter, specification):
+    """
+    Looks for an equality criterion that must be satisfied for the given
+    filter to match: a top-level criterion, or a criterion of a top-level AND.
+    The objectClass criteria are ignored if a specification is given.
+
+    :param ldap_filter: An LDAP filter (or None)
+    :param specification: The specification the listener listens to
+    :return: A (property name, value) tuple, or None
+    """
+    if isinstance(ldap_filter, ldapfilter.LDAPCriteria):
+        criteria = (ldap_filter,)
+    elif isinstance(ldap_filter, ldapfilter.LDAPFilter) \
+            and ldap_filter.operator == ldapfilter.AND:
+        criteria = ldap_filter.subfilters
+    else:
+        return None
+
+    for criterion in criteria:
+        if ldapfilter.is_equality(criterion) \
+                and (specification is None or criterion.name != OBJECTCLASS):
+            return criterion.name, criterion.value
+
+    return None
+
+
+class _ListenerGroup(object):
+    """
+    Service listeners of a specification, indexed by the equality term of
+    their filter
+    """
+    __slots__ = ('unindexed', 'indexed', 'size')
+
+    def __init__(self):
+        """
+        Sets up members
+        """
+        # Listeners without term
+        self.unindexed = []
+
+        # Property name -> {value -> [listeners]}
+        self.indexed = {}
+
+        # Number of listeners in the group
+        self.size = 0
+
+    def add(self, data):
+        """
+        Adds a listener to the group
+
+        :param data: A _Listener bean
+        """
+        if data.term is None:
+            self.unindexed.append(data)
+        else:
+            name, value = data.term
+            self.indexed.setdefault(name, {}).setdefault(value, []) \
+                .append(data)
+        self.size += 1
+
+    def remove(self, data):
+        """
+        Removes a listener from the group
+
+        :param data: A _Listener bean
+        :return: True if the group is now empty
+        :raise ValueError: Unknown listener
+        """
+        if data.term is None:
+            self.unindexed.remove(data)
+        else:
+            name, value = data.term
+            values = self.indexed[name]
+            listeners = values[value]
+            listeners.remove(data)
+            if not listeners:
+                del values[value]
+                if not values:
+                    del self.indexed[name]
+
+        self.size -= 1
+        return not self.size
+
+    def collect(self, properties, previous, result):
+        """
+        Appends to the given list the listeners which filter might match the
+        given properties or the previous ones
+
+        :param properties: The current properties of the service
+        :param previous: The previous properties of the service (or None)
+        :param result: The list to fill
+        """
+        result.extend(self.unindexed)
+        for name, values in self.indexed.items():
+            if name in properties:
+                tokens = _index_tokens(properties[name])
+            else:
+                tokens = _EMPTY_POSTINGS
+
+            if previous is not None and name in previous:
+                tokens = tokens.union(_index_tokens(previous[name]))
+
+            for token in tokens:
+                try:
+                    result.extend(values[token])
+                except KeyError:
+                    pass
+
+
+class _AsyncDelivery(object):
+    """
+    Ordered queue of the notifications to deliver to a service listener
+    from the threads of a pool.
+
+    A single task of the pool drains the queue at a time, which keeps the
+    notifications in order.
+    """
+    __slots__ = ('listener', 'max_size', 'notifications', 'scheduled',
+                 'closed', 'worker', 'condition', '_logger')
+
+    def __init__(self, listener, max_size, logger):
+        """
+        Sets up members
+
+        :param listener: The service listener
+        :param max_size: Maximum number of pending notifications (0 for an
+                         unbounded queue)
+        :param logger: The logger to use
+        """
+        self.listener = listener
+        self.max_size = max_size
+        self._logger = logger
+
+        # Pending (method name, argument) tuples
+        self.notifications = collections.deque()
+
+        # A task is scheduled or running to drain the queue
+        self.scheduled = False
+
+        # The listener has been removed
+        self.closed = False
+
+        # Thread currently draining the queue
+        self.worker = None
+
+        self.condition = threading.Condition()
+
+    def push(self, method, argument, can_wait):
+        """
+        Adds a notification to the queue
+
+        :param method: Name of the listener method to call
+        :param argument: Argument of the listener method
+        :param can_wait: If True, waits for the queue to have room for the
+                         notification
+        :return: True if a task must be scheduled to drain the queue
+        """
+        with self.condition:
+            if can_wait and self.max_size > 0:
+                while len(self.notifications) >= self.max_size \
+                        and not self.closed:
+                    self.condition.wait()
+
+            if self.closed:
+                return False
+
+            self.notifications.append((method, argument))
+            if self.scheduled:
+                return False
+
+            self.scheduled = True
+            return True
+
+    def drain(self, local):
+        """
+        Delivers the pending notifications, in order (called by the pool)
+
+        :param local: Thread-local data of the dispatcher
+        """
+        local.delivering = True
+        try:
+            while True:
+                with self.condition:
+                    if not self.notifications:
+                        self.scheduled = False
+                        self.worker = None
+                        self.condition.notify_all()
+                        return
+
+                    self.worker = threading.current_thread()
+                    method, argument = self.notifications.popleft()
+                    self.condition.notify_all()
+
+                try:
+                    getattr(self.listener, method)(argument)
+                except:
+                    self._logger.exception("Error calling a service listener")
+        finally:
+            local.delivering = False
+
+    def close(self):
+        """
+        Drops the pending notifications and releases the waiting threads
+        """
+        with self.condition:
+            self.closed = True
+            self.notifications.clear()
+            self.condition.notify_all()
+
+    def wait(self, timeout=None):
+        """
+        Waits for the pending notifications to be delivered
+
+        :param timeout: Maximum time to wait (in seconds, None for no limit)
+        :return: True if the queue is empty
+        """
+        with self.condition:
+            if self.worker is threading.current_thread():
+                # Called by the listener itself: can't wait for the end of
+                # the current notification
+                return not self.notifications
+
+            if timeout is None:
+                while self.scheduled:
+                    self.condition.wait()
+            else:
+                end = time.time() + timeout
+                while self.scheduled:
+                    remaining = end - time.time()
+                    if remaining <= 0:
+                        return False
+                    self.condition.wait(remaining)
+
+            return True
 
 
 class EventDispatcher(object):
     """
     Simple event dispatcher
     """
-    def __init__(self, logger=None):
+    def __init__(self, logger=None, async_events=False, queue_size=0,
+                 max_threads=4):
         """
         Sets up the dispatcher
 
         :param logger: The logger to be used
+        :param async_events: If True, the service listeners can ask for an
+                             asynchronous delivery of their events
+        :param queue_size: Maximum number of pending notifications per
+                           asynchronous listener (0 for no limit)
+        :param max_threads: Maximum number of threads delivering the
+                            asynchronous notifications
         """
         # Logger
         self._logger = logger or logging.getLogger("EventDispatcher")
 
+        # Asynchronous delivery
+        self.__async_events = async_events
+        self.__queue_size = queue_size
+        self.__max_threads = max_threads
+        self.__pool = None
+        self.__local = threading.local()
+
         # Bundle listeners
         self.__bnd_listeners = []
         self.__bnd_lock = threading.Lock()
 
-        # Service listeners (specification -> listener bean)
+        # Service listeners (specification -> listeners group)
         self.__svc_listeners = {}
         # listener instance -> listener bean
         self.__listeners_data = {}
@@ -565,10 +910,19 @@ class EventDispatcher(object):
 
         with self.__svc_lock:
             self.__svc_listeners.clear()
+            for data in self.__listeners_data.values():
+                if data.delivery is not None:
+                    data.delivery.close()
+            self.__listeners_data.clear()
+            pool = self.__pool
+            self.__pool = None
 
         with self.__fw_lock:
             self.__fw_listeners = []
 
+        if pool is not None:
+            pool.stop()
+
     def add_bundle_listener(self, listener):
         """
         Adds a bundle listener
@@ -613,7 +967,7 @@ class EventDispatcher(object):
             return True
 
     def add_service_listener(self, listener, specification=None,
-                             ldap_filter=None):
+                             ldap_filter=None, asynchronous=False):
         """
         Registers a service listener
 
@@ -622,6 +976,8 @@ class EventDispatcher(object):
                               (optional, None to accept all services)
         :param ldap_filter: Filter that must match the service properties
                             (optional, None to accept all services)
+        :param asynchronous: If True and if the dispatcher allows it, the
+                             events are delivered in order by a thread pool
         :return: True if the listener has been registered, False if it was
                  already known
         :raise BundleException: An invalid listener has been given
@@ -641,9 +997,20 @@ class EventDispatcher(object):
                 raise BundleException("Invalid service filter: {0}"
                                       .format(ex))
 
-            stored = _Listener(listener, specification, ldap_filter)
+            delivery = None
+            if asynchronous and self.__async_events:
+                delivery = _AsyncDelivery(
+                    listener, self.__queue_size, self._logger)
+                if self.__pool is None:
+                    self.__pool = pelix.threadpool.ThreadPool(
+                        self.__max_threads, 0,
+                        logname="pelix-service-events")
+                    self.__pool.start()
+
+            stored = _Listener(listener, specification, ldap_filter, delivery)
             self.__listeners_data[listener] = stored
-            self.__svc_listeners.setdefault(specification, []).append(stored)
+            self.__svc_listeners.setdefault(specification, _ListenerGroup()) \
+                .add(stored)
             return True
 
     def remove_bundle_listener(self, listener):
@@ -685,13 +1052,16 @@ class EventDispatcher(object):
             try:
                 data = self.__listeners_data.pop(listener)
                 spec_listeners = self.__svc_listeners[data.specification]
-                spec_listeners.remove(data)
-                if not spec_listeners:
+                if spec_listeners.remove(data):
                     del self.__svc_listeners[data.specification]
-                return True
-            except KeyError:
+            except (KeyError, ValueError):
                 return False
 
+        if data.delivery is not None:
+            # Drop the pending events
+            data.delivery.close()
+        return True
+
     def fire_bundle_event(self, event):
         """
         Notifies bundle events listeners of a new event in the calling thread.
@@ -725,14 +1095,16 @@ class EventDispatcher(object):
                 self._logger.exception("An error occurred calling one of the "
                                        "framework stop listeners")
 
-    def fire_service_event(self, event):
+    def __get_recipients(self, event):
         """
-        Notifies service events listeners of a new event in the calling thread.
+        Computes the listeners to notify of the given event, and the event
+        each one must receive
 
         :param event: The service event
+        :return: A list of (_Listener bean, event) tuples
         """
         # Get the service properties
-        properties = event.get_service_reference().get_properties()
+        properties = event.get_service_reference().get_properties_view()
         svc_specs = properties[OBJECTCLASS]
         previous = None
         endmatch_event = None
@@ -746,37 +1118,75 @@ class EventDispatcher(object):
                                           previous)
 
         with self.__svc_lock:
-            # Get the listeners for this specification
-            listeners = set()
-            for spec in svc_specs:
+            # Get the listeners for this specification which might match
+            # the service properties (each listener is in a single group)
+            listeners = []
+            for spec in set(svc_specs):
                 try:
-                    listeners.update(self.__svc_listeners[spec])
+                    self.__svc_listeners[spec].collect(
+                        properties, previous, listeners)
                 except KeyError:
                     pass
 
             # Add those which listen to any specification
             try:
-                listeners.update(self.__svc_listeners[None])
+                self.__svc_listeners[None].collect(
+                    properties, previous, listeners)
             except KeyError:
                 pass
 
-        # Get the listeners for this specification
+        # Results of the filters, shared by equivalent filters
+        matching = {}
+        previous_matching = {}
+        recipients = []
+
         for data in listeners:
             # Default event to send : the one we received
             sent_event = event
 
             # Test if the service properties matches the filter
             ldap_filter = data.ldap_filter
-            if ldap_filter is not None \
-                    and not ldap_filter.matches(properties):
-                # Event doesn't match listener filter...
-                if svc_modified and previous is not None \
-                        and ldap_filter.matches(previous):
+            if ldap_filter is not None:
+                filter_key = data.filter_key
+                try:
+                    matched = matching[filter_key]
+                except KeyError:
+                    matched = matching[filter_key] = \
+                        ldap_filter.matches(properties)
+
+                if not matched:
+                    # Event doesn't match listener filter...
+                    if not svc_modified or previous is None:
+                        # Didn't match before either, ignore it
+                        continue
+
+                    try:
+                        matched = previous_matching[filter_key]
+                    except KeyError:
+                        matched = previous_matching[filter_key] = \
+                            ldap_filter.matches(previous)
+
+                    if not matched:
+                        # Didn't match before either, ignore it
+                        continue
+
                     # ... but previous properties did match
                     sent_event = endmatch_event
-                else:
-                    # Didn't match before either, ignore it
-                    continue
+
+            recipients.append((data, sent_event))
+
+        return recipients
+
+    def fire_service_event(self, event):
+        """
+        Notifies service events listeners of a new event in the calling thread.
+
+        :param event: The service event
+        """
+        for data, sent_event in self.__get_recipients(event):
+            if data.delivery is not None:
+                self.__deliver(data.delivery, 'service_changed', sent_event)
+                continue
 
             # Call'em
             try:
@@ -784,8 +1194,153 @@ class EventDispatcher(object):
             except:
                 self._logger.exception("Error calling a service listener")
 
+    def fire_service_events(self, events):
+        """
+        Notifies service events listeners of a batch of events in the calling
+        thread.
+
+        Listeners implementing a ``services_changed(events)`` method are
+        called once, after the others, with the list of the events they
+        would have received. The other listeners are notified with
+        ``service_changed(event)``, event by event.
+
+        :param events: The list of service events
+        """
+        # Listener -> events (keeps the order of the first notification)
+        batches = []
+        batched_events = {}
+
+        for event in events:
+            for data, sent_event in self.__get_recipients(event):
+                listener = data.listener
+                if hasattr(listener, 'services_changed'):
+                    # Listener accepts batches
+                    try:
+                        batched_events[listener].append(sent_event)
+                    except KeyError:
+                        batched_events[listener] = [sent_event]
+                        batches.append(data)
+                elif data.delivery is not None:
+                    self.__deliver(
+                        data.delivery, 'service_changed', sent_event)
+                else:
+                    try:
+                        listener.service_changed(sent_event)
+                    except:
+                        self._logger.exception(
+                            "Error calling a service listener")
+
+        for data in batches:
+            listener = data.listener
+            if data.delivery is not None:
+                self.__deliver(data.delivery, 'services_changed',
+                               batched_events[listener])
+                continue
+
+            try:
+                listener.services_changed(batched_events[listener])
+            except:
+                self._logger.exception(
+                    "Error calling a service listener with a batch of events")
+
+    def __deliver(self, delivery, method, argument):
+        """
+        Queues a notification for an asynchronous listener
+
+        :param delivery: The queue of the listener
+        :param method: Name of the listener method to call
+        :param argument: Argument of the listener method
+        """
+        # Threads delivering events never wait for a queue to have room, to
+        # avoid dead locks between listeners
+        local = self.__local
+        if delivery.push(method, argument,
+                         not getattr(local, 'delivering', False)):
+            pool = self.__pool
+            if pool is not None:
+                pool.enqueue(delivery.drain, local)
+
+    def flush_service_events(self, timeout=None):
+        """
+        Waits for the service events queued for asynchronous listeners to be
+        delivered. The events fired during the call might not be waited for.
+
+        :param timeout: Maximum time to wait (in seconds, None for no limit)
+        :return: True if all events have been delivered, False on timeout
+        """
+        with self.__svc_lock:
+            deliveries = [data.delivery
+                          for data in self.__listeners_data.values()
+                          if data.delivery is not None]
+
+        if timeout is not None:
+            end = time.time() + timeout
+
+        for delivery in deliveries:
+            if timeout is None:
+                delivery.wait()
+            elif not delivery.wait(max(end - time.time(), 0)):
+                return False
+
+        return True
+
+
 # ------------------------------------------------------------------------------
 
+_EMPTY_POSTINGS = frozenset()
+""" Postings of an indexed value which is not used by any service """
+
+LOOKUP_CACHE_SIZE = 1024
+""" Maximum number of service lookup results kept by the registry """
+
+DEFAULT_CHANGES_SIZE = 1024
+""" Default number of changes kept in the change feed of the registry """
+
+
+def _parse_index_names(names):
+    """
+    Parses the value of the framework property listing the indexed service
+    properties
+
+    :param names: A list of names or a comma-separated string
+    :return: The list of property names
+    """
+    if not names:
+        return []
+    elif is_string(names):
+        names = names.split(',')
+
+    return [name.strip() for name in names if name and name.strip()]
+
+
+def _index_tokens(value):
+    """
+    Computes the index tokens of a property value: the strings an equality
+    criterion (see ``ldapfilter.is_equality()``) compares the filter value to
+
+    :param value: A property value
+    :return: A frozen set of strings
+    """
+    if isinstance(value, ldapfilter.ITERABLES):
+        return frozenset(item if is_string(item) else repr(item)
+                         for item in value)
+    elif is_string(value):
+        return frozenset((value,))
+
+    return frozenset((repr(value),))
+
+
+def _sorted_contains(sorted_refs, svc_ref):
+    """
+    Checks if the given reference is in the sorted list of references
+
+    :param sorted_refs: A list of references, sorted by their sort key
+    :param svc_ref: A service reference
+    :return: True if the reference is in the list
+    """
+    idx = bisect.bisect_left(sorted_refs, svc_ref)
+    return idx < len(sorted_refs) and sorted_refs[idx] is svc_ref
+
 
 class ServiceRegistry(object):
     """
@@ -833,6 +1388,113 @@ class ServiceRegistry(object):
         # Pending unregistration: Service reference -> Service instance
         self.__pending_services = {}
 
+        # Indexed property -> {value token -> set(Service references)}
+        self.__indexes = dict(
+            (name, {}) for name in _parse_index_names(
+                framework.get_property(REGISTRY_INDEXED_PROPERTIES)))
+
+        # Service reference -> {Indexed property -> value tokens}
+        self.__indexed_refs = {}
+
+        # The index lock is never held while waiting for another lock
+        self.__index_lock = threading.Lock()
+
+        # Generation of the registry content, increased on each modification
+        self.__generation = 0
+
+        # (specification, filter, only one) -> lookup result, valid for the
+        # current generation only
+        self.__lookup_cache = {}
+
+        # Change feed: last (generation, kind, reference) tuples
+        changes_size = framework.get_property(REGISTRY_CHANGES_SIZE)
+        try:
+            changes_size = max(int(changes_size), 0) \
+                if changes_size is not None else DEFAULT_CHANGES_SIZE
+        except (TypeError, ValueError):
+            self._logger.warning("Invalid size of change feed: %s",
+                                 changes_size)
+            changes_size = DEFAULT_CHANGES_SIZE
+
+        self.__changes = collections.deque(maxlen=changes_size)
+
+        # The feed holds all the changes made after this generation
+        self.__changes_start = 0
+
+    def __changed(self, kind=None, svc_refs=()):
+        """
+        Increases the generation of the registry after a modification of its
+        content. The registry lock must be held by the caller.
+
+        :param kind: Kind of modification (ServiceEvent constant), None if the
+                     whole registry changed
+        :param svc_refs: The modified service references
+        """
+        self.__generation += 1
+        self.__lookup_cache.clear()
+
+        changes = self.__changes
+        if kind is None:
+            # Callers must resynchronize
+            changes.clear()
+            self.__changes_start = self.__generation
+            return
+
+        for svc_ref in svc_refs:
+            if len(changes) == changes.maxlen:
+                if not changes.maxlen:
+                    # No feed
+                    self.__changes_start = self.__generation
+                    break
+
+                # The oldest change will be dropped
+                self.__changes_start = changes[0][0]
+
+            changes.append((self.__generation, kind, svc_ref))
+
+    def get_changes(self, since_generation):
+        """
+        Returns the modifications of the registry made after the given
+        generation, in order.
+
+        The result is None if the change feed doesn't hold all those
+        modifications: the caller must then look for all services again
+        (``find_service_references()``).
+
+        :param since_generation: Generation of the last synchronization
+        :return: A (current generation, changes) tuple, where changes is a
+                 list of (generation, kind, service reference) tuples, with
+                 a ServiceEvent kind (REGISTERED, MODIFIED or UNREGISTERING),
+                 or None
+        """
+        with self.__svc_lock:
+            generation = self.__generation
+            if since_generation == generation:
+                # Nothing new
+                return generation, []
+            elif since_generation > generation \
+                    or since_generation < self.__changes_start:
+                # Unknown generation or lost changes
+                return generation, None
+
+            # Changes are sorted by generation
+            changes = self.__changes
+            idx = len(changes)
+            while idx > 0 and changes[idx - 1][0] > since_generation:
+                idx -= 1
+
+            return generation, [changes[i] for i in range(idx, len(changes))]
+
+    def get_generation(self):
+        """
+        Returns the generation of the registry content: it is increased each
+        time a service is registered, modified or unregistered
+
+        :return: The current generation
+        """
+        with self.__svc_lock:
+            return self.__generation
+
     def clear(self):
         """
         Clears the registry
@@ -845,6 +1507,12 @@ class ServiceRegistry(object):
             self.__bundle_imports.clear()
             self.__factory_usage.clear()
             self.__pending_services.clear()
+            self.__changed()
+
+            with self.__index_lock:
+                for index in self.__indexes.values():
+                    index.clear()
+                self.__indexed_refs.clear()
 
     def register(self, bundle, classes, properties, svc_instance,
                  factory, prototype):
@@ -861,49 +1529,224 @@ class ServiceRegistry(object):
         :return: The ServiceRegistration object
         """
         with self.__svc_lock:
-            # Prepare properties
-            service_id = self.__next_service_id
-            self.__next_service_id += 1
-            properties[OBJECTCLASS] = classes
-            properties[SERVICE_ID] = service_id
-            properties[SERVICE_BUNDLEID] = bundle.get_bundle_id()
-
-            # Compute service scope
-            if prototype:
-                properties[SERVICE_SCOPE] = SCOPE_PROTOTYPE
-            elif factory:
-                properties[SERVICE_SCOPE] = SCOPE_BUNDLE
-            else:
-                properties[SERVICE_SCOPE] = SCOPE_SINGLETON
+            svc_registration = self.__store_service(
+                bundle, classes, properties, svc_instance, factory, prototype)
+
+            svc_ref = svc_registration.get_reference()
+            for spec in classes:
+                spec_refs = self.__svc_specs.setdefault(spec, [])
+                bisect.insort_left(spec_refs, svc_ref)
+
+            self.__changed(ServiceEvent.REGISTERED, (svc_ref,))
+            return svc_registration
+
+    def register_many(self, bundle, services):
+        """
+        Registers multiple services at once
+
+        :param bundle: The bundle that registers the services
+        :param services: A list of (classes, properties, service instance,
+                         factory, prototype) tuples (see ``register()``)
+        :return: The list of ServiceRegistration objects
+        """
+        with self.__svc_lock:
+            registrations = []
+            new_refs = {}
+            for classes, properties, svc_instance, factory, prototype \
+                    in services:
+                svc_registration = self.__store_service(
+                    bundle, classes, properties, svc_instance, factory,
+                    prototype)
+                registrations.append(svc_registration)
+
+                svc_ref = svc_registration.get_reference()
+                for spec in classes:
+                    new_refs.setdefault(spec, []).append(svc_ref)
+
+            # Sort each specification list once
+            for spec, refs in new_refs.items():
+                spec_refs = self.__svc_specs.setdefault(spec, [])
+                spec_refs.extend(refs)
+                spec_refs.sort()
+
+            if registrations:
+                self.__changed(
+                    ServiceEvent.REGISTERED,
+                    [registration.get_reference()
+                     for registration in registrations])
+            return registrations
+
+    def __store_service(self, bundle, classes, properties, svc_instance,
+                        factory, prototype):
+        """
+        Stores a service in the registry, except in the specifications lists.
+        The registry lock must be held by the caller.
+
+        :return: The ServiceRegistration object
+        """
+        # Prepare properties
+        service_id = self.__next_service_id
+        self.__next_service_id += 1
+        properties[OBJECTCLASS] = classes
+        properties[SERVICE_ID] = service_id
+        properties[SERVICE_BUNDLEID] = bundle.get_bundle_id()
+
+        # Compute service scope
+        if prototype:
+            properties[SERVICE_SCOPE] = SCOPE_PROTOTYPE
+        elif factory:
+            properties[SERVICE_SCOPE] = SCOPE_BUNDLE
+        else:
+            properties[SERVICE_SCOPE] = SCOPE_SINGLETON
+
+        # Force to have a valid service ranking
+        try:
+            properties[SERVICE_RANKING] = int(properties[SERVICE_RANKING])
+        except (KeyError, ValueError, TypeError):
+            properties[SERVICE_RANKING] = 0
+
+        # Make the service reference
+        svc_ref = ServiceReference(bundle, properties)
+
+        # Make the service registration
+        svc_registration = ServiceRegistration(
+            self.__framework, svc_ref, properties, self.__update_properties)
+
+        # Store service information
+        if prototype or factory:
+            self.__svc_factories[svc_ref] = (svc_instance, svc_registration)
+
+        # Also store factories, as they must appear like any other service
+        self.__svc_registry[svc_ref] = svc_instance
+
+        # Index its properties
+        self.__index_service(svc_ref, properties)
+
+        # Reverse map, to ease bundle/service association
+        bundle_services = self.__bundle_svc.setdefault(bundle, set())
+        bundle_services.add(svc_ref)
+        return svc_registration
+
+    def __index_service(self, svc_ref, properties, update=False):
+        """
+        Adds the given service reference to the property indexes, or updates
+        its entries if it is already indexed
+
+        :param svc_ref: A service reference
+        :param properties: The current properties of the service
+        :param update: If True, only update the entries of an indexed service
+        """
+        if not self.__indexes:
+            # No index
+            return
+
+        # Compute the tokens before locking
+        ref_tokens = dict((name, _index_tokens(properties[name]))
+                          for name in self.__indexes if name in properties)
+
+        with self.__index_lock:
+            if not self.__unindex_service(svc_ref) and update:
+                # Unregistered or hidden service
+                return
+
+            self.__indexed_refs[svc_ref] = ref_tokens
+            for name, tokens in ref_tokens.items():
+                index = self.__indexes[name]
+                for token in tokens:
+                    index.setdefault(token, set()).add(svc_ref)
+
+    def __unindex_service(self, svc_ref):
+        """
+        Removes the given service reference from the property indexes.
+        The index lock must be held by the caller.
+
+        :param svc_ref: A service reference
+        :return: True if the reference was indexed
+        """
+        try:
+            ref_tokens = self.__indexed_refs.pop(svc_ref)
+        except KeyError:
+            return False
+
+        for name, tokens in ref_tokens.items():
+            index = self.__indexes[name]
+            for token in tokens:
+                postings = index[token]
+                postings.discard(svc_ref)
+                if not postings:
+                    del index[token]
+        return True
+
+    def __remove_from_indexes(self, svc_ref):
+        """
+        Removes the given service reference from the property indexes
+
+        :param svc_ref: A service reference
+        """
+        if self.__indexes:
+            with self.__index_lock:
+                self.__unindex_service(svc_ref)
+
+    def __index_candidates(self, ldap_filter):
+        """
+        Computes the set of the services which might match the given filter,
+        using the equality criteria on indexed properties
+
+        :param ldap_filter: A parsed LDAP filter
+        :return: A set of service references, or None if the indexes can't
+                 restrict the search
+        """
+        if isinstance(ldap_filter, ldapfilter.LDAPCriteria):
+            if not ldapfilter.is_equality(ldap_filter):
+                # Not an equality test
+                return None
 
-            # Force to have a valid service ranking
             try:
-                properties[SERVICE_RANKING] = int(properties[SERVICE_RANKING])
-            except (KeyError, ValueError, TypeError):
-                properties[SERVICE_RANKING] = 0
+                index = self.__indexes[ldap_filter.name]
+            except KeyError:
+                # Property is not indexed
+                return None
 
-            # Make the service reference
-            svc_ref = ServiceReference(bundle, properties)
+            return index.get(ldap_filter.value, _EMPTY_POSTINGS)
 
-            # Make the service registration
-            svc_registration = ServiceRegistration(
-                self.__framework, svc_ref, properties, self.__sort_registry)
+        operator = ldap_filter.operator
+        if operator == ldapfilter.NOT:
+            return None
 
-            # Store service information
-            if prototype or factory:
-                self.__svc_factories[svc_ref] = (svc_instance, svc_registration)
+        # Postings of the sub-filters
+        postings = []
+        for subfilter in ldap_filter.subfilters:
+            sub_postings = self.__index_candidates(subfilter)
+            if sub_postings is not None:
+                postings.append(sub_postings)
+            elif operator == ldapfilter.OR:
+                # One branch of the OR can't be restricted
+                return None
 
-            # Also store factories, as they must appear like any other service
-            self.__svc_registry[svc_ref] = svc_instance
+        if not postings:
+            return None
+        elif operator == ldapfilter.OR:
+            return set().union(*postings)
 
-            for spec in classes:
-                spec_refs = self.__svc_specs.setdefault(spec, [])
-                bisect.insort_left(spec_refs, svc_ref)
+        # AND: intersect, starting with the smallest set
+        postings.sort(key=len)
+        return postings[0].intersection(*postings[1:])
 
-            # Reverse map, to ease bundle/service association
-            bundle_services = self.__bundle_svc.setdefault(bundle, set())
-            bundle_services.add(svc_ref)
-            return svc_registration
+    def __update_properties(self, svc_ref):
+        """
+        Updates the registry after the modification of the properties of a
+        service: its sort key and its index entries
+
+        :param svc_ref: The reference to a modified service
+        """
+        with self.__svc_lock:
+            if svc_ref.needs_sort_update():
+                # The sort key and the registry must be updated
+                self.__sort_registry(svc_ref)
+
+            self.__index_service(svc_ref, svc_ref.get_properties_view(), True)
+            if svc_ref in self.__svc_registry:
+                self.__changed(ServiceEvent.MODIFIED, (svc_ref,))
 
     def __sort_registry(self, svc_ref):
         """
@@ -950,11 +1793,9 @@ class ServiceRegistry(object):
             if svc_ref not in self.__svc_registry:
                 raise BundleException("Unknown service: {0}".format(svc_ref))
 
-            # Get the owner
-            bundle = svc_ref.get_bundle()
-
             # Get the service instance
             service = self.__svc_registry.pop(svc_ref)
+            self.__remove_from_indexes(svc_ref)
 
             for spec in svc_ref.get_property(OBJECTCLASS):
                 spec_services = self.__svc_specs[spec]
@@ -964,22 +1805,89 @@ class ServiceRegistry(object):
                 if not spec_services:
                     del self.__svc_specs[spec]
 
-            # Remove the service factory
-            if svc_ref.is_factory():
-                # Call unget_service for all client bundle
-                factory, svc_reg = self.__svc_factories.pop(svc_ref)
-                for counter in self.__factory_usage.values():
-                    counter.cleanup_service(factory, svc_reg)
-            else:
-                # Delete bundle association
-                bundle_services = self.__bundle_svc[bundle]
-                bundle_services.remove(svc_ref)
-                if not bundle_services:
-                    # Don't keep empty lists
-                    del self.__bundle_svc[bundle]
-
+            self.__forget_service(svc_ref)
+            self.__changed(ServiceEvent.UNREGISTERING, (svc_ref,))
             return service
 
+    def unregister_many(self, svc_refs):
+        """
+        Unregisters multiple services at once: the references are removed
+        from the indexes and from the specifications lists in a single pass
+
+        :param svc_refs: A list of service references
+        :return: The list of the unregistered service instances
+        :raise BundleException: Unknown service reference (nothing is
+                                unregistered)
+        """
+        with self.__svc_lock:
+            if len(set(svc_refs)) != len(svc_refs):
+                raise BundleException("Service references given twice")
+
+            for svc_ref in svc_refs:
+                if svc_ref not in self.__svc_registry \
+                        and svc_ref not in self.__pending_services:
+                    raise BundleException(
+                        "Unknown service: {0}".format(svc_ref))
+
+            services = []
+            removed = []
+            for svc_ref in svc_refs:
+                try:
+                    # Hidden service: already out of the lists
+                    services.append(self.__pending_services.pop(svc_ref))
+                except KeyError:
+                    services.append(self.__svc_registry.pop(svc_ref))
+                    removed.append(svc_ref)
+
+            if not removed:
+                return services
+
+            if self.__indexes:
+                with self.__index_lock:
+                    for svc_ref in removed:
+                        self.__unindex_service(svc_ref)
+
+            # Filter each specification list once
+            removed_set = set(removed)
+            specs = set()
+            for svc_ref in removed:
+                specs.update(svc_ref.get_property(OBJECTCLASS))
+
+            for spec in specs:
+                spec_services = self.__svc_specs[spec]
+                spec_services[:] = [svc_ref for svc_ref in spec_services
+                                    if svc_ref not in removed_set]
+                if not spec_services:
+                    del self.__svc_specs[spec]
+
+            for svc_ref in removed:
+                self.__forget_service(svc_ref)
+
+            self.__changed(ServiceEvent.UNREGISTERING, removed)
+            return services
+
+    def __forget_service(self, svc_ref):
+        """
+        Removes the association between an unregistered service and its
+        bundle, or cleans up its factory. The registry lock must be held by
+        the caller.
+
+        :param svc_ref: The reference of the unregistered service
+        """
+        if svc_ref.is_factory():
+            # Call unget_service for all client bundle
+            factory, svc_reg = self.__svc_factories.pop(svc_ref)
+            for counter in self.__factory_usage.values():
+                counter.cleanup_service(factory, svc_reg)
+        else:
+            # Delete bundle association
+            bundle = svc_ref.get_bundle()
+            bundle_services = self.__bundle_svc[bundle]
+            bundle_services.remove(svc_ref)
+            if not bundle_services:
+                # Don't keep empty lists
+                del self.__bundle_svc[bundle]
+
     def hide_bundle_services(self, bundle):
         """
         Hides the services of the given bundle (removes them from lists, but
@@ -997,6 +1905,7 @@ class ServiceRegistry(object):
             else:
                 # Clean the registry
                 specs = set()
+                hidden = []
                 for svc_ref in svc_refs:
                     if svc_ref.is_factory():
                         continue
@@ -1004,7 +1913,9 @@ class ServiceRegistry(object):
                     # Remove direct references
                     self.__pending_services[svc_ref] = \
                         self.__svc_registry.pop(svc_ref)
+                    self.__remove_from_indexes(svc_ref)
                     specs.update(svc_ref.get_property(OBJECTCLASS))
+                    hidden.append(svc_ref)
 
                     # Clean the specifications cache
                     for spec in svc_ref.get_property(OBJECTCLASS):
@@ -1015,6 +1926,10 @@ class ServiceRegistry(object):
                         if not spec_services:
                             del self.__svc_specs[spec]
 
+                if hidden:
+                    hidden.sort()
+                    self.__changed(ServiceEvent.UNREGISTERING, hidden)
+
             return svc_refs
 
     def find_service_references(self, clazz=None, ldap_filter=None,
@@ -1022,6 +1937,9 @@ class ServiceRegistry(object):
         """
         Finds all services references matching the given filter.
 
+        The results of the lookups made with a string filter are kept until
+        the next modification of the registry.
+
         :param clazz: Class implemented by the service
         :param ldap_filter: Service filter
         :param only_one: Return the first matching service reference only
@@ -1029,52 +1947,101 @@ class ServiceRegistry(object):
         :raise BundleException: An error occurred looking for service
                                 references
         """
+        if hasattr(clazz, '__name__'):
+            # Escape the type name
+            clazz = ldapfilter.escape_LDAP(clazz.__name__)
+        elif is_string(clazz):
+            # Escape the class name
+            clazz = ldapfilter.escape_LDAP(clazz)
+
+        if (clazz is None or is_string(clazz)) \
+                and (ldap_filter is None or is_string(ldap_filter)):
+            key = (clazz, ldap_filter, bool(only_one))
+        else:
+            # Can't be cached
+            key = None
+
         with self.__svc_lock:
-            if clazz is None and ldap_filter is None:
-                # Return a sorted copy of the keys list
-                # Do not return None, as the whole content was required
-                return sorted(self.__svc_registry.keys())
-
-            if hasattr(clazz, '__name__'):
-                # Escape the type name
-                clazz = ldapfilter.escape_LDAP(clazz.__name__)
-            elif is_string(clazz):
-                # Escape the class name
-                clazz = ldapfilter.escape_LDAP(clazz)
-
-            if clazz is None:
-                # Directly use the given filter
+            try:
+                result = self.__lookup_cache[key]
+            except KeyError:
+                result = self.__find_service_references(
+                    clazz, ldap_filter, only_one)
+
+                if key is not None:
+                    if len(self.__lookup_cache) >= LOOKUP_CACHE_SIZE:
+                        self.__lookup_cache.clear()
+                    self.__lookup_cache[key] = result
+
+        # Always return a copy of the cached list
+        return result[:] if result is not None else None
+
+    def __find_service_references(self, clazz, ldap_filter, only_one):
+        """
+        Finds all services references matching the given filter.
+        The registry lock must be held by the caller.
+
+        :param clazz: Escaped name of the specification (or None)
+        :param ldap_filter: Service filter
+        :param only_one: Return the first matching service reference only
+        :return: A list of found references, or None
+        :raise BundleException: Invalid filter
+        """
+        if clazz is None and ldap_filter is None:
+            # Return a sorted copy of the keys list
+            # Do not return None, as the whole content was required
+            return sorted(self.__svc_registry.keys())
+
+        # Parse the filter
+        try:
+            new_filter = ldapfilter.get_ldap_filter(ldap_filter)
+        except ValueError as ex:
+            raise BundleException(ex)
+
+        candidates = None
+        if new_filter is not None and self.__indexes:
+            # Use the property indexes to restrict the search
+            with self.__index_lock:
+                candidates = self.__index_candidates(new_filter)
+                if candidates is not None:
+                    candidates = list(candidates)
+
+        if clazz is None:
+            # Directly use the given filter
+            if candidates is None:
                 refs_set = sorted(self.__svc_registry.keys())
             else:
-                try:
-                    # Only for references with the given specification
-                    refs_set = iter(self.__svc_specs[clazz])
-                except KeyError:
-                    # No matching specification
-                    return None
-
-            # Parse the filter
+                refs_set = sorted(candidates)
+        else:
             try:
-                new_filter = ldapfilter.get_ldap_filter(ldap_filter)
-            except ValueError as ex:
-                raise BundleException(ex)
+                # Only for references with the given specification
+                spec_refs = self.__svc_specs[clazz]
+            except KeyError:
+                # No matching specification
+                return None
 
-            if new_filter is not None:
-                # Prepare a generator, as we might not need a complete
-                # walk-through
-                refs_set = (ref for ref in refs_set
-                            if new_filter.matches(ref.get_properties()))
+            if candidates is None:
+                refs_set = iter(spec_refs)
+            else:
+                refs_set = sorted(ref for ref in candidates
+                                  if _sorted_contains(spec_refs, ref))
 
-            if only_one:
-                # Return the first element in the list/generator
-                try:
-                    return [next(refs_set)]
-                except StopIteration:
-                    # No match
-                    return None
+        if new_filter is not None:
+            # Prepare a generator, as we might not need a complete
+            # walk-through
+            refs_set = (ref for ref in refs_set
+                        if new_filter.matches(ref.get_properties_view()))
+
+        if only_one:
+            # Return the first element in the list/generator
+            try:
+                return [next(refs_set)]
+            except StopIteration:
+                # No match
+                return None
 
-            # Get all the matching references
-            return list(refs_set) or None
+        # Get all the matching references
+        return list(refs_set) or None
 
     def get_bundle_imported_services(self, bundle):
         """
@@ -161,6 +161,20 @@ If True, the component will be re-instantiated after its bundle has been
 updated
 """
 
+IPOPO_PARALLEL_VALIDATION = "pelix.ipopo.validation.parallel"
+"""
+If True, the validation callback of the component is called in the validation
+thread pool of iPOPO, instead of the thread which triggered the validation.
+Can be set as a component property or, for all components, as a framework
+property.
+"""
+
+IPOPO_VALIDATION_THREADS = "pelix.ipopo.validation.threads"
+"""
+Maximum number of threads of the validation thread pool of iPOPO (framework
+property, 10 by default)
+"""
+
 # ------------------------------------------------------------------------------
 
 
@@ -216,7 +216,8 @@ class FactoryContext(object):
     __slots__ = ('bundle_context', 'callbacks', 'completed', 'field_callbacks',
                  'is_singleton', 'is_singleton_active', 'name', 'properties',
                  'hidden_properties', 'properties_fields', '__handlers',
-                 '__inherited_configuration', '__instances')
+                 '__inherited_configuration', '__instances',
+                 '__dispatch_tables')
 
     def __init__(self):
         """
@@ -261,6 +262,9 @@ class FactoryContext(object):
         # Instance name -> Instance properties
         self.__instances = {}
 
+        # Handlers composition -> dispatch table (see pelix.ipopo.instance)
+        self.__dispatch_tables = {}
+
     def __eq__(self, other):
         """
         Equality test
@@ -387,6 +391,17 @@ class FactoryContext(object):
         """
         return self._deepcopy(self.__instances)
 
+    def get_dispatch_tables(self):
+        # type: () -> Dict[tuple, Dict[str, tuple]]
+        """
+        Returns the dispatch tables of the handlers of the components of this
+        factory, computed by the instance managers. They are released with the
+        factory context.
+
+        :return: A dictionary: handlers composition → dispatch table
+        """
+        return self.__dispatch_tables
+
     def get_handlers_ids(self):
         # type: () -> List[str]
         """
@@ -461,13 +476,17 @@ class ComponentContext(object):
         properties[constants.IPOPO_INSTANCE_NAME] = name
 
         # Hidden properties
-        hidden_props_keys = set(properties).intersection(
-            factory_context.hidden_properties)
-
-        self.__hidden_properties = factory_context.hidden_properties.copy()
-        self.__hidden_properties.update({
-            key: value for key, value in properties.items()
-            if key in hidden_props_keys})
+        factory_hidden = factory_context.hidden_properties
+        if factory_hidden:
+            hidden_props_keys = set(properties).intersection(factory_hidden)
+            self.__hidden_properties = factory_hidden.copy()
+            self.__hidden_properties.update({
+                key: value for key, value in properties.items()
+                if key in hidden_props_keys})
+        else:
+            # Most components have no hidden property: avoid a copy
+            hidden_props_keys = ()
+            self.__hidden_properties = None
 
         # Public properties
         self.properties = factory_context.properties.copy()
@@ -551,9 +570,13 @@ class ComponentContext(object):
         :raise AttributeError: On any call after the first one
         """
         # Copy properties
-        result = self.__hidden_properties.copy()
+        hidden_properties = self.__hidden_properties
+        if hidden_properties is None:
+            result = {}
+        else:
+            result = hidden_properties.copy()
+            hidden_properties.clear()
 
         # Destroy the field
-        self.__hidden_properties.clear()
         del self.__hidden_properties
         return result
@@ -34,7 +34,7 @@ import threading
 
 # Standard typing module should be optional
 try:
-    from typing import Any, Dict, List, Optional, Set, Tuple
+    from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 except ImportError:
     pass
 
@@ -42,12 +42,16 @@ except ImportError:
 from pelix.constants import SERVICE_ID, BundleActivator
 from pelix.framework import Bundle, BundleContext, BundleException, \
     ServiceReference
+from pelix.internals.asyncloop import EventLoopThread
 from pelix.internals.events import BundleEvent, ServiceEvent
+from pelix.internals.profiler import KIND_INSTANTIATE
+from pelix.threadpool import ThreadPool
 from pelix.utilities import add_listener, remove_listener, is_string
 
 # iPOPO constants
 import pelix.ipopo.constants as constants
 import pelix.ipopo.handlers.constants as handlers_const
+from pelix.ipopo.handlers.tracker import DependencyTracker
 
 # iPOPO beans
 from pelix.ipopo.contexts import FactoryContext, ComponentContext
@@ -76,9 +80,31 @@ BUILTIN_HANDLERS = ('pelix.ipopo.handlers.properties',
                     'pelix.ipopo.handlers.requiresvarfilter',
                     'pelix.ipopo.handlers.temporal')
 
+COROUTINES_STOP_TIMEOUT = 10
+"""
+Time to wait for the coroutines of component callbacks when iPOPO stops (in
+seconds), before cancelling them
+"""
+
+DEFAULT_VALIDATION_THREADS = 10
+""" Default maximum number of threads of the validation thread pool """
+
 # ------------------------------------------------------------------------------
 
 
+def _to_flag(value):
+    # type: (Any) -> bool
+    """
+    Converts a property value, which can be given as a string, to a boolean
+
+    :param value: A property value
+    :return: The boolean value of the property (False if not set)
+    """
+    if is_string(value):
+        return value.strip().lower() in ("true", "1")
+    return bool(value)
+
+
 def _set_factory_context(factory_class, bundle_context):
     # type: (type, Optional[BundleContext]) -> Optional[FactoryContext]
     """
@@ -161,6 +187,24 @@ class _IPopoService(object):
         # Store the bundle context
         self.__context = bundle_context
 
+        # Boot profiler of the framework (None if disabled)
+        self._profiler = bundle_context.get_framework().get_profiler()
+
+        # Service listeners shared by the dependency handlers
+        self._dependency_tracker = DependencyTracker(bundle_context)
+
+        # Service registrations deferred by instantiate_many(), per thread
+        self.__batch = threading.local()
+
+        # Event loop running the coroutines of component callbacks
+        self.__event_loop = EventLoopThread("ipopo-asyncio")
+
+        # Thread pool calling the validation callbacks (created on first use)
+        self.__validation_pool = None  # type: ThreadPool
+        self.__validation_lock = threading.Lock()
+        self.__parallel_validation = _to_flag(
+            bundle_context.get_property(constants.IPOPO_PARALLEL_VALIDATION))
+
         # Factories registry : name -> factory class
         self.__factories = {}  # type: Dict[str, type]
 
@@ -345,19 +389,38 @@ class _IPopoService(object):
         :return: True if the component has started,
                  False if a handler is missing
         """
+        stored_instance = self.__prepare_instance(component_context, instance)
+        if stored_instance is None:
+            # A handler is missing
+            return False
+
+        self.__start_instance(stored_instance)
+        return True
+
+    def __prepare_instance(self, component_context, instance):
+        # type: (ComponentContext, object) -> Optional[StoredInstance]
+        """
+        Sets up the handlers of a component and stores it, if all of its
+        handlers are there. The component must then be started with
+        __start_instance().
+
+        :param component_context: A ComponentContext bean
+        :param instance: The component instance
+        :return: The StoredInstance bean of the component, or None if a
+                 handler is missing
+        """
         with self.__instances_lock:
             # Extract information about the component
             factory_context = component_context.factory_context
             handlers_ids = factory_context.get_handlers_ids()
             name = component_context.name
-            factory_name = factory_context.name
 
             try:
                 # Get handlers
                 handler_factories = self.__get_handler_factories(handlers_ids)
             except KeyError:
                 # A handler is missing, stop here
-                return False
+                return None
 
             # Instantiate the handlers
             all_handlers = set()  # type: Set[Any]
@@ -377,19 +440,140 @@ class _IPopoService(object):
 
             # Store the instance
             self.__instances[name] = stored_instance
+            return stored_instance
 
+    def __start_instance(self, stored_instance):
+        # type: (StoredInstance) -> None
+        """
+        Starts the handlers of a prepared component and tries to validate it
+
+        :param stored_instance: The StoredInstance bean of the component
+        """
         # Start the manager
         stored_instance.start()
 
         # Notify listeners now that every thing is ready to run
         self._fire_ipopo_event(constants.IPopoEvent.INSTANTIATED,
-                               factory_name, name)
+                               stored_instance.factory_name,
+                               stored_instance.name)
 
         # Try to validate it
         stored_instance.update_bindings()
         stored_instance.check_lifecycle()
+
+    @staticmethod
+    def __sort_by_dependencies(stored_instances):
+        # type: (List[StoredInstance]) -> List[List[StoredInstance]]
+        """
+        Groups the given components in levels, so that those providing a
+        service come in a level before those requiring it. Components in a
+        dependency cycle are kept in their original order.
+
+        :param stored_instances: A list of StoredInstance beans
+        :return: The list of levels, each one being a list of components
+        """
+        # Specification -> indexes of the components providing it
+        providers = {}
+        for idx, stored_instance in enumerate(stored_instances):
+            for handler in stored_instance.get_handlers(
+                    handlers_const.KIND_SERVICE_PROVIDER):
+                for spec in getattr(handler, 'specifications', None) or ():
+                    providers.setdefault(spec, set()).add(idx)
+
+        # Index -> indexes of the components it waits for
+        waiting = []
+        for idx, stored_instance in enumerate(stored_instances):
+            required = set()
+            for handler in stored_instance.get_handlers(
+                    handlers_const.KIND_DEPENDENCY):
+                requirement = getattr(handler, 'requirement', None)
+                if requirement is not None:
+                    required.update(
+                        providers.get(requirement.specification, ()))
+            required.discard(idx)
+            waiting.append(required)
+
+        result = []
+        remaining = list(range(len(stored_instances)))
+        while remaining:
+            ready = [idx for idx in remaining if not waiting[idx]]
+            if not ready:
+                # Dependency cycle: start the first remaining component
+                ready = remaining[:1]
+
+            result.append([stored_instances[idx] for idx in ready])
+            for idx in ready:
+                for required in waiting:
+                    required.discard(idx)
+
+            ready = set(ready)
+            remaining = [idx for idx in remaining if idx not in ready]
+
+        return result
+
+    def _defer_registration(self, handler):
+        # type: (Any) -> bool
+        """
+        Defers the registration of the service of the given provides handler
+        if the current thread is starting a batch of components (see
+        instantiate_many()). The service is then registered with those of the
+        other components of the batch, with a single register_services() call.
+
+        :param handler: A ServiceRegistrationHandler
+        :return: True if the registration has been deferred
+        """
+        handlers = getattr(self.__batch, 'handlers', None)
+        if handlers is None:
+            return False
+
+        if handler not in handlers:
+            handlers.append(handler)
         return True
 
+    def __register_deferred(self):
+        """
+        Registers the services deferred while starting a batch of components.
+        The services registered by the listeners of these services are
+        deferred too, and registered in turn.
+        """
+        while self.__batch.handlers:
+            handlers = self.__batch.handlers
+            self.__batch.handlers = []
+
+            # Bundle context -> [(handler, (specs, service, properties,
+            #                               factory))]
+            by_context = {}  # type: Dict[BundleContext, List[Tuple]]
+            for handler in handlers:
+                request = handler._prepare_registration()
+                if request is not None:
+                    # The service must still be registered
+                    by_context.setdefault(
+                        handler._ipopo_instance.bundle_context, []) \
+                        .append((handler, request))
+
+            for context, requests in by_context.items():
+                try:
+                    registrations = context.register_services(
+                        [request for _, request in requests])
+                except BundleException as ex:
+                    _logger.warning("Error registering a batch of services, "
+                                    "registering them one by one: %s", ex)
+                    registrations = []
+                    for _, (specs, service, properties, factory) \
+                            in requests:
+                        try:
+                            registrations.append(context.register_service(
+                                specs, service, properties, factory=factory))
+                        except BundleException as ex2:
+                            _logger.error("Error registering a service: %s",
+                                          ex2)
+                            registrations.append(None)
+
+                for (handler, _), registration in zip(requests,
+                                                      registrations):
+                    if registration is not None:
+                        handler._set_registration(registration)
+
     def _autorestart_store_components(self, bundle):
         # type: (Bundle) -> None
         """
@@ -559,6 +743,65 @@ class _IPopoService(object):
             self._fire_ipopo_event(constants.IPopoEvent.REGISTERED,
                                    factory_name)
 
+    def _submit_coroutine(self, coroutine):
+        """
+        Runs the coroutine returned by a component callback in the event loop
+        of iPOPO. The loop thread is started on the first call.
+
+        :param coroutine: A coroutine object
+        :return: A ``concurrent.futures.Future`` object
+        """
+        return self.__event_loop.submit(coroutine)
+
+    def _get_validation_pool(self, component_context):
+        # type: (ComponentContext) -> Optional[ThreadPool]
+        """
+        Returns the thread pool which must call the validation callback of
+        the given component, if its validation must be parallel (see
+        IPOPO_PARALLEL_VALIDATION). The pool is started on the first call.
+
+        :param component_context: The context of a component
+        :return: The validation thread pool, or None
+        """
+        flag = component_context.properties.get(
+            constants.IPOPO_PARALLEL_VALIDATION)
+        if flag is None:
+            flag = self.__parallel_validation
+
+        if not _to_flag(flag):
+            return None
+
+        with self.__validation_lock:
+            if self.__validation_pool is None:
+                nb_threads = self.__context.get_property(
+                    constants.IPOPO_VALIDATION_THREADS)
+                try:
+                    nb_threads = int(nb_threads or DEFAULT_VALIDATION_THREADS)
+                except (TypeError, ValueError):
+                    _logger.warning("Invalid number of validation threads: "
+                                    "%s", nb_threads)
+                    nb_threads = DEFAULT_VALIDATION_THREADS
+
+                self.__validation_pool = ThreadPool(
+                    max(nb_threads, 1), 0, logname="ipopo-validation")
+                self.__validation_pool.start()
+
+            return self.__validation_pool
+
+    def _stop_executors(self):
+        """
+        Waits for the coroutines of component callbacks to end and stops the
+        event loop thread, then stops the validation thread pool
+        """
+        self.__event_loop.stop(COROUTINES_STOP_TIMEOUT)
+
+        with self.__validation_lock:
+            pool = self.__validation_pool
+            self.__validation_pool = None
+
+        if pool is not None:
+            pool.stop()
+
     def _unregister_all_factories(self):
         """
         Unregisters all factories. This method should be called only after the
@@ -607,6 +850,9 @@ class _IPopoService(object):
             self._handlers.clear()
             self._handlers_refs.clear()
 
+        # Remove the listeners of the dependency handlers
+        self._dependency_tracker.clear()
+
     def framework_stopping(self):
         """
         Called by the framework when it is about to stop
@@ -692,36 +938,73 @@ class _IPopoService(object):
             # Stop working if the framework is stopping
             raise ValueError("Framework is stopping")
 
+        profiler = self._profiler
+        if profiler is None:
+            return self.__instantiate(factory_name, name, properties)
+
+        step = profiler.start(KIND_INSTANTIATE, name)
+        try:
+            return self.__instantiate(factory_name, name, properties)
+        finally:
+            profiler.stop(step)
+
+    def __create_instance(self, factory_name, name):
+        # type: (str, str) -> Tuple[FactoryContext, Any]
+        """
+        Creates a component instance with the given factory.
+        The factories lock must be held by the caller.
+
+        :param factory_name: Name of the component factory
+        :param name: Name of the instance to be created
+        :return: A (factory context, component instance) tuple
+        :raise TypeError: The given factory is unknown or failed
+        :raise ValueError: The factory is a singleton with an active instance
+        """
+        # Can raise a TypeError exception
+        factory, factory_context = \
+            self.__get_factory_with_context(factory_name)
+
+        # Check if the factory is singleton and if a component is
+        # already started
+        if factory_context.is_singleton and \
+                factory_context.is_singleton_active:
+            raise ValueError("{0} is a singleton: {1} can't be "
+                             "instantiated.".format(factory_name, name))
+
+        # Create component instance
+        try:
+            instance = factory()
+        except Exception:
+            _logger.exception("Error creating the instance '%s' "
+                              "from factory '%s'", name, factory_name)
+            raise TypeError("Factory '{0}' failed to create '{1}'"
+                            .format(factory_name, name))
+
+        # Instantiation succeeded: update singleton status
+        if factory_context.is_singleton:
+            factory_context.is_singleton_active = True
+
+        return factory_context, instance
+
+    def __instantiate(self, factory_name, name, properties):
+        # type: (str, str, dict) -> Any
+        """
+        Instantiates a component from the given factory, with the given name.
+        Parameters have been checked by instantiate().
+
+        :param factory_name: Name of the component factory
+        :param name: Name of the instance to be started
+        :param properties: Initial properties of the component instance
+        :return: The component instance
+        """
         with self.__instances_lock:
             if name in self.__instances or name in self.__waiting_handlers:
                 raise ValueError("'{0}' is an already running instance name"
                                  .format(name))
 
             with self.__factories_lock:
-                # Can raise a TypeError exception
-                factory, factory_context = \
-                    self.__get_factory_with_context(factory_name)
-
-                # Check if the factory is singleton and if a component is
-                # already started
-                if factory_context.is_singleton and \
-                        factory_context.is_singleton_active:
-                    raise ValueError("{0} is a singleton: {1} can't be "
-                                     "instantiated."
-                                     .format(factory_name, name))
-
-                # Create component instance
-                try:
-                    instance = factory()
-                except Exception:
-                    _logger.exception("Error creating the instance '%s' "
-                                      "from factory '%s'", name, factory_name)
-                    raise TypeError("Factory '{0}' failed to create '{1}'"
-                                    .format(factory_name, name))
-
-                # Instantiation succeeded: update singleton status
-                if factory_context.is_singleton:
-                    factory_context.is_singleton_active = True
+                factory_context, instance = \
+                    self.__create_instance(factory_name, name)
 
             # Normalize the given properties
             properties = self._prepare_instance_properties(
@@ -738,6 +1021,123 @@ class _IPopoService(object):
 
         return instance
 
+    def instantiate_many(self, components):
+        # type: (Iterable[Tuple[str, str, dict]]) -> List[Any]
+        """
+        Instantiates many components at once.
+
+        All the components are created before any of them is started.
+        They are then started in dependency order: the components providing
+        a service required by another one of the batch are started first, so
+        that each component binds to the services of the batch in a single
+        pass. The services provided by the components started at the same
+        step are registered at once, with a single call to
+        ``register_services()``.
+
+        :param components: An iterable of (factory name, instance name,
+                           properties) tuples. Properties can be None.
+        :return: The component instances, in the same order
+        :raise TypeError: A factory is unknown or failed to create its
+                          component: no component has been instantiated
+        :raise ValueError: Invalid factory or component name, or an instance
+                           with the given name already exists: no component
+                           has been instantiated
+        """
+        components = list(components)
+
+        profiler = self._profiler
+        if profiler is None:
+            return self.__instantiate_many(components)
+
+        step = profiler.start(KIND_INSTANTIATE, "batch of {0} components"
+                              .format(len(components)))
+        try:
+            return self.__instantiate_many(components)
+        finally:
+            profiler.stop(step)
+
+    def __instantiate_many(self, components):
+        # type: (List[Tuple[str, str, dict]]) -> List[Any]
+        """
+        Instantiates many components at once (see instantiate_many())
+
+        :param components: A list of (factory name, instance name, properties)
+                           tuples
+        :return: The component instances, in the same order
+        """
+        # Test parameters
+        names = set()
+        for factory_name, name, _ in components:
+            if not factory_name or not is_string(factory_name):
+                raise ValueError("Invalid factory name")
+
+            if not name or not is_string(name):
+                raise ValueError("Invalid component name")
+
+            if name in names:
+                raise ValueError("'{0}' is given more than once"
+                                 .format(name))
+            names.add(name)
+
+        if not self.running:
+            # Stop working if the framework is stopping
+            raise ValueError("Framework is stopping")
+
+        created = []
+        stored_instances = []
+        with self.__instances_lock:
+            for name in names:
+                if name in self.__instances \
+                        or name in self.__waiting_handlers:
+                    raise ValueError("'{0}' is an already running instance "
+                                     "name".format(name))
+
+            with self.__factories_lock:
+                try:
+                    for factory_name, name, properties in components:
+                        created.append(self.__create_instance(
+                            factory_name, name) + (name, properties))
+                except (TypeError, ValueError):
+                    # Release the singletons created so far
+                    for factory_context, _, _, _ in created:
+                        if factory_context.is_singleton:
+                            factory_context.is_singleton_active = False
+                    raise
+
+            for factory_context, instance, name, properties in created:
+                # Normalize the given properties
+                properties = self._prepare_instance_properties(
+                    properties, factory_context.properties)
+
+                # Set up the component instance context
+                component_context = ComponentContext(
+                    factory_context, name, properties)
+
+                stored_instance = self.__prepare_instance(
+                    component_context, instance)
+                if stored_instance is None:
+                    # A handler is missing, put the component in the queue
+                    self.__waiting_handlers[name] = \
+                        (component_context, instance)
+                else:
+                    stored_instances.append(stored_instance)
+
+        # Start the components, providers first. The services of each level
+        # are registered at once, before starting the next level
+        previous = getattr(self.__batch, 'handlers', None)
+        self.__batch.handlers = []
+        try:
+            for level in self.__sort_by_dependencies(stored_instances):
+                try:
+                    for stored_instance in level:
+                        self.__start_instance(stored_instance)
+                finally:
+                    self.__register_deferred()
+        finally:
+            self.__batch.handlers = previous
+
+        return [instance for _, instance, _, _ in created]
+
     def retry_erroneous(self, name, properties_update=None):
         # type: (str, dict) -> int
         """
@@ -981,6 +1381,36 @@ class _IPopoService(object):
             result.sort()
             return result
 
+    def get_instance_statistics(self, name):
+        # type: (str) -> Dict[str, Any]
+        """
+        Retrieves the life cycle statistics of the given component instance.
+        The result dictionary has the following keys:
+
+        * state: The current component state
+        * state_times: A {state → seconds} dictionary, giving the time spent
+          by the component in each state
+        * flaps: The number of invalidations of the component caused by its
+          handlers, e.g. the loss of a dependency
+        * dependencies: A dictionary associating field names with the number
+          of "bind", "update" and "unbind" calls of their handler
+        * callbacks: A dictionary associating callback events with the number
+          of "calls" to the component callback, their "total" and "max"
+          durations (in seconds)
+
+        :param name: The name of a component instance
+        :return: A dictionary of statistics
+        :raise ValueError: Invalid component name
+        """
+        if not is_string(name):
+            raise ValueError("Component name must be a string")
+
+        with self.__instances_lock:
+            if name not in self.__instances:
+                raise ValueError("Unknown component: {0}".format(name))
+
+            return self.__instances[name].get_statistics()
+
     def get_instance_details(self, name):
         # type: (str) -> Dict[str, Any]
         """
@@ -1256,6 +1686,9 @@ class _IPopoActivator(object):
         # Clean up the service
         self._service._unregister_all_factories()
 
+        # Wait for the coroutines and the validation threads
+        self._service._stop_executors()
+
         # Remove handler bundles
         for bundle in self._bundles:
             bundle.uninstall()
@@ -948,8 +948,9 @@ class Requires(object):
 
     :param field: The field where to inject the requirement
     :param specification: The specification of the service to inject
-    :param aggregate: If True, injects a list of services, else the first
-                      matching service
+    :param aggregate: If True, injects a tuple of services, in their order of
+                      arrival, else the first matching service. The tuple is
+                      replaced each time the set of services changes.
     :param optional: If True, this injection is optional: the component can be
                      valid without it
     :param spec_filter: An LDAP query to filter injected services according to
@@ -988,7 +989,7 @@ class Requires(object):
         """
         :param field: The injected field
         :param specification: The injected service specification
-        :param aggregate: If True, injects a list
+        :param aggregate: If True, injects a tuple
         :param optional: If True, this injection is optional
         :param spec_filter: An LDAP query to filter injected services upon
                             their properties
@@ -1582,6 +1583,12 @@ def Validate(method):
     If the component provides a service, the validation method is called before
     the provided service is registered to the framework.
 
+    The validation method can be a coroutine (``async def``): it is then
+    executed in the event loop of iPOPO, without blocking the thread which
+    triggered the validation. The component stays in **VALIDATING** state
+    until the coroutine ends, then goes into **VALID** state (or
+    **ERRONEOUS** if the coroutine raised an exception).
+
     :param method: The validation method
     :raise TypeError: The decorated element is not a valid function
     """
@@ -1616,6 +1623,10 @@ def Invalidate(method):
     If the component provides a service, the invalidation method is called
     after the provided service has been unregistered to the framework.
 
+    If the invalidation method is a coroutine (``async def``), it is executed
+    in the event loop of iPOPO and the component is invalidated without
+    waiting for its end. The same applies to the other callbacks.
+
     :param method: The decorated method
     :raise TypeError: The decorated element is not a function
     """
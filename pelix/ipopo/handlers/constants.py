@@ -101,6 +101,9 @@ class Handler(object):
     """
     Basic handler abstract class
     """
+    # Sub-classes can define their own slots (many instances)
+    __slots__ = ()
+
     def get_kinds(self):
         """
         Returns the kinds of this handler
@@ -212,6 +215,8 @@ class ServiceProviderHandler(Handler):
     """
     Service provider handler abstract class
     """
+    __slots__ = ()
+
     def get_service_reference(self):
         """
         Returns the reference to the service provided by this handler
@@ -225,6 +230,8 @@ class DependencyHandler(Handler):
     """
     Dependency handler abstract class
     """
+    __slots__ = ()
+
     def get_field(self):
         """
         Returns the name of the field where to inject the dependency
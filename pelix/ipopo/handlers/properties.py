@@ -99,6 +99,8 @@ class PropertiesHandler(constants.Handler):
     """
     Handles the properties
     """
+    __slots__ = ('_ipopo_instance',)
+
     def __init__(self):
         """
         Sets up the handler
@@ -110,6 +110,11 @@ class ServiceRegistrationHandler(constants.ServiceProviderHandler):
     """
     Handles the registration of a service provided by a component
     """
+    # Try to reduce memory footprint (one handler per provided service)
+    __slots__ = ('specifications', '__controller', '_ipopo_instance',
+                 '__controller_on', '__validated', '__is_factory',
+                 '_registration', '_svc_reference')
+
     def __init__(self, specifications, controller_name, is_factory):
         """
         Sets up the handler
@@ -277,26 +282,52 @@ class ServiceRegistrationHandler(constants.ServiceProviderHandler):
         # Force service unregistration
         self._unregister_service()
 
-    def _register_service(self):
+    def _prepare_registration(self):
         """
-        Registers the provided service, if possible
+        Prepares the registration of the provided service
+
+        :return: A (specifications, service, properties, factory flag) tuple,
+                 or None if the service must not be registered
         """
         if self._registration is None and self.specifications \
                 and self.__validated and self.__controller_on:
             # Use a copy of component properties
-            properties = self._ipopo_instance.context.properties.copy()
-            bundle_context = self._ipopo_instance.bundle_context
+            return (self.specifications, self._ipopo_instance.instance,
+                    self._ipopo_instance.context.properties.copy(),
+                    self.__is_factory)
 
-            # Register the service
-            self._registration = bundle_context.register_service(
-                self.specifications, self._ipopo_instance.instance, properties,
-                factory=self.__is_factory)
-            self._svc_reference = self._registration.get_reference()
+    def _set_registration(self, registration):
+        """
+        Stores the registration of the provided service and notifies the
+        component
 
-            # Notify the component
-            self._ipopo_instance.safe_callback(
-                ipopo_constants.IPOPO_CALLBACK_POST_REGISTRATION,
-                self._svc_reference)
+        :param registration: The ServiceRegistration of the provided service
+        """
+        self._registration = registration
+        self._svc_reference = registration.get_reference()
+
+        # Notify the component
+        self._ipopo_instance.safe_callback(
+            ipopo_constants.IPOPO_CALLBACK_POST_REGISTRATION,
+            self._svc_reference)
+
+    def _register_service(self):
+        """
+        Registers the provided service, if possible
+        """
+        request = self._prepare_registration()
+        if request is None:
+            return
+
+        if self._ipopo_instance.defer_registration(self):
+            # Registered with the services of a batch of components
+            return
+
+        # Register the service
+        specifications, service, properties, factory = request
+        self._set_registration(
+            self._ipopo_instance.bundle_context.register_service(
+                specifications, service, properties, factory=factory))
 
     def _unregister_service(self):
         """
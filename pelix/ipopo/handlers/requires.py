@@ -27,7 +27,7 @@ Dependency handler
 
 # Standard library
 import logging
-import threading
+from collections import OrderedDict
 
 # Pelix beans
 from pelix.constants import BundleActivator, BundleException
@@ -154,6 +154,10 @@ class _RuntimeDependency(constants.DependencyHandler):
     """
     Manages a required dependency field when a component is running
     """
+    # Try to reduce memory footprint (one handler per requirement)
+    __slots__ = ('_lock', '_ipopo_instance', '_context', '_tracker', '_field',
+                 'requirement', '_value')
+
     def __init__(self, field, requirement):
         """
         Sets up the dependency
@@ -161,8 +165,9 @@ class _RuntimeDependency(constants.DependencyHandler):
         :param field: The injected field name
         :param requirement: The Requirement describing this dependency
         """
-        # The internal state lock
-        self._lock = threading.RLock()
+        # The internal state lock: the one of the component, given during
+        # manipulation
+        self._lock = None
 
         # The iPOPO StoredInstance object (given during manipulation)
         self._ipopo_instance = None
@@ -170,6 +175,9 @@ class _RuntimeDependency(constants.DependencyHandler):
         # The bundle context
         self._context = None
 
+        # The dependency tracker forwarding service events
+        self._tracker = None
+
         # The associated field
         self._field = field
 
@@ -189,9 +197,15 @@ class _RuntimeDependency(constants.DependencyHandler):
         # Store the stored instance...
         self._ipopo_instance = stored_instance
 
-        # ... and the bundle context
+        # ... its lock
+        self._lock = stored_instance.lock
+
+        # ... the bundle context
         self._context = stored_instance.bundle_context
 
+        # ... and the dependency tracker
+        self._tracker = stored_instance.dependency_tracker
+
     def clear(self):
         """
         Cleans up the manager. The manager can't be used after this method has
@@ -200,6 +214,7 @@ class _RuntimeDependency(constants.DependencyHandler):
         self._lock = None
         self._ipopo_instance = None
         self._context = None
+        self._tracker = None
         self.requirement = None
         self._value = None
         self._field = None
@@ -299,8 +314,8 @@ class _RuntimeDependency(constants.DependencyHandler):
         """
         Starts the dependency manager
         """
-        self._context.add_service_listener(
-            self, self.requirement.filter, self.requirement.specification)
+        self._tracker.add(
+            self, self.requirement.specification, self.requirement.filter)
 
     def stop(self):
         """
@@ -308,13 +323,15 @@ class _RuntimeDependency(constants.DependencyHandler):
 
         :return: The removed bindings (list) or None
         """
-        self._context.remove_service_listener(self)
+        self._tracker.remove(self)
 
 
 class SimpleDependency(_RuntimeDependency):
     """
     Manages a simple dependency field
     """
+    __slots__ = ('reference', '_pending_ref')
+
     def __init__(self, field, requirement):
         """
         Sets up the dependency
@@ -449,17 +466,23 @@ class SimpleDependency(_RuntimeDependency):
 class AggregateDependency(_RuntimeDependency):
     """
     Manages an aggregated dependency field
+
+    The injected value is a tuple of the services, in their order of arrival.
+    It is replaced by a new tuple on each change: the component can iterate
+    over it without locking.
     """
+    __slots__ = ('services', '_future_value')
+
     def __init__(self, field, requirement):
         """
         Sets up the dependency
         """
         super(AggregateDependency, self).__init__(field, requirement)
 
-        # Reference -> Service
-        self.services = {}
+        # Reference -> Service, in order of arrival
+        self.services = OrderedDict()
 
-        # Future injected value
+        # Future injected value (tuple snapshot of the services)
         self._future_value = None
 
     def clear(self):
@@ -485,14 +508,16 @@ class AggregateDependency(_RuntimeDependency):
         """
         Retrieves the value to inject in the component
 
-        :return: The value to inject
+        :return: The value to inject: a tuple of services, or None
         """
-        with self._lock:
-            # The value field must be a copy of our list
-            if self._future_value is not None:
-                return self._future_value[:]
-            else:
-                return None
+        # The snapshot is immutable: no need to copy it
+        return self._future_value
+
+    def __update_snapshot(self):
+        """
+        Replaces the injected value by a snapshot of the current services
+        """
+        self._future_value = tuple(self.services.values()) or None
 
     def is_valid(self):
         """
@@ -512,13 +537,9 @@ class AggregateDependency(_RuntimeDependency):
                 # Get the new service
                 service = self._context.get_service(svc_ref)
 
-                if self._future_value is None:
-                    # First value
-                    self._future_value = []
-
                 # Store the information
-                self._future_value.append(service)
                 self.services[svc_ref] = service
+                self.__update_snapshot()
 
                 self._ipopo_instance.bind(self, service, svc_ref)
                 return True
@@ -539,12 +560,8 @@ class AggregateDependency(_RuntimeDependency):
                 # Not a known service reference: ignore
                 pass
             else:
-                # Clean the instance values
-                self._future_value.remove(service)
-
-                # Nullify the value if needed
-                if not self._future_value:
-                    self._future_value = None
+                # Clean the instance values (None if no service is left)
+                self.__update_snapshot()
 
                 self._ipopo_instance.unbind(self, service, svc_ref)
                 return True
@@ -25,8 +25,11 @@ RequiresBest handler implementation
     limitations under the License.
 """
 
+# Standard library
+import heapq
+
 # Pelix beans
-from pelix.constants import BundleActivator, SERVICE_RANKING
+from pelix.constants import BundleActivator, SERVICE_ID, SERVICE_RANKING
 
 # iPOPO constants
 import pelix.ipopo.constants as ipopo_constants
@@ -107,29 +110,114 @@ class _Activator(object):
 # ------------------------------------------------------------------------------
 
 
+def _ranking_key(svc_ref):
+    """
+    Computes the sort key of a service reference: services with the highest
+    ranking come first, then the oldest ones, as in the service registry
+
+    :param svc_ref: A service reference
+    :return: The sort key of the reference (lowest is best)
+    """
+    return (-int(svc_ref.get_property(SERVICE_RANKING) or 0),
+            svc_ref.get_property(SERVICE_ID))
+
+
 class BestDependency(requires.SimpleDependency):
     """
-    Manages a simple dependency field
+    Manages a simple dependency field, injecting the best matching service.
+
+    All the matching services are kept in a heap ordered by ranking, so that
+    the best replacement of a service is found without looking into the
+    service registry. Entries of the heap are invalidated lazily: the heap
+    holds (key, reference) tuples and an entry is only valid if its key is
+    the current key of the reference in ``_candidates``.
 
     TODO: Allow to use a custom service reference comparator
     """
+    __slots__ = ('_candidates', '_ranking')
+
     def __init__(self, field, requirement):
         """
         Sets up members
         """
         super(BestDependency, self).__init__(field, requirement)
 
-        # Current ranking
-        self._current_ranking = None
+        # Matching service reference -> sort key
+        self._candidates = {}
+
+        # Heap of (sort key, service reference)
+        self._ranking = []
 
     def clear(self):
         """
         Cleans up the manager. The manager can't be used after this method has
         been called
         """
-        self._current_ranking = None
+        self._candidates = None
+        self._ranking = None
         super(BestDependency, self).clear()
 
+    def __add_candidate(self, svc_ref):
+        """
+        Stores or updates the sort key of a matching service
+
+        :param svc_ref: A service reference
+        """
+        key = _ranking_key(svc_ref)
+        if self._candidates.get(svc_ref) != key:
+            self._candidates[svc_ref] = key
+            heapq.heappush(self._ranking, (key, svc_ref))
+
+            if len(self._ranking) > 2 * len(self._candidates) + 8:
+                # Too many outdated entries: rebuild the heap
+                self._ranking = [(entry_key, ref) for ref, entry_key
+                                 in self._candidates.items()]
+                heapq.heapify(self._ranking)
+
+    def __best(self):
+        """
+        Returns the best matching service, dropping outdated heap entries
+
+        :return: The best service reference, or None
+        """
+        ranking = self._ranking
+        candidates = self._candidates
+        while ranking:
+            key, svc_ref = ranking[0]
+            if candidates.get(svc_ref) == key:
+                return svc_ref
+            heapq.heappop(ranking)
+        return None
+
+    def __inject(self, svc_ref):
+        """
+        Injects the given service
+
+        :param svc_ref: A service reference
+        """
+        self.reference = svc_ref
+        self._value = self._context.get_service(svc_ref)
+        self._pending_ref = None
+
+        self._ipopo_instance.bind(self, self._value, self.reference)
+
+    def __rebind(self, svc_ref):
+        """
+        Replaces the injected service by a better one
+
+        :param svc_ref: The reference of the new service to inject
+        """
+        self._pending_ref = svc_ref
+        old_ref = self.reference
+        old_value = self._value
+
+        # Clean up like for a departure
+        self._value = None
+        self.reference = None
+
+        # Unbind (new binding will be done afterwards)
+        self._ipopo_instance.unbind(self, old_value, old_ref)
+
     def on_service_arrival(self, svc_ref):
         """
         Called when a service has been registered in the framework
@@ -137,29 +225,16 @@ class BestDependency(requires.SimpleDependency):
         :param svc_ref: A service reference
         """
         with self._lock:
-            new_ranking = svc_ref.get_property(SERVICE_RANKING)
-            if self._current_ranking is not None:
-                if new_ranking > self._current_ranking:
-                    # New service with better ranking: use it
-                    self._pending_ref = svc_ref
-                    old_ref = self.reference
-                    old_value = self._value
+            self.__add_candidate(svc_ref)
 
-                    # Clean up like for a departure
-                    self._current_ranking = None
-                    self._value = None
-                    self.reference = None
-
-                    # Unbind (new binding will be done afterwards)
-                    self._ipopo_instance.unbind(self, old_value, old_ref)
+            if self.reference is not None:
+                if self._candidates[svc_ref] < \
+                        self._candidates[self.reference]:
+                    # New service with better ranking: use it
+                    self.__rebind(svc_ref)
             else:
-                # No ranking yet: inject the service
-                self.reference = svc_ref
-                self._value = self._context.get_service(svc_ref)
-                self._current_ranking = new_ranking
-                self._pending_ref = None
-
-                self._ipopo_instance.bind(self, self._value, self.reference)
+                # Nothing injected yet: inject the best service
+                self.__inject(self.__best())
 
     def on_service_departure(self, svc_ref):
         """
@@ -168,20 +243,20 @@ class BestDependency(requires.SimpleDependency):
         :param svc_ref: A service reference
         """
         with self._lock:
+            # Outdated heap entries are ignored by __best()
+            self._candidates.pop(svc_ref, None)
+
             if svc_ref is self.reference:
                 # Injected service going away...
                 service = self._value
 
                 # Clear the instance values
-                self._current_ranking = None
                 self._value = None
                 self.reference = None
 
                 if self.requirement.immediate_rebind:
                     # Look for a replacement
-                    self._pending_ref = self._context.get_service_reference(
-                        self.requirement.specification,
-                        self.requirement.filter)
+                    self._pending_ref = self.__best()
                 else:
                     self._pending_ref = None
 
@@ -195,19 +270,43 @@ class BestDependency(requires.SimpleDependency):
         :param old_properties: Previous properties values
         """
         with self._lock:
-            if self.reference is None:
+            if svc_ref not in self._candidates or self.reference is None:
                 # A previously registered service now matches our filter
                 return self.on_service_arrival(svc_ref)
+
+            # Check if the ranking changed the service to inject
+            self.__add_candidate(svc_ref)
+            best_ref = self.__best()
+            if best_ref is self.reference:
+                # Still the best service: notify the property modification
+                if svc_ref is self.reference:
+                    # Call update only if necessary
+                    self._ipopo_instance.update(self, self._value,
+                                                svc_ref, old_properties)
             else:
-                # Check if the ranking changed the service to inject
-                best_ref = self._context.get_service_reference(
-                    self.requirement.specification, self.requirement.filter)
-                if best_ref is self.reference:
-                    # Still the best service: notify the property modification
-                    if svc_ref is self.reference:
-                        # Call update only if necessary
-                        self._ipopo_instance.update(self, self._value,
-                                                    svc_ref, old_properties)
-                else:
-                    # A new service is now the best: start a departure loop
-                    self.on_service_departure(self.reference)
+                # A new service is now the best: replace the injected one
+                self.__rebind(best_ref)
+
+    def start(self):
+        """
+        Starts the dependency manager and looks for the matching services.
+        The ranking is then kept up to date with service events.
+        """
+        super(BestDependency, self).start()
+        with self._lock:
+            for svc_ref in self._context.get_all_service_references(
+                    self.requirement.specification,
+                    self.requirement.filter) or ():
+                self.__add_candidate(svc_ref)
+
+    def try_binding(self):
+        """
+        Injects the best matching service, if needed, without looking into the
+        service registry
+        """
+        with self._lock:
+            if self.reference is None:
+                svc_ref = self.__best()
+                if svc_ref is not None:
+                    # Found a service
+                    self.__inject(svc_ref)
@@ -28,7 +28,6 @@ RequiresMap handler implementation
 # Standard library
 import copy
 import logging
-import threading
 
 # Pelix beans
 from pelix.constants import BundleActivator, BundleException
@@ -162,6 +161,11 @@ class _RuntimeDependency(constants.DependencyHandler):
     """
     Manages a required dependency field when a component is running
     """
+    # Try to reduce memory footprint (one handler per requirement)
+    __slots__ = ('_lock', '_ipopo_instance', '_context', '_tracker', '_field',
+                 'requirement', '_key', '_allow_none', 'services',
+                 '_future_value')
+
     def __init__(self, field, requirement, key, allow_none):
         """
         Sets up the dependency
@@ -171,8 +175,9 @@ class _RuntimeDependency(constants.DependencyHandler):
         :param key: The property used as key in the dictionary
         :param allow_none: Allow None property as key
         """
-        # The internal state lock
-        self._lock = threading.RLock()
+        # The internal state lock: the one of the component, given during
+        # manipulation
+        self._lock = None
 
         # The iPOPO StoredInstance object (given during manipulation)
         self._ipopo_instance = None
@@ -180,6 +185,9 @@ class _RuntimeDependency(constants.DependencyHandler):
         # The bundle context
         self._context = None
 
+        # The dependency tracker forwarding service events
+        self._tracker = None
+
         # The associated field
         self._field = field
 
@@ -208,9 +216,15 @@ class _RuntimeDependency(constants.DependencyHandler):
         # Store the stored instance...
         self._ipopo_instance = stored_instance
 
-        # ... and the bundle context
+        # ... its lock
+        self._lock = stored_instance.lock
+
+        # ... the bundle context
         self._context = stored_instance.bundle_context
 
+        # ... and the dependency tracker
+        self._tracker = stored_instance.dependency_tracker
+
         # Set the default value for the field: an empty dictionary
         setattr(component_instance, self._field, {})
 
@@ -226,6 +240,7 @@ class _RuntimeDependency(constants.DependencyHandler):
         self._lock = None
         self._ipopo_instance = None
         self._context = None
+        self._tracker = None
         self.requirement = None
         self._key = None
         self._allow_none = None
@@ -330,8 +345,8 @@ class _RuntimeDependency(constants.DependencyHandler):
         """
         Starts the dependency manager
         """
-        self._context.add_service_listener(
-            self, self.requirement.filter, self.requirement.specification)
+        self._tracker.add(
+            self, self.requirement.specification, self.requirement.filter)
 
     def stop(self):
         """
@@ -339,7 +354,7 @@ class _RuntimeDependency(constants.DependencyHandler):
 
         :return: The removed bindings (list) or None
         """
-        self._context.remove_service_listener(self)
+        self._tracker.remove(self)
         if self.services:
             return [(service, reference)
                     for reference, service in self.services.items()]
@@ -392,6 +407,8 @@ class SimpleDependency(_RuntimeDependency):
     """
     Manages a simple dependency field: one service per dictionary key
     """
+    __slots__ = ()
+
     def on_service_arrival(self, svc_ref):
         """
         Called when a service has been registered in the framework
@@ -478,6 +495,8 @@ class AggregateDependency(_RuntimeDependency):
     Manages an aggregated dependency field: multiple services per dictionary
     key
     """
+    __slots__ = ()
+
     def __store_service(self, key, service):
         """
         Stores the given service in the dictionary
@@ -125,6 +125,9 @@ class _VariableFilterMixIn:
     """
     Dependency handler MixIn to support variable filters
     """
+    # Slots are defined by the handler classes
+    __slots__ = ()
+
     def __init__(self, component_context, requirement):
         """
         Set up the MixIn
@@ -226,7 +229,7 @@ class _VariableFilterMixIn:
             for svc_ref in self.get_bindings():
                 # Check if the current reference matches the filter
                 if not self.requirement.filter.matches(
-                        svc_ref.get_properties()):
+                        svc_ref.get_properties_view()):
                     # Not the case: emulate a service departure
                     # The instance life cycle will be updated as well
                     self.on_service_departure(svc_ref)
@@ -236,6 +239,9 @@ class SimpleDependency(_VariableFilterMixIn, requires.SimpleDependency):
     """
     Manages a single dependency field
     """
+    __slots__ = ('_component_context', '_original_filter', 'valid_filter',
+                 '_keys')
+
     def __init__(self, component_context, field, requirement):
         """
         Sets up members
@@ -264,6 +270,9 @@ class AggregateDependency(_VariableFilterMixIn, requires.AggregateDependency):
     """
     Manages a single dependency field
     """
+    __slots__ = ('_component_context', '_original_filter', 'valid_filter',
+                 '_keys')
+
     def __init__(self, component_context, field, requirement):
         """
         Sets up members
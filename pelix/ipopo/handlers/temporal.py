@@ -235,6 +235,8 @@ class TemporalDependency(requires.SimpleDependency):
     """
     Manages a temporal dependency field
     """
+    __slots__ = ('__timeout', '__timer', '__timer_args', '__still_valid')
+
     def __init__(self, field, requirement, timeout):
         """
         Sets up the dependency
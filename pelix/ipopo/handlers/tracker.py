@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+# -- Content-Encoding: UTF-8 --
+"""
+Service listener shared by the dependency handlers of all components
+
+:author: Thomas Calmant
+:copyright: Copyright 2017, Thomas Calmant
+:license: Apache License 2.0
+:version: 0.6.6
+
+..
+
+    Copyright 2017 Thomas Calmant
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+# Standard library
+import logging
+import threading
+
+# Pelix
+import pelix.ldapfilter as ldapfilter
+
+# ------------------------------------------------------------------------------
+
+# Module version
+__version_info__ = (0, 6, 6)
+__version__ = ".".join(str(x) for x in __version_info__)
+
+# Documentation strings format
+__docformat__ = "restructuredtext en"
+
+# ------------------------------------------------------------------------------
+
+_logger = logging.getLogger(__name__)
+
+# ------------------------------------------------------------------------------
+
+
+class _TrackerGroup(object):
+    """
+    Service listener forwarding the events to the dependency handlers with the
+    same specification and filter
+    """
+    __slots__ = ('key', 'ldap_filter', 'handlers')
+
+    def __init__(self, key, ldap_filter):
+        """
+        :param key: Key of the group in the tracker
+        :param ldap_filter: Filter shared by the handlers of the group
+        """
+        self.key = key
+        self.ldap_filter = ldap_filter
+
+        # Handlers are stored in a tuple, replaced at each modification:
+        # events are forwarded to a consistent snapshot without locking
+        self.handlers = ()
+
+    def service_changed(self, event):
+        """
+        Called by the framework when a service event occurs
+
+        :param event: A ServiceEvent
+        """
+        for handler in self.handlers:
+            try:
+                handler.service_changed(event)
+            except:
+                # Don't stop the delivery to the other handlers
+                _logger.exception("Error calling a dependency handler: %s",
+                                  handler)
+
+
+class DependencyTracker(object):
+    """
+    Groups the dependency handlers by specification and filter: a single
+    service listener is registered for each group, so each filter is
+    evaluated once per service event whatever the number of components
+    depending on it.
+    """
+    def __init__(self, context):
+        """
+        :param context: Bundle context used to register the service listeners
+        """
+        self.__context = context
+        self.__lock = threading.Lock()
+
+        # (specification, filter string) -> _TrackerGroup
+        self.__groups = {}
+
+        # Dependency handler -> _TrackerGroup
+        self.__handlers = {}
+
+    def add(self, handler, specification, ldap_filter=None):
+        """
+        Starts forwarding to the given handler the service events matching
+        the given specification and filter
+
+        :param handler: A dependency handler, with a ``service_changed()``
+                        method
+        :param specification: The specification of the required services
+        :param ldap_filter: The filter on the required services properties
+        :raise ValueError: Handler already known or invalid filter
+        :raise BundleException: Error registering the service listener
+        """
+        ldap_filter = ldapfilter.get_ldap_filter(ldap_filter)
+        key = (specification,
+               str(ldap_filter) if ldap_filter is not None else None)
+
+        with self.__lock:
+            if handler in self.__handlers:
+                raise ValueError("Already tracked handler: {0}"
+                                 .format(handler))
+
+            group = self.__groups.get(key)
+            if group is None or group.ldap_filter != ldap_filter:
+                if group is not None:
+                    # Same string for different filters: do not share it
+                    key = (specification, handler)
+
+                group = _TrackerGroup(key, ldap_filter)
+                self.__context.add_service_listener(
+                    group, ldap_filter, specification)
+                self.__groups[key] = group
+
+            group.handlers += (handler,)
+            self.__handlers[handler] = group
+
+    def remove(self, handler):
+        """
+        Stops forwarding the service events to the given handler
+
+        :param handler: A dependency handler
+        :return: True if the handler was known
+        """
+        with self.__lock:
+            try:
+                group = self.__handlers.pop(handler)
+            except KeyError:
+                return False
+
+            group.handlers = tuple(
+                item for item in group.handlers if item is not handler)
+            if not group.handlers:
+                # Last handler of the group
+                del self.__groups[group.key]
+                self.__context.remove_service_listener(group)
+
+            return True
+
+    def clear(self):
+        """
+        Unregisters all the service listeners of the tracker
+        """
+        with self.__lock:
+            for group in self.__groups.values():
+                self.__context.remove_service_listener(group)
+
+            self.__groups.clear()
+            self.__handlers.clear()
+
+    def get_listeners_count(self):
+        """
+        Returns the number of service listeners registered by the tracker
+
+        :return: The number of distinct (specification, filter) pairs
+        """
+        with self.__lock:
+            return len(self.__groups)
@@ -29,6 +29,7 @@ Instance manager class definition
 import logging
 import threading
 import traceback
+import weakref
 
 # Standard typing module should be optional
 try:
@@ -39,13 +40,16 @@ except ImportError:
 # Pelix
 from pelix.constants import FrameworkException
 from pelix.framework import ServiceEvent, ServiceReference
+from pelix.internals.asyncloop import is_coroutine
+from pelix.internals.profiler import KIND_VALIDATE
 
 # iPOPO constants
 import pelix.ipopo.constants as constants
 import pelix.ipopo.handlers.constants as handlers_const
+import pelix.ipopo.statistics as statistics
 
 # iPOPO beans
-from pelix.ipopo.contexts import ComponentContext
+from pelix.ipopo.contexts import ComponentContext, FactoryContext
 
 # ------------------------------------------------------------------------------
 
@@ -59,15 +63,122 @@ __docformat__ = "restructuredtext en"
 # ------------------------------------------------------------------------------
 
 
+HANDLER_HOOKS = ('check_event', 'is_valid', 'on_controller_change',
+                 'on_property_change', 'on_hidden_property_change',
+                 'start', 'stop', 'clear', 'pre_validate', 'post_validate',
+                 'pre_invalidate', 'post_invalidate')
+"""
+Methods of the handlers called by the instance manager. A handler which keeps
+the default implementation of one of them is not called for this hook.
+"""
+
+# Handler class -> names of the hooks it implements
+_IMPLEMENTED_HOOKS = \
+    weakref.WeakKeyDictionary()  # type: Dict[type, Tuple[str, ...]]
+
+
+def _overrides(handler_class, method_name):
+    # type: (type, str) -> bool
+    """
+    Tests if the given handler class implements the given hook, i.e. if it
+    doesn't keep the default (no-op) implementation of ``Handler``
+
+    :param handler_class: A handler class
+    :param method_name: Name of a hook method
+    :return: True if the hook must be called for this kind of handler
+    """
+    method = getattr(handler_class, method_name, None)
+    if method is None:
+        return False
+
+    default = getattr(handlers_const.Handler, method_name, None)
+    if default is None:
+        # Not a method of the base class
+        return True
+
+    # Unbound methods (Python 2)
+    return getattr(method, '__func__', method) \
+        is not getattr(default, '__func__', default)
+
+
+def get_implemented_hooks(handler_class):
+    # type: (type) -> Tuple[str, ...]
+    """
+    Returns the names of the hooks implemented by the given handler class.
+    The result is computed once per class.
+
+    :param handler_class: A handler class
+    :return: A tuple of names from HANDLER_HOOKS
+    """
+    try:
+        return _IMPLEMENTED_HOOKS[handler_class]
+    except KeyError:
+        hooks = tuple(name for name in HANDLER_HOOKS
+                      if _overrides(handler_class, name))
+        _IMPLEMENTED_HOOKS[handler_class] = hooks
+        return hooks
+
+
+def _handler_sort_key(handler):
+    # type: (Any) -> Tuple[str, str, bool]
+    """
+    Sort key giving the same order to the handlers of the components of a
+    factory, whatever the order in which they have been created
+
+    :param handler: A handler
+    :return: A sort key
+    """
+    handler_class = type(handler)
+    kinds = handler.get_kinds() or ()
+    return (handler_class.__module__, handler_class.__name__,
+            handlers_const.KIND_DEPENDENCY in kinds)
+
+
+def _get_dispatch_table(factory_context, composition):
+    # type: (FactoryContext, Tuple[Tuple[type, bool], ...]) -> Dict[str, tuple]
+    """
+    Returns the dispatch table for the given composition of handlers. The
+    table is stored in the factory context and shared by the components of
+    the factory with the same composition.
+
+    The table associates the name of a hook to the (index of the handler,
+    method) tuples to call. The is_valid() hook of dependency handlers is
+    not in the table, as their validity is tracked by the instance manager.
+
+    :param factory_context: The context of the factory of the component
+    :param composition: A tuple of (handler class, is dependency flag) tuples,
+                        in the order of the handlers of the component
+    :return: The dispatch table
+    """
+    tables = factory_context.get_dispatch_tables()
+    try:
+        return tables[composition]
+    except KeyError:
+        table = {}  # type: Dict[str, List[Tuple[int, Any]]]
+        for idx, (handler_class, is_dependency) in enumerate(composition):
+            for name in get_implemented_hooks(handler_class):
+                if name != 'is_valid' or not is_dependency:
+                    table.setdefault(name, []).append(
+                        (idx, getattr(handler_class, name)))
+
+        table = dict((name, tuple(entries)) for name, entries in table.items())
+        tables[composition] = table
+        return table
+
+# ------------------------------------------------------------------------------
+
+
 class StoredInstance(object):
     """
     Represents a component instance
     """
     # Try to reduce memory footprint (stored instances)
     __slots__ = ('bundle_context', 'context', 'factory_name', 'instance',
-                 'name', 'state', '_controllers_state', '_handlers',
-                 '_ipopo_service', '_lock', '_logger', 'error_trace',
-                 '__all_handlers')
+                 'name', '__state', '_controllers_state', '_handlers',
+                 '_ipopo_service', '_lock', '__logger', 'error_trace',
+                 '__all_handlers', 'dependency_tracker',
+                 '__invalid_dependencies', '__hooks', '__validation',
+                 '__validation_start', '__statistics')
 
     INVALID = 0
     """ This component has been invalidated """
@@ -95,9 +206,8 @@ class StoredInstance(object):
         :param instance: The component instance
         :param handlers: The list of handlers associated to this component
         """
-        # The logger
-        self._logger = logging.getLogger(
-            '-'.join(("InstanceManager", context.name)))
+        # The logger, created on first use (see _logger)
+        self.__logger = None  # type: logging.Logger
 
         # The lock
         self._lock = threading.RLock()
@@ -105,6 +215,9 @@ class StoredInstance(object):
         # The iPOPO service
         self._ipopo_service = ipopo_service
 
+        # Service listeners shared by the dependency handlers
+        self.dependency_tracker = ipopo_service._dependency_tracker
+
         # Component context
         self.context = context
 
@@ -118,25 +231,53 @@ class StoredInstance(object):
         self.instance = instance
 
         # Set the instance state
-        self.state = StoredInstance.INVALID
+        self.__state = StoredInstance.INVALID
+
+        # Life cycle statistics
+        self.__statistics = statistics.InstanceStatistics(self.__state)
 
         # Stack track of validation error
         self.error_trace = None  # type: str
 
+        # Future of the running validation coroutine, if any
+        self.__validation = None
+
+        # Time of the call to the validation callback returning a coroutine
+        self.__validation_start = None
+
         # Store the bundle context
         self.bundle_context = self.context.get_bundle_context()
 
         # The controllers state dictionary
         self._controllers_state = {}  # type: Dict[str, bool]
 
-        # Handlers: kind -> [handlers]
-        self._handlers = {}  # type: Dict[str, Any]
-        self.__all_handlers = set(handlers)
+        # Handlers, in the same order for all the components of a factory
+        handlers = sorted(handlers, key=_handler_sort_key)
+        self.__all_handlers = tuple(handlers)
+
+        # Handlers: kind -> (handlers)
+        by_kind = {}  # type: Dict[str, List[Any]]
         for handler in handlers:
             kinds = handler.get_kinds()
             if kinds:
                 for kind in kinds:
-                    self._handlers.setdefault(kind, []).append(handler)
+                    by_kind.setdefault(kind, []).append(handler)
+        self._handlers = dict((kind, tuple(kind_handlers))
+                              for kind, kind_handlers in by_kind.items())
+
+        # Dependency handlers report their changes through bind(), update()
+        # and unbind(): their validity is tracked incrementally. They are
+        # considered invalid until the component has been started.
+        # (a list is smaller than a set and holds a few handlers at most)
+        self.__invalid_dependencies = list(
+            self._handlers.get(handlers_const.KIND_DEPENDENCY, ()))
+
+        # Dispatch table: hook name -> ((handler index, method), ...)
+        # Handlers keeping the default implementation of a hook are skipped
+        self.__hooks = _get_dispatch_table(
+            self.context.factory_context,
+            tuple((type(handler), handler in self.__invalid_dependencies)
+                  for handler in handlers))
 
     def __repr__(self):
         """
@@ -144,6 +285,44 @@ class StoredInstance(object):
         """
         return self.__str__()
 
+    @property
+    def _logger(self):
+        # type: () -> logging.Logger
+        """
+        The logger of this instance manager, created on first use
+        """
+        if self.__logger is None:
+            self.__logger = logging.getLogger(
+                '-'.join(("InstanceManager", self.name)))
+        return self.__logger
+
+    @property
+    def state(self):
+        # type: () -> int
+        """
+        The current state of the component
+        """
+        return self.__state
+
+    @state.setter
+    def state(self, state):
+        # type: (int) -> None
+        """
+        Changes the state of the component, recording the time spent in the
+        previous one
+        """
+        self.__statistics.state_changed(state)
+        self.__state = state
+
+    @property
+    def lock(self):
+        # type: () -> threading.RLock
+        """
+        The lock protecting the state of the component, shared with its
+        dependency handlers
+        """
+        return self._lock
+
     def __str__(self):
         """
         String representation
@@ -151,6 +330,32 @@ class StoredInstance(object):
         return "StoredInstance(Name={0}, State={1})" \
             .format(self.name, self.state)
 
+    def defer_registration(self, handler):
+        # type: (Any) -> bool
+        """
+        Asks iPOPO to defer the registration of the service of the given
+        provides handler, when the component is started with a batch of
+        components (see _IPopoService.instantiate_many())
+
+        :param handler: A ServiceRegistrationHandler of this component
+        :return: True if the registration has been deferred: the handler will
+                 be given its registration later
+        """
+        ipopo_service = self._ipopo_service
+        return ipopo_service is not None \
+            and ipopo_service._defer_registration(handler)
+
+    def get_statistics(self):
+        # type: () -> Dict[str, Any]
+        """
+        Returns a snapshot of the life cycle statistics of the component (see
+        pelix.ipopo.statistics.InstanceStatistics.to_dict())
+
+        :return: A dictionary
+        """
+        with self._lock:
+            return self.__statistics.to_dict()
+
     def check_event(self, event):
         # type: (ServiceEvent) -> bool
         """
@@ -175,8 +380,11 @@ class StoredInstance(object):
         component life cycle.
         """
         with self._lock:
+            self.__statistics.dependency_event(dependency.get_field(),
+                                               statistics.BIND)
             self.__set_binding(dependency, svc, svc_ref)
-            self.check_lifecycle()
+            self.__update_validity(dependency)
+            self.__check_lifecycle()
 
     def update(self, dependency, svc, svc_ref, old_properties,
                new_value=False):
@@ -192,9 +400,12 @@ class StoredInstance(object):
         :param new_value: If True, inject the new value of the handler
         """
         with self._lock:
+            self.__statistics.dependency_event(dependency.get_field(),
+                                               statistics.UPDATE)
             self.__update_binding(dependency, svc, svc_ref, old_properties,
                                   new_value)
-            self.check_lifecycle()
+            self.__update_validity(dependency)
+            self.__check_lifecycle()
 
     def unbind(self, dependency, svc, svc_ref):
         # type: (Any, Any, ServiceReference) -> None
@@ -203,15 +414,20 @@ class StoredInstance(object):
         update the component life cycle.
         """
         with self._lock:
+            self.__statistics.dependency_event(dependency.get_field(),
+                                               statistics.UNBIND)
+
             # Invalidate first (if needed)
-            self.check_lifecycle()
+            self.__update_validity(dependency)
+            self.__check_lifecycle()
 
             # Call unbind() and remove the injection
             self.__unset_binding(dependency, svc, svc_ref)
 
-            # Try a new configuration
-            if self.update_bindings():
-                self.check_lifecycle()
+            # Try a new configuration: only this dependency has changed
+            self.__safe_handler_callback(dependency, 'try_binding')
+            if self.__update_validity(dependency):
+                self.__check_lifecycle()
 
     def get_controller_state(self, name):
         # type: (str) -> bool
@@ -249,6 +465,9 @@ class StoredInstance(object):
             self.__safe_handlers_callback('on_property_change', name,
                                           old_value, new_value)
 
+            # Filters of the dependencies might have changed
+            self.__update_all_validities()
+
     def update_hidden_property(self, name, old_value, new_value):
         # type: (str, Any, Any) -> None
         """
@@ -272,17 +491,47 @@ class StoredInstance(object):
         """
         with self._lock:
             if kind is not None:
-                try:
-                    return self._handlers[kind][:]
-                except KeyError:
-                    return []
+                return list(self._handlers.get(kind, ()))
+
+            return set(self.__all_handlers)
 
-            return self.__all_handlers.copy()
+    def dependency_validity_changed(self, dependency):
+        # type: (Any) -> None
+        """
+        Called by a dependency handler when its validity changed outside of
+        the calls to ``bind()``, ``update()`` and ``unbind()``: updates the
+        tracked validity of the handler and the component life cycle.
+
+        :param dependency: The dependency handler
+        """
+        with self._lock:
+            if self.state == StoredInstance.KILLED:
+                # Late call
+                return
+
+            self.__update_validity(dependency)
+            self.__check_lifecycle()
 
     def check_lifecycle(self):
         """
         Tests if the state of the component must be updated, based on its own
-        state and on the state of its dependencies
+        state and on the state of its dependencies.
+
+        The validity of all dependency handlers is checked again, to support
+        handlers which change their validity by themselves before calling
+        this method. Handlers should prefer ``dependency_validity_changed()``.
+        """
+        with self._lock:
+            if self.state == StoredInstance.KILLED:
+                return
+
+            self.__update_all_validities()
+            self.__check_lifecycle()
+
+    def __check_lifecycle(self):
+        """
+        Tests if the state of the component must be updated, based on its own
+        state and on the tracked validity of its dependencies
         """
         with self._lock:
             # Validation flags
@@ -291,11 +540,11 @@ class StoredInstance(object):
                                               StoredInstance.VALID)
 
             # Test the validity of all handlers
-            handlers_valid = self.__safe_handlers_callback(
-                'is_valid', break_on_false=True)
+            handlers_valid = self.__are_handlers_valid()
 
             if was_valid and not handlers_valid:
                 # A dependency is missing
+                self.__statistics.flapped()
                 self.invalidate(True)
             elif can_validate and handlers_valid \
                     and self._ipopo_service.running:
@@ -316,8 +565,7 @@ class StoredInstance(object):
                 self.__safe_handler_callback(handler, 'try_binding')
 
                 # Update the validity flag
-                all_valid &= self.__safe_handler_callback(
-                    handler, 'is_valid', only_boolean=True, none_as_true=True)
+                all_valid &= self.__update_validity(handler)
             return all_valid
 
     def start(self):
@@ -326,6 +574,54 @@ class StoredInstance(object):
         """
         with self._lock:
             self.__safe_handlers_callback('start')
+            self.__update_all_validities()
+
+    def __update_validity(self, dependency):
+        # type: (Any) -> bool
+        """
+        Updates the validity of a dependency handler
+
+        :param dependency: A dependency handler
+        :return: True if the handler is valid
+        """
+        try:
+            result = dependency.is_valid()
+        except Exception as ex:
+            # Errors are ignored, as in __safe_handler_callback()
+            self._logger.exception("Error calling handler '%s': %s",
+                                   dependency, ex)
+            result = None
+
+        valid = result is None or bool(result)
+
+        invalid = self.__invalid_dependencies
+        if valid:
+            if dependency in invalid:
+                invalid.remove(dependency)
+        elif dependency not in invalid:
+            invalid.append(dependency)
+        return valid
+
+    def __update_all_validities(self):
+        """
+        Updates the validity of all dependency handlers
+        """
+        for handler in self.get_handlers(handlers_const.KIND_DEPENDENCY):
+            self.__update_validity(handler)
+
+    def __are_handlers_valid(self):
+        # type: () -> bool
+        """
+        Tests if all handlers are valid: dependency handlers are checked
+        using the tracked validity, other handlers are polled
+
+        :return: True if all handlers are valid
+        """
+        if self.state == StoredInstance.KILLED \
+                or self.__invalid_dependencies:
+            return False
+
+        return self.__safe_handlers_callback('is_valid', break_on_false=True)
 
     def retry_erroneous(self, properties_update):
         # type: (dict) -> int
@@ -349,7 +645,8 @@ class StoredInstance(object):
             self.error_trace = None
 
             # Retry
-            self.check_lifecycle()
+            self.__update_all_validities()
+            self.__check_lifecycle()
 
             # Check if the component is still erroneous
             return self.state
@@ -403,6 +700,13 @@ class StoredInstance(object):
             if self.state == StoredInstance.KILLED:
                 return False
 
+            validation, self.__validation = self.__validation, None
+            if hasattr(validation, 'cancel'):
+                # Abort the validation coroutine (pooled validations can't be
+                # cancelled: the invalidation callback will be called once the
+                # validation callback has returned)
+                validation.cancel()
+
             try:
                 self.invalidate(True)
             except:
@@ -414,8 +718,15 @@ class StoredInstance(object):
             assert not self._ipopo_service.is_registered_instance(self.name)
 
             # Stop all handlers (can tell to unset a binding)
-            for handler in self.get_handlers():
-                results = self.__safe_handler_callback(handler, 'stop')
+            for idx, method in self.__hooks.get('stop', ()):
+                handler = self.__all_handlers[idx]
+                try:
+                    results = method(handler)
+                except Exception as ex:
+                    self._logger.exception("Error calling handler '%s': %s",
+                                           handler, ex)
+                    continue
+
                 if results:
                     try:
                         for binding in results:
@@ -436,15 +747,39 @@ class StoredInstance(object):
                                                   self.factory_name, self.name)
 
             # Clean up members
-            self._handlers.clear()
-            self.__all_handlers.clear()
+            del self.__invalid_dependencies[:]
             self._handlers = None
             self.__all_handlers = None
+            self.__hooks = {}
             self.context = None
             self.instance = None
             self._ipopo_service = None
             return True
 
+    def __validate_callback(self):
+        # type: () -> bool
+        """
+        Calls the validation callback of the component, timing it if the boot
+        profiler of the framework is active
+
+        :return: False if the callback raised an exception, the coroutine
+                 returned by the callback, else True
+        """
+        profiler = None
+        if self._ipopo_service is not None:
+            profiler = self._ipopo_service._profiler
+
+        if profiler is None:
+            return self.safe_callback(constants.IPOPO_CALLBACK_VALIDATE,
+                                      self.bundle_context)
+
+        step = profiler.start(KIND_VALIDATE, self.name)
+        try:
+            return self.safe_callback(constants.IPOPO_CALLBACK_VALIDATE,
+                                      self.bundle_context)
+        finally:
+            profiler.stop(step)
+
     def validate(self, safe_callback=True):
         # type: (bool) -> bool
         """
@@ -473,30 +808,220 @@ class StoredInstance(object):
             if safe_callback:
                 # Safe call back needed and not yet passed
                 self.state = StoredInstance.VALIDATING
-                if not self.safe_callback(constants.IPOPO_CALLBACK_VALIDATE,
-                                          self.bundle_context):
-                    # Stop there if the callback failed
-                    self.state = StoredInstance.VALID
-                    self.invalidate(True)
-
-                    # Consider the component has erroneous
-                    self.state = StoredInstance.ERRONEOUS
+
+                pool = self._ipopo_service._get_validation_pool(self.context)
+                if pool is not None:
+                    # Parallel validation: stay in VALIDATING state until the
+                    # callback has been called by the pool
+                    self.__validation = pool.enqueue(self.__pooled_validation)
                     return False
 
-            # All good
+                result = self.__validate_callback()
+                if is_coroutine(result):
+                    # Asynchronous validation: stay in VALIDATING state until
+                    # the end of the coroutine
+                    self.__submit_validation_coroutine(result)
+                    return False
+
+                return self.__end_validation(result)
+
+            return self.__end_validation(True)
+
+    def __end_validation(self, succeeded):
+        # type: (bool) -> bool
+        """
+        Ends the validation of the component, after the call to its
+        validation callback
+
+        :param succeeded: Result of the validation callback
+        :return: True if the component has been validated, else False
+        """
+        if not succeeded:
+            # Stop there if the callback failed
             self.state = StoredInstance.VALID
+            self.invalidate(True)
 
-            # Call the handlers
-            self.__safe_handlers_callback('post_validate')
+            # Consider the component has erroneous
+            self.state = StoredInstance.ERRONEOUS
+            return False
 
-            # We may have caused a framework error, so check if iPOPO is active
-            if self._ipopo_service is not None:
-                # Trigger the iPOPO event (after the service _registration)
-                self._ipopo_service._fire_ipopo_event(
-                    constants.IPopoEvent.VALIDATED,
-                    self.factory_name, self.name)
+        # All good
+        self.state = StoredInstance.VALID
+
+        # Call the handlers
+        self.__safe_handlers_callback('post_validate')
+
+        # We may have caused a framework error, so check if iPOPO is active
+        if self._ipopo_service is not None:
+            # Trigger the iPOPO event (after the service _registration)
+            self._ipopo_service._fire_ipopo_event(
+                constants.IPopoEvent.VALIDATED,
+                self.factory_name, self.name)
         return True
 
+    def __submit_validation_coroutine(self, coroutine):
+        """
+        Schedules the coroutine returned by the validation callback in the
+        event loop of iPOPO. The validation ends with the coroutine.
+
+        :param coroutine: The coroutine returned by the validation callback
+        """
+        self.__validation = self._ipopo_service._submit_coroutine(coroutine)
+        self.__validation.add_done_callback(self.__validation_done)
+
+    def __pooled_validation(self):
+        """
+        Calls the validation callback of the component from a thread of the
+        validation pool of iPOPO.
+
+        The callback is called without holding the instance lock, as a
+        coroutine callback would be: the dependencies which changed in the
+        meantime are handled once the validation has ended.
+        """
+        with self._lock:
+            task = self.__validation
+            if task is None or self.state != StoredInstance.VALIDATING:
+                # The component has been killed in the meantime
+                return
+
+            # Kept to clean up if the component is killed during the callback
+            killed_context = (self._ipopo_service, self.instance,
+                              self.context.get_callback(
+                                  constants.IPOPO_CALLBACK_INVALIDATE))
+
+        result = self.__validate_callback()
+
+        with self._lock:
+            if task is not self.__validation:
+                # The component has been killed during the callback
+                if is_coroutine(result):
+                    # Never started
+                    result.close()
+                elif result is not None:
+                    # The callback has been called: invalidate the component,
+                    # as a kill would have done after the validation
+                    self.__invalidate_killed(result, *killed_context)
+                return
+
+            if is_coroutine(result):
+                self.__submit_validation_coroutine(result)
+                return
+
+            self.__validation = None
+            if self.__end_validation(result):
+                # Dependencies might have gone during the validation
+                self.__check_lifecycle()
+
+    def __invalidate_killed(self, validated, ipopo_service, instance,
+                            callback):
+        """
+        Calls the invalidation callback of a component which has been killed
+        while its validation callback was running in the validation pool
+
+        :param validated: Result of the validation callback
+        :param ipopo_service: The iPOPO service which killed the component
+        :param instance: The component instance
+        :param callback: The invalidation callback of the component, or None
+        """
+        if callback is None:
+            # Nothing to do
+            return
+
+        self._logger.debug("%s: killed during its validation (result: %s), "
+                           "calling its invalidation callback", self.name,
+                           validated)
+        try:
+            result = callback(instance, self.bundle_context)
+        except Exception as ex:
+            self._logger.exception("Component '%s': error calling callback "
+                                   "method for event %s: %s", self.name,
+                                   constants.IPOPO_CALLBACK_INVALIDATE, ex)
+        else:
+            if is_coroutine(result):
+                future = ipopo_service._submit_coroutine(result)
+                future.add_done_callback(
+                    lambda fut: self.__log_coroutine_error(
+                        constants.IPOPO_CALLBACK_INVALIDATE, fut))
+
+    def __validation_done(self, future):
+        """
+        Called in the event loop thread when the validation coroutine of the
+        component has ended
+
+        :param future: The future of the validation coroutine
+        """
+        with self._lock:
+            if future is not self.__validation:
+                # The component has been killed in the meantime
+                return
+
+            # The duration of the callback includes the one of its coroutine
+            self.__statistics.callback_called(
+                constants.IPOPO_CALLBACK_VALIDATE,
+                statistics.timer() - self.__validation_start)
+
+            self.__validation = None
+            if future.cancelled():
+                succeeded = False
+            else:
+                try:
+                    result = future.result()
+                except Exception as ex:
+                    self._logger.error(
+                        "Component '%s': error in the coroutine of the "
+                        "callback method for event %s: %s", self.name,
+                        constants.IPOPO_CALLBACK_VALIDATE, ex)
+                    self.error_trace = ''.join(traceback.format_exception(
+                        type(ex), ex, ex.__traceback__))
+                    succeeded = False
+                else:
+                    succeeded = result is None or bool(result)
+
+            if self.__end_validation(succeeded):
+                # Dependencies might have gone during the validation
+                self.__check_lifecycle()
+
+    def __log_coroutine_error(self, event, future):
+        """
+        Logs the error raised by a callback coroutine, if any
+
+        :param event: The event of the callback
+        :param future: The future of the coroutine
+        """
+        if not future.cancelled() and future.exception() is not None:
+            self._logger.error("Component '%s': error in the coroutine of "
+                               "the callback method for event %s: %s",
+                               self.name, event, future.exception())
+
+    def __submit_callback_coroutine(self, event, coroutine):
+        # type: (str, Any) -> bool
+        """
+        Runs the coroutine returned by a component callback in the event loop
+        of iPOPO, without waiting for its end
+
+        :param event: The event of the callback
+        :param coroutine: The coroutine returned by the callback
+        :return: True
+        """
+        future = self._ipopo_service._submit_coroutine(coroutine)
+        future.add_done_callback(
+            lambda fut: self.__log_coroutine_error(event, fut))
+        return True
+
+    def __callback_called(self, event, start):
+        # type: (str, float) -> None
+        """
+        Records the duration of a call to a component callback. The instance
+        lock is acquired, as the validation callback can be called by a
+        thread of the validation pool.
+
+        :param event: The callback event
+        :param start: Time of the call to the callback
+        """
+        duration = statistics.timer() - start
+        with self._lock:
+            self.__statistics.callback_called(event, duration)
+
     def __callback(self, event, *args, **kwargs):
         # type: (str, *Any, **Any) -> Any
         """
@@ -512,10 +1037,25 @@ class StoredInstance(object):
             return True
 
         # Call it
-        result = comp_callback(self.instance, *args, **kwargs)
+        start = statistics.timer()
+        result = None
+        try:
+            result = comp_callback(self.instance, *args, **kwargs)
+        finally:
+            if event == constants.IPOPO_CALLBACK_VALIDATE \
+                    and is_coroutine(result):
+                # Recorded at the end of the coroutine (__validation_done())
+                self.__validation_start = start
+            else:
+                self.__callback_called(event, start)
+
         if result is None:
             # Special case, if the call back returns nothing
             return True
+        elif is_coroutine(result) \
+                and event != constants.IPOPO_CALLBACK_VALIDATE:
+            # Only the validation waits for the end of its coroutine
+            return self.__submit_callback_coroutine(event, result)
 
         return result
 
@@ -543,10 +1083,17 @@ class StoredInstance(object):
             return True
 
         # Call it
-        result = callback(self.instance, field, *args, **kwargs)
+        start = statistics.timer()
+        try:
+            result = callback(self.instance, field, *args, **kwargs)
+        finally:
+            self.__callback_called(event, start)
+
         if result is None:
             # Special case, if the call back returns nothing
             return True
+        elif is_coroutine(result):
+            return self.__submit_callback_coroutine(event, result)
 
         return result
 
@@ -690,7 +1237,8 @@ class StoredInstance(object):
     def __safe_handlers_callback(self, method_name, *args, **kwargs):
         # type: (str, *Any, **Any) -> bool
         """
-        Calls the given method with the given arguments in all handlers.
+        Calls the given method with the given arguments in all handlers
+        implementing it (see HANDLER_HOOKS).
         Logs exceptions, but doesn't propagate them.
         Methods called in handlers must return None, True or False.
 
@@ -718,31 +1266,26 @@ class StoredInstance(object):
         break_on_false = kwargs.pop('break_on_false', False)
 
         result = True
-        for handler in self.get_handlers():
-            # Get the method for each handler
+        handlers = self.__all_handlers
+        for idx, method in self.__hooks.get(method_name, ()):
+            handler = handlers[idx]
             try:
-                method = getattr(handler, method_name)
-            except AttributeError:
-                # Ignore missing methods
-                pass
-            else:
-                try:
-                    # Call it
-                    res = method(*args, **kwargs)
-                    if res is not None and not res:
-                        # Ignore 'None' results
-                        result = False
-                except Exception as ex:
-                    # Log errors
-                    self._logger.exception("Error calling handler '%s': %s",
-                                           handler, ex)
+                # Call it
+                res = method(handler, *args, **kwargs)
+                if res is not None and not res:
+                    # Ignore 'None' results
+                    result = False
+            except Exception as ex:
+                # Log errors
+                self._logger.exception("Error calling handler '%s': %s",
+                                       handler, ex)
 
-                    # We can consider exceptions as errors or ignore them
-                    result = result and not exception_as_error
+                # We can consider exceptions as errors or ignore them
+                result = result and not exception_as_error
 
-                if not handler and break_on_false:
-                    # The loop can stop here
-                    break
+            if not result and break_on_false:
+                # The loop can stop here
+                break
 
         return result
 
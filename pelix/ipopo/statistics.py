@@ -0,0 +1,210 @@
+#!/usr/bin/env python
+# -- Content-Encoding: UTF-8 --
+"""
+Life cycle statistics of iPOPO component instances: time spent in each state,
+calls to the dependency bindings, durations of the component callbacks and
+number of invalidations caused by lost dependencies ("flaps").
+
+:author: Thomas Calmant
+:copyright: Copyright 2017, Thomas Calmant
+:license: Apache License 2.0
+:version: 0.6.6
+
+..
+
+    Copyright 2017 Thomas Calmant
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+# Standard library
+import time
+
+# Standard typing module should be optional
+try:
+    from typing import Any, Dict, List
+except ImportError:
+    pass
+
+try:
+    # Python 3.3+
+    timer = time.monotonic
+except AttributeError:
+    timer = time.time
+
+# ------------------------------------------------------------------------------
+
+# Module version
+__version_info__ = (0, 6, 6)
+__version__ = ".".join(str(x) for x in __version_info__)
+
+# Documentation strings format
+__docformat__ = "restructuredtext en"
+
+# ------------------------------------------------------------------------------
+
+BIND = "bind"
+""" A service has been injected in a dependency """
+
+UPDATE = "update"
+""" The properties of an injected service have been updated """
+
+UNBIND = "unbind"
+""" A service has been removed from a dependency """
+
+_DEPENDENCY_EVENTS = (BIND, UPDATE, UNBIND)
+
+_NB_STATES = 5
+""" Number of states of a component (see StoredInstance) """
+
+# ------------------------------------------------------------------------------
+
+
+class InstanceStatistics(object):
+    """
+    Counters and timings of the life cycle of a component instance.
+
+    The dictionaries of dependencies and callbacks statistics are created on
+    first use, as most components never see their dependencies change.
+
+    This class is not thread-safe: its methods must be called while holding
+    the lock of the component instance.
+    """
+    __slots__ = ('__state', '__state_since', '__state_times', '__flaps',
+                 '__dependencies', '__callbacks')
+
+    def __init__(self, state):
+        # type: (int) -> None
+        """
+        :param state: Initial state of the component
+        """
+        self.__state = state
+        self.__state_since = timer()
+        # Time spent per state, indexed by state, created on first change
+        self.__state_times = None  # type: List[float]
+        self.__flaps = 0
+
+        # Field -> [bind, update, unbind]
+        self.__dependencies = None  # type: Dict[str, List[int]]
+
+        # Event -> [calls, total duration, maximum duration]
+        self.__callbacks = None  # type: Dict[str, List[Any]]
+
+    def state_changed(self, state):
+        # type: (int) -> None
+        """
+        The component went into a new state
+
+        :param state: The new state of the component
+        """
+        if state == self.__state:
+            return
+
+        if self.__state_times is None:
+            self.__state_times = [None] * _NB_STATES
+
+        now = timer()
+        previous = self.__state
+        self.__state_times[previous] = \
+            (self.__state_times[previous] or 0.) + now - self.__state_since
+        self.__state = state
+        self.__state_since = now
+
+    def flapped(self):
+        """
+        A valid component has been invalidated because one of its handlers
+        became invalid, e.g. a dependency has been lost
+        """
+        self.__flaps += 1
+
+    def dependency_event(self, field, kind):
+        # type: (str, str) -> None
+        """
+        Counts a call to the component bindings
+
+        :param field: The field injected by the dependency handler
+        :param kind: Kind of call (BIND, UPDATE or UNBIND)
+        """
+        if self.__dependencies is None:
+            self.__dependencies = {}
+
+        try:
+            counters = self.__dependencies[field]
+        except KeyError:
+            counters = self.__dependencies[field] = [0, 0, 0]
+
+        counters[_DEPENDENCY_EVENTS.index(kind)] += 1
+
+    def callback_called(self, event, duration):
+        # type: (str, float) -> None
+        """
+        Records the duration of a call to a component callback
+
+        :param event: The callback event (IPOPO_CALLBACK_* constants)
+        :param duration: The duration of the call, in seconds
+        """
+        if self.__callbacks is None:
+            self.__callbacks = {}
+
+        try:
+            entry = self.__callbacks[event]
+        except KeyError:
+            self.__callbacks[event] = [1, duration, duration]
+        else:
+            entry[0] += 1
+            entry[1] += duration
+            if duration > entry[2]:
+                entry[2] = duration
+
+    def to_dict(self):
+        # type: () -> Dict[str, Any]
+        """
+        Returns a snapshot of the statistics, with the following keys:
+
+        * state: The current state of the component
+        * state_times: A {state → seconds} dictionary, giving the time spent
+          in each state, including the time spent in the current one
+        * flaps: The number of invalidations of the component caused by its
+          handlers, e.g. the loss of a dependency
+        * dependencies: A {field → {"bind", "update", "unbind" → count}}
+          dictionary
+        * callbacks: A {event → {"calls", "total", "max"}} dictionary, giving
+          the number of calls to each component callback and their cumulative
+          and maximum durations (in seconds). The duration of a validation
+          callback returning a coroutine lasts until the end of the
+          coroutine; for the other callbacks, it is the one of the call
+          returning the coroutine. The time a pooled validation waits for a
+          thread is counted in the VALIDATING state.
+
+        :return: A dictionary
+        """
+        state_times = dict(
+            (state, duration)
+            for state, duration in enumerate(self.__state_times or ())
+            if duration is not None)
+        state_times[self.__state] = state_times.get(self.__state, 0.) \
+            + timer() - self.__state_since
+
+        dependencies = dict(
+            (field, dict(zip(_DEPENDENCY_EVENTS, counters)))
+            for field, counters in (self.__dependencies or {}).items())
+
+        callbacks = dict(
+            (event, {"calls": entry[0], "total": entry[1], "max": entry[2]})
+            for event, entry in (self.__callbacks or {}).items())
+
+        return {"state": self.__state,
+                "state_times": state_times,
+                "flaps": self.__flaps,
+                "dependencies": dependencies,
+                "callbacks": callbacks}
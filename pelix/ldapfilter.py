@@ -26,11 +26,13 @@ Dependency-less LDAP filter parser for Python
 """
 
 # Standard library
+import collections
 import inspect
+import threading
 
 # Standard typing module should be optional
 try:
-    from typing import Any, Callable, Iterable, Optional, Union
+    from typing import Any, Callable, Dict, Iterable, List, Optional, Union
 except ImportError:
     pass
 
@@ -76,7 +78,7 @@ class LDAPFilter(object):
     """
     Represents an LDAP filter
     """
-    __slots__ = ("subfilters", "operator")
+    __slots__ = ("subfilters", "operator", "_matcher")
 
     def __init__(self, operator):
         """
@@ -87,6 +89,7 @@ class LDAPFilter(object):
 
         self.subfilters = []
         self.operator = operator
+        self._matcher = None
 
     def __eq__(self, other):
         """
@@ -138,7 +141,8 @@ class LDAPFilter(object):
         Appends a filter or a criterion to this filter
 
         :param ldap_filter: An LDAP filter or criterion
-        :raise TypeError: If the parameter is not of a known type
+        :raise TypeError: If the parameter is not of a known type or if this
+                          filter is shared by the parsed filters cache
         :raise ValueError: If the more than one filter is associated to a
                            NOT operator
         """
@@ -146,21 +150,60 @@ class LDAPFilter(object):
             raise TypeError("Invalid filter type: {0}"
                             .format(type(ldap_filter).__name__))
 
+        if isinstance(self.subfilters, tuple):
+            raise TypeError("Can't modify a shared (cached) filter")
+
         if len(self.subfilters) >= 1 and self.operator == NOT:
             raise ValueError("Not operator only handles one child")
 
         self.subfilters.append(ldap_filter)
 
+        # Forget the previously compiled matcher
+        self._matcher = None
+
+    def compile(self):
+        # type: () -> Callable[[dict], bool]
+        """
+        Compiles this filter into a single matcher function.
+
+        The matcher is built once from the compiled matchers of the
+        sub-filters and is then cached: it is reset when a sub-filter is
+        appended or when the normalization modifies this filter.
+
+        :return: A function accepting a properties dictionary and returning
+                 True if it matches this filter
+        """
+        matcher = self._matcher
+        if matcher is None:
+            matcher = self._matcher = _compile_filter(
+                self.operator, [subfilter.compile()
+                                for subfilter in self.subfilters])
+        return matcher
+
     def matches(self, properties):
         """
         Tests if the given properties matches this LDAP filter and its children
 
+        :param properties: A dictionary of properties
+        :return: True if the properties matches this filter, else False
+        """
+        matcher = self._matcher
+        if matcher is None:
+            matcher = self.compile()
+        return matcher(properties)
+
+    def interpret(self, properties):
+        """
+        Tests if the given properties matches this LDAP filter and its
+        children, by walking the filter tree instead of using the compiled
+        matcher
+
         :param properties: A dictionary of properties
         :return: True if the properties matches this filter, else False
         """
         # Use a generator, and declare it outside of the method call
         # => seems to be quite a speed up trick
-        generator = (criterion.matches(properties)
+        generator = (criterion.interpret(properties)
                      for criterion in self.subfilters)
 
         # Extract "if" from loops and use built-in methods
@@ -191,7 +234,15 @@ class LDAPFilter(object):
                 new_filters.append(norm_filter)
 
         # Update the instance
-        self.subfilters = new_filters
+        if len(new_filters) != len(self.subfilters) \
+                or any(new is not old for new, old
+                       in zip(new_filters, self.subfilters)):
+            if isinstance(self.subfilters, tuple):
+                # Keep shared filters read-only
+                new_filters = tuple(new_filters)
+
+            self.subfilters = new_filters
+            self._matcher = None
 
         size = len(self.subfilters)
         if size > 1 or self.operator == NOT:
@@ -207,7 +258,7 @@ class LDAPCriteria(object):
     """
     Represents an LDAP criterion
     """
-    __slots__ = ("name", "value", "comparator")
+    __slots__ = ("name", "value", "comparator", "_matcher")
 
     def __init__(self, name, value, comparator):
         """
@@ -228,6 +279,7 @@ class LDAPCriteria(object):
         self.name = str(name)
         self.value = value
         self.comparator = comparator
+        self._matcher = None
 
     def __eq__(self, other):
         """
@@ -269,10 +321,39 @@ class LDAPCriteria(object):
                                     comparator2str(self.comparator),
                                     escape_LDAP(str(self.value)))
 
+    def compile(self):
+        # type: () -> Callable[[dict], bool]
+        """
+        Compiles this criterion into a matcher function, specialized for its
+        comparator and with its operand prepared once for all.
+        The matcher is cached.
+
+        :return: A function accepting a properties dictionary and returning
+                 True if it matches this criterion
+        """
+        matcher = self._matcher
+        if matcher is None:
+            matcher = self._matcher = _compile_criteria(
+                self.name, self.value, self.comparator)
+        return matcher
+
     def matches(self, properties):
         """
         Tests if the given criterion matches this LDAP criterion
 
+        :param properties: A dictionary of properties
+        :return: True if the properties matches this criterion, else False
+        """
+        matcher = self._matcher
+        if matcher is None:
+            matcher = self.compile()
+        return matcher(properties)
+
+    def interpret(self, properties):
+        """
+        Tests if the given criterion matches this LDAP criterion, by calling
+        its comparator instead of using the compiled matcher
+
         :param properties: A dictionary of properties
         :return: True if the properties matches this criterion, else False
         """
@@ -390,12 +471,18 @@ def _star_comparison(filter_value, tested_value):
     """
     Tests a filter containing a joker
     """
+    return _star_parts_comparison(filter_value.split('*'), tested_value)
+
+
+def _star_parts_comparison(parts, tested_value):
+    """
+    Tests a filter containing a joker, given as the list of the parts of the
+    filter value around the jokers
+    """
     if not is_string(tested_value):
         # Unhandled value type...
         return False
 
-    parts = filter_value.split('*')
-
     i = 0
     last_part = len(parts) - 1
 
@@ -623,6 +710,292 @@ def operator2str(operator):
         return '!'
     return '<unknown>'
 
+
+def is_equality(criterion):
+    # type: (Any) -> bool
+    """
+    Tests if the given object is an equality criterion on a string value,
+    i.e. a test of the presence of that string in the property value
+
+    :param criterion: A parsed LDAP filter or criterion
+    :return: True if the criterion is a string equality test
+    """
+    return isinstance(criterion, LDAPCriteria) \
+        and criterion.comparator is _comparator_eq \
+        and is_string(criterion.value)
+
+
+def is_parsable(criterion):
+    # type: (LDAPCriteria) -> bool
+    """
+    Tests if the string form of the given criterion describes it without
+    ambiguity, i.e. if parsing it would give back the same comparator
+
+    :param criterion: A parsed LDAP criterion
+    :return: True if the criterion can be identified by its string form
+    """
+    value = criterion.value
+    if not is_string(value):
+        return False
+    elif value == '*':
+        parsed = (_comparator_presence,)
+    elif '*' in value:
+        parsed = (_comparator_star, _comparator_approximate_star)
+    else:
+        parsed = (_comparator_eq, _comparator_approximate,
+                  _comparator_le, _comparator_lt,
+                  _comparator_ge, _comparator_gt)
+
+    return criterion.comparator in parsed
+
+# ------------------------------------------------------------------------------
+
+_NO_MATCH = object()
+""" Marker of a filter value which can't be converted to a tested type """
+
+
+def _convert_operand(filter_value, value_type):
+    # type: (str, type) -> Any
+    """
+    Converts a string filter value to the type of a tested value, like the
+    inequality comparators do
+
+    :param filter_value: The string filter value
+    :param value_type: The type of the tested value
+    :return: The converted value or _NO_MATCH
+    """
+    try:
+        # Try a conversion
+        return value_type(filter_value)
+    except (TypeError, ValueError):
+        if value_type is int:
+            # Integer/float comparison trick
+            try:
+                return float(filter_value)
+            except (TypeError, ValueError):
+                # None-float value
+                pass
+
+    # Incompatible type
+    return _NO_MATCH
+
+
+def _compile_eq(filter_value):
+    """
+    Prepares the test of the equality comparator
+    """
+    def test(tested_value):
+        if isinstance(tested_value, ITERABLES):
+            for value in tested_value:
+                if not is_string(value):
+                    value = repr(value)
+
+                if filter_value == value:
+                    return True
+            return False
+        elif not is_string(tested_value):
+            # String vs string representation
+            return filter_value == repr(tested_value)
+
+        return filter_value == tested_value
+    return test
+
+
+def _compile_star(filter_value):
+    """
+    Prepares the test of the joker comparator: the filter value is split once
+    """
+    parts = filter_value.split('*')
+
+    def test(tested_value):
+        if isinstance(tested_value, ITERABLES):
+            for value in tested_value:
+                if _star_parts_comparison(parts, value):
+                    return True
+            return False
+
+        return _star_parts_comparison(parts, tested_value)
+    return test
+
+
+def _compile_approximate(filter_value, star):
+    """
+    Prepares the test of the approximate comparators: the lower case form of
+    the filter value is computed once
+    """
+    if star:
+        raw_test = _compile_star(filter_value)
+        lower_test = _compile_star(filter_value.lower())
+    else:
+        raw_test = _compile_eq(filter_value)
+        lower_test = _compile_eq(filter_value.lower())
+
+    def test(tested_value):
+        if is_string(tested_value):
+            # Lower case comparison
+            return lower_test(tested_value.lower())
+        elif hasattr(tested_value, '__iter__'):
+            # Extract a list of strings
+            if lower_test([value.lower() for value in tested_value
+                           if is_string(value)]):
+                # Value found in the strings
+                return True
+
+        # Compare the raw values
+        return raw_test(tested_value) or lower_test(tested_value)
+    return test
+
+
+def _compile_inequality(filter_value, strict, greater):
+    """
+    Prepares the test of the inequality comparators: the conversions of the
+    filter value to the most common types are computed once
+    """
+    if strict:
+        eq_test = None
+    else:
+        eq_test = _compile_eq(filter_value)
+
+    if is_string(filter_value):
+        # Pre-typed operands
+        operands = dict((value_type, _convert_operand(filter_value, value_type))
+                        for value_type in (int, float, str))
+    else:
+        # No conversion needed
+        operands = None
+
+    def test(tested_value):
+        if operands is None:
+            operand = filter_value
+        else:
+            value_type = type(tested_value)
+            try:
+                operand = operands[value_type]
+            except KeyError:
+                operand = _convert_operand(filter_value, value_type)
+
+        if operand is not _NO_MATCH:
+            try:
+                if greater:
+                    if tested_value > operand:
+                        return True
+                elif tested_value < operand:
+                    return True
+            except TypeError:
+                # Incompatible type
+                pass
+
+        return eq_test is not None and eq_test(tested_value)
+    return test
+
+
+def _compile_criteria(name, value, comparator):
+    # type: (str, Any, Callable[[Any, Any], bool]) -> Callable[[dict], bool]
+    """
+    Compiles an LDAP criterion into a matcher function
+
+    :param name: Name of the tested property
+    :param value: Filter value
+    :param comparator: Criterion comparator
+    :return: A function accepting a properties dictionary
+    """
+    if comparator is _comparator_presence:
+        # Simple presence test
+        def matcher(properties):
+            try:
+                tested_value = properties[name]
+            except KeyError:
+                return False
+
+            if tested_value is None:
+                return False
+            elif hasattr(tested_value, "__len__"):
+                return len(tested_value) != 0
+            return True
+        return matcher
+
+    if comparator is _comparator_eq:
+        test = _compile_eq(value)
+    elif comparator is _comparator_star and is_string(value):
+        test = _compile_star(value)
+    elif comparator is _comparator_approximate and is_string(value):
+        test = _compile_approximate(value, False)
+    elif comparator is _comparator_approximate_star and is_string(value):
+        test = _compile_approximate(value, True)
+    elif comparator is _comparator_lt:
+        test = _compile_inequality(value, True, False)
+    elif comparator is _comparator_le:
+        test = _compile_inequality(value, False, False)
+    elif comparator is _comparator_gt:
+        test = _compile_inequality(value, True, True)
+    elif comparator is _comparator_ge:
+        test = _compile_inequality(value, False, True)
+    else:
+        # Unknown comparator: call it as is
+        def matcher(properties):
+            try:
+                return bool(comparator(value, properties[name]))
+            except KeyError:
+                return False
+        return matcher
+
+    def matcher(properties):
+        try:
+            tested_value = properties[name]
+        except KeyError:
+            # Criterion key is not in the properties
+            return False
+        return test(tested_value)
+    return matcher
+
+
+def _compile_filter(operator, matchers):
+    # type: (int, List[Callable[[dict], bool]]) -> Callable[[dict], bool]
+    """
+    Combines the matchers of the sub-filters of an LDAP filter into a single
+    matcher function, which stops as soon as the result is known
+
+    :param operator: The filter operator (AND, OR or NOT)
+    :param matchers: The compiled matchers of the sub-filters
+    :return: A function accepting a properties dictionary
+    """
+    matchers = tuple(matchers)
+
+    if operator == NOT:
+        if not matchers:
+            # "not all([])"
+            return lambda properties: False
+
+        # NOT only handles one child
+        sub_matcher = matchers[0]
+        return lambda properties: not sub_matcher(properties)
+
+    if len(matchers) == 1:
+        # Single child: use it directly
+        return matchers[0]
+
+    if len(matchers) == 2:
+        # Most common case
+        first, second = matchers
+        if operator == OR:
+            return lambda properties: first(properties) \
+                or second(properties)
+        return lambda properties: first(properties) and second(properties)
+
+    if operator == OR:
+        def matcher(properties):
+            for sub_matcher in matchers:
+                if sub_matcher(properties):
+                    return True
+            return False
+    else:
+        def matcher(properties):
+            for sub_matcher in matchers:
+                if not sub_matcher(properties):
+                    return False
+            return True
+    return matcher
+
 # ------------------------------------------------------------------------------
 
 
@@ -885,11 +1258,150 @@ def _parse_ldap(ldap_filter):
     return root.normalize()
 
 
+class _ParseCache(object):
+    """
+    Bounded, least recently used cache of parsed LDAP filter strings
+    """
+    def __init__(self, max_size):
+        """
+        :param max_size: Maximum number of stored filters (0 to disable)
+        """
+        self.__lock = threading.Lock()
+        self.__entries = collections.OrderedDict()
+        self.__max_size = max(0, max_size)
+        self.__hits = 0
+        self.__misses = 0
+
+    def clear(self):
+        """
+        Clears the cache content and its counters
+        """
+        with self.__lock:
+            self.__entries.clear()
+            self.__hits = 0
+            self.__misses = 0
+
+    def get_info(self):
+        # type: () -> Dict[str, int]
+        """
+        Returns the cache statistics
+
+        :return: A dictionary with the ``hits``, ``misses``, ``size`` and
+                 ``max_size`` entries
+        """
+        with self.__lock:
+            return {"hits": self.__hits,
+                    "misses": self.__misses,
+                    "size": len(self.__entries),
+                    "max_size": self.__max_size}
+
+    def set_max_size(self, max_size):
+        # type: (int) -> None
+        """
+        Changes the size of the cache, removing the oldest entries if necessary
+
+        :param max_size: Maximum number of stored filters (0 to disable)
+        """
+        with self.__lock:
+            self.__max_size = max(0, max_size)
+            while len(self.__entries) > self.__max_size:
+                self.__entries.popitem(last=False)
+
+    def parse(self, ldap_filter):
+        # type: (str) -> Optional[Union[LDAPFilter, LDAPCriteria]]
+        """
+        Returns the parsed version of the given filter string, from the cache
+        if possible
+
+        :param ldap_filter: An LDAP filter string
+        :return: The parsed filter, can be None
+        :raise ValueError: Invalid filter string
+        """
+        with self.__lock:
+            try:
+                # Move the entry at the end of the LRU order
+                parsed = self.__entries.pop(ldap_filter)
+            except KeyError:
+                self.__misses += 1
+            else:
+                self.__entries[ldap_filter] = parsed
+                self.__hits += 1
+                return parsed
+
+        # Parse the filter outside the lock (exception is propagated)
+        parsed = _freeze(_parse_ldap(ldap_filter))
+
+        with self.__lock:
+            if self.__max_size:
+                self.__entries[ldap_filter] = parsed
+                if len(self.__entries) > self.__max_size:
+                    # Remove the least recently used entry
+                    self.__entries.popitem(last=False)
+
+        return parsed
+
+
+DEFAULT_CACHE_SIZE = 256
+""" Default maximum number of parsed filters kept in cache """
+
+_CACHE = _ParseCache(DEFAULT_CACHE_SIZE)
+""" Process-wide parsed filters cache """
+
+
+def _freeze(ldap_filter):
+    """
+    Makes the given filter and its children read-only, as it will be shared
+    by all the callers of get_ldap_filter()
+
+    :param ldap_filter: A parsed filter
+    :return: The given filter
+    """
+    if isinstance(ldap_filter, LDAPFilter):
+        for subfilter in ldap_filter.subfilters:
+            _freeze(subfilter)
+
+        ldap_filter.subfilters = tuple(ldap_filter.subfilters)
+
+    return ldap_filter
+
+
+def set_cache_size(max_size):
+    # type: (int) -> None
+    """
+    Sets the maximum number of parsed filter strings kept in cache.
+    The cache is shared by all the frameworks of the process.
+
+    :param max_size: Maximum size of the cache, 0 to disable it
+    """
+    _CACHE.set_max_size(max_size)
+
+
+def get_cache_info():
+    # type: () -> Dict[str, int]
+    """
+    Returns the statistics of the parsed filters cache: number of ``hits``
+    and ``misses``, current ``size`` and ``max_size``
+
+    :return: A dictionary
+    """
+    return _CACHE.get_info()
+
+
+def clear_cache():
+    """
+    Clears the parsed filters cache and resets its statistics
+    """
+    _CACHE.clear()
+
+
 def get_ldap_filter(ldap_filter):
     # type: (Any) -> Optional[Union[LDAPFilter, LDAPCriteria]]
     """
     Retrieves the LDAP filter object corresponding to the given filter.
-    Parses it the argument if it is an LDAPFilter instance
+    Parses it the argument if it is a string.
+
+    Parsed strings are kept in a bounded cache: the returned filter objects
+    are shared and can't be modified with ``append()``.
 
     :param ldap_filter: An LDAP filter (LDAPFilter or string)
     :return: The corresponding filter, can be None
@@ -903,8 +1415,8 @@ def get_ldap_filter(ldap_filter):
         # No conversion needed
         return ldap_filter
     elif is_string(ldap_filter):
-        # Parse the filter
-        return _parse_ldap(ldap_filter)
+        # Parse the filter (or get it from the cache)
+        return _CACHE.parse(ldap_filter)
 
     # Unknown type
     raise TypeError("Unhandled filter type {0}"
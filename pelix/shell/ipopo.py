@@ -104,7 +104,8 @@ class IPopoCommands(object):
                 ("instance", self.instance_details),
                 ("instantiate", self.instantiate),
                 ("kill", self.kill),
-                ("retry", self.retry_erroneous)]
+                ("retry", self.retry_erroneous),
+                ("stats", self.instance_statistics)]
 
     def list_factories(self, session, name=None):
         """
@@ -273,6 +274,88 @@ class IPopoCommands(object):
         lines.append("")
         session.write('\n'.join(lines))
 
+    def instance_statistics(self, session, name=None):
+        """
+        Prints the life cycle statistics of the component instances, or the
+        details of those of the given instance
+        """
+        instances = [instance[0] for instance in self._ipopo.get_instances()]
+        if name in instances:
+            return self.__print_statistics(session, name)
+
+        if name is not None:
+            # Filter instances by name
+            instances = [instance for instance in instances if name in instance]
+
+        headers = ('Name', 'State', 'Flaps', 'Binds', 'Updates', 'Unbinds',
+                   'Slowest callback', 'Max (ms)')
+        lines = []
+        for instance in instances:
+            try:
+                stats = self._ipopo.get_instance_statistics(instance)
+            except ValueError:
+                # Killed in the meantime
+                continue
+
+            counters = [sum(dependency[kind] for dependency
+                            in stats["dependencies"].values())
+                        for kind in ("bind", "update", "unbind")]
+
+            slowest = ("", "")
+            if stats["callbacks"]:
+                event, entry = max(stats["callbacks"].items(),
+                                   key=lambda item: item[1]["max"])
+                slowest = (event, "{0:.3f}".format(entry["max"] * 1000))
+
+            lines.append((instance, ipopo_state_to_str(stats["state"]),
+                          stats["flaps"]) + tuple(counters) + slowest)
+
+        session.write(self._utils.make_table(headers, lines))
+        if name is None:
+            session.write_line("{0} components running", len(lines))
+        else:
+            session.write_line("{0} filtered components", len(lines))
+
+    def __print_statistics(self, session, name):
+        """
+        Prints the life cycle statistics of the given component instance
+        """
+        try:
+            stats = self._ipopo.get_instance_statistics(name)
+        except ValueError as ex:
+            session.write_line("Error getting statistics of '{0}': {1}",
+                               name, ex)
+            return False
+
+        lines = [
+            "Name.: {0}".format(name),
+            "State: {0}".format(ipopo_state_to_str(stats["state"])),
+            "Flaps: {0}".format(stats["flaps"]),
+            "Time per state:",
+            self._utils.make_table(
+                ("State", "Time (s)"),
+                [(ipopo_state_to_str(state), "{0:.3f}".format(duration))
+                 for state, duration in sorted(stats["state_times"].items())],
+                "\t")]
+
+        lines.append("Dependencies:")
+        lines.append(self._utils.make_table(
+            ("Field", "Binds", "Updates", "Unbinds"),
+            [(field, counters["bind"], counters["update"], counters["unbind"])
+             for field, counters in sorted(stats["dependencies"].items())],
+            "\t"))
+
+        lines.append("Callbacks:")
+        lines.append(self._utils.make_table(
+            ("Event", "Calls", "Total (ms)", "Max (ms)"),
+            [(event, entry["calls"], "{0:.3f}".format(entry["total"] * 1000),
+              "{0:.3f}".format(entry["max"] * 1000))
+             for event, entry in sorted(stats["callbacks"].items())],
+            "\t"))
+
+        lines.append("")
+        session.write('\n'.join(lines))
+
     def instantiate(self, session, factory, name, **properties):
         """
         Instantiates a component of the given factory with the given name and
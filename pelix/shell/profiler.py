@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+# -- Content-Encoding: UTF-8 --
+"""
+Shell commands for the boot profiler of the framework
+
+:author: Thomas Calmant
+:copyright: Copyright 2017, Thomas Calmant
+:license: Apache License 2.0
+:version: 0.6.6
+
+..
+
+    Copyright 2017 Thomas Calmant
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+# Pelix
+from pelix.ipopo.decorators import ComponentFactory, Requires, Provides, \
+    Instantiate, Validate, Invalidate
+import pelix.shell
+
+# ------------------------------------------------------------------------------
+
+# Module version
+__version_info__ = (0, 6, 6)
+__version__ = ".".join(str(x) for x in __version_info__)
+
+# Documentation strings format
+__docformat__ = "restructuredtext en"
+
+# ------------------------------------------------------------------------------
+
+
+@ComponentFactory("pelix-shell-profiler-factory")
+@Requires("_utils", pelix.shell.SERVICE_SHELL_UTILS)
+@Provides(pelix.shell.SERVICE_SHELL_COMMAND)
+@Instantiate("pelix-shell-profiler")
+class ProfilerCommands(object):
+    """
+    Boot profiler shell commands
+    """
+    def __init__(self):
+        """
+        Sets up the object
+        """
+        self._utils = None
+        self.__framework = None
+
+    @Validate
+    def _validate(self, context):
+        """
+        Component validated
+        """
+        self.__framework = context.get_framework()
+
+    @Invalidate
+    def _invalidate(self, _):
+        """
+        Component invalidated
+        """
+        self.__framework = None
+
+    @staticmethod
+    def get_namespace():
+        """
+        Retrieves the name space of this command handler
+        """
+        return "boot"
+
+    def get_methods(self):
+        """
+        Retrieves the list of tuples (command, method) for this command handler
+        """
+        return [("profile", self.profile),
+                ("export", self.export)]
+
+    def __get_profiler(self, session):
+        """
+        Returns the boot profiler of the framework, or prints a message if it
+        is disabled
+
+        :param session: The shell session
+        :return: The boot profiler or None
+        """
+        profiler = self.__framework.get_profiler()
+        if profiler is None:
+            session.write_line(
+                "Boot profiler disabled: set the pelix.framework.profile "
+                "framework property to True to enable it.")
+        return profiler
+
+    def profile(self, session, count=10):
+        """
+        Prints the boot steps with the highest duration and the critical path
+        """
+        profiler = self.__get_profiler(session)
+        if profiler is None:
+            return False
+
+        try:
+            count = int(count)
+        except (TypeError, ValueError):
+            session.write_line("Invalid count: {0}", count)
+            return False
+
+        headers = ('Kind', 'Name', 'Self (ms)', 'Total (ms)', 'Thread')
+        lines = [(step["kind"], step["name"],
+                  "{0:.3f}".format(step["self"] * 1000.),
+                  "{0:.3f}".format(step["duration"] * 1000.),
+                  step["thread"])
+                 for step in profiler.get_top(count)]
+        session.write_line("Top {0} boot steps:", len(lines))
+        session.write(self._utils.make_table(headers, lines))
+
+        headers = ('Kind', 'Name', 'Start (ms)', 'Total (ms)')
+        lines = [(step["kind"], step["name"],
+                  "{0:.3f}".format(step["start"] * 1000.),
+                  "{0:.3f}".format(step["duration"] * 1000.))
+                 for step in profiler.get_critical_path()]
+        session.write_line("Critical path:")
+        session.write(self._utils.make_table(headers, lines))
+
+    def export(self, session, filename):
+        """
+        Writes the boot profile in the given file, in JSON format
+        """
+        profiler = self.__get_profiler(session)
+        if profiler is None:
+            return False
+
+        try:
+            profiler.export(filename)
+        except (IOError, OSError) as ex:
+            session.write_line("Error writing {0}: {1}", filename, ex)
+            return False
+
+        session.write_line("Boot profile written to {0}", filename)
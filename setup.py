@@ -63,6 +63,7 @@ setup(
     url='https://ipopo.readthedocs.io/',
     packages=[
         'pelix',
+        'pelix.benchmarks',
         'pelix.http',
         'pelix.internals',
         'pelix.ipopo',
@@ -0,0 +1,9 @@
+#!/usr/bin/python
+# -- Content-Encoding: UTF-8 --
+
+# Auto-generated bundle, for Pelix tests
+__version__ = "1.0.0"
+test_var = False
+
+def test_fct():
+    return False
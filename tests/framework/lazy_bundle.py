@@ -0,0 +1,46 @@
+#!/usr/bin/env python
+# -- Content-Encoding: UTF-8 --
+"""
+Bundle registering a service, installed with a lazy activation policy.
+
+:author: Thomas Calmant
+"""
+
+from pelix.constants import BundleActivator
+
+__version__ = (1, 0, 0)
+
+SPECIFICATION = "tests.lazy.service"
+
+
+class LazyService(object):
+    """
+    Service registered by the bundle
+    """
+    pass
+
+
+@BundleActivator
+class Activator(object):
+    """
+    Test activator
+    """
+    def __init__(self):
+        """
+        Constructor
+        """
+        self.registration = None
+
+    def start(self, context):
+        """
+        Bundle started
+        """
+        self.registration = context.register_service(
+            SPECIFICATION, LazyService(), {})
+
+    def stop(self, context):
+        """
+        Bundle stopped
+        """
+        self.registration.unregister()
+        self.registration = None
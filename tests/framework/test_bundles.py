@@ -12,9 +12,11 @@ from tests import log_on, log_off
 # Pelix
 from pelix.framework import FrameworkFactory, Bundle, BundleException, \
     BundleContext
+import pelix.constants
 
 # Standard library
 import os
+import sys
 
 try:
     import unittest2 as unittest
@@ -27,6 +29,8 @@ __version__ = "1.0.0"
 
 SERVICE_BUNDLE = "tests.framework.service_bundle"
 SIMPLE_BUNDLE = "tests.framework.simple_bundle"
+LAZY_BUNDLE = "tests.framework.lazy_bundle"
+LAZY_SPEC = "tests.lazy.service"
 
 # ------------------------------------------------------------------------------
 
@@ -255,6 +259,148 @@ class BundlesTest(unittest.TestCase):
         # Pass 2: refresh test
         self.testLifeCycle(False)
 
+    def testGetBundleByName(self):
+        """
+        Tests the look up of bundles by name during their life cycle
+        """
+        self.assertIsNone(self.framework.get_bundle_by_name(SIMPLE_BUNDLE))
+
+        bundle = self.context.install_bundle(SIMPLE_BUNDLE)
+        self.assertIs(self.framework.get_bundle_by_name(SIMPLE_BUNDLE),
+                      bundle)
+        self.assertIs(self.context.install_bundle(SIMPLE_BUNDLE), bundle)
+
+        # Update keeps the bundle
+        bundle.update()
+        self.assertIs(self.framework.get_bundle_by_name(SIMPLE_BUNDLE),
+                      bundle)
+
+        # Uninstall removes it
+        bundle.uninstall()
+        self.assertIsNone(self.framework.get_bundle_by_name(SIMPLE_BUNDLE))
+
+        # A new bundle can be installed with the same name
+        new_bundle = self.context.install_bundle(SIMPLE_BUNDLE)
+        self.assertIsNot(new_bundle, bundle)
+        self.assertIs(self.framework.get_bundle_by_name(SIMPLE_BUNDLE),
+                      new_bundle)
+        new_bundle.uninstall()
+
+    def testLazyActivation(self):
+        """
+        Tests the activation of a lazy bundle on the first use of a service
+        """
+        sys.modules.pop(LAZY_BUNDLE, None)
+        bundle = self.context.install_lazy_bundle(LAZY_BUNDLE, [LAZY_SPEC])
+        self.assertTrue(bundle.is_lazy())
+        self.assertIs(self.context.install_lazy_bundle(LAZY_BUNDLE, []),
+                      bundle)
+        self.assertNotIn(LAZY_BUNDLE, sys.modules)
+        self.assertEqual(bundle.get_state(), Bundle.RESOLVED)
+        self.assertIsNone(self.context.get_service_reference(LAZY_SPEC))
+
+        # Start: the bundle waits for its first use
+        bundle.start()
+        self.assertEqual(bundle.get_state(), Bundle.STARTING)
+        self.assertNotIn(LAZY_BUNDLE, sys.modules)
+        placeholder = self.context.get_service_reference(LAZY_SPEC)
+        self.assertTrue(placeholder.get_property(
+            pelix.constants.SERVICE_PLACEHOLDER))
+
+        # The placeholder service isn't the bundle itself
+        registry = self.framework._registry
+        placeholder_svc = registry.get_service(self.framework, placeholder)
+        self.assertIsNot(placeholder_svc, bundle)
+        self.assertIs(placeholder_svc.get_bundle(), bundle)
+        self.assertEqual(placeholder_svc.get_specification(), LAZY_SPEC)
+        registry.unget_service(self.framework, placeholder)
+
+        # Internal accessor doesn't activate the bundle
+        self.assertIsNone(bundle._get_loaded_module())
+        self.assertEqual(bundle.get_state(), Bundle.STARTING)
+        self.assertNotIn(LAZY_BUNDLE, sys.modules)
+
+        # First use: the real service is given
+        service = self.context.get_service(placeholder)
+        module_ = sys.modules[LAZY_BUNDLE]
+        self.assertIsInstance(service, module_.LazyService)
+        self.assertEqual(bundle.get_state(), Bundle.ACTIVE)
+        self.assertIs(bundle.get_module(), module_)
+
+        # The placeholder has been replaced
+        svc_ref = self.context.get_service_reference(LAZY_SPEC)
+        self.assertIsNot(svc_ref, placeholder)
+        self.assertIsNone(svc_ref.get_property(
+            pelix.constants.SERVICE_PLACEHOLDER))
+        self.assertEqual(
+            len(self.context.get_all_service_references(LAZY_SPEC)), 1)
+        self.assertEqual(svc_ref.get_using_bundles(),
+                         [self.framework])
+
+        # Releasing the placeholder releases the real service
+        self.assertTrue(self.context.unget_service(placeholder))
+        self.assertEqual(svc_ref.get_using_bundles(), [])
+        self.assertFalse(self.context.unget_service(placeholder))
+
+        bundle.stop()
+        self.assertIsNone(self.context.get_service_reference(LAZY_SPEC))
+        bundle.uninstall()
+
+    def testLazyConsumerStop(self):
+        """
+        Tests the release of the services a bundle got through placeholders
+        when it stops
+        """
+        sys.modules.pop(LAZY_BUNDLE, None)
+        bundle = self.context.install_lazy_bundle(LAZY_BUNDLE, [LAZY_SPEC])
+        bundle.start()
+
+        consumer = self.context.install_bundle(SIMPLE_BUNDLE)
+        consumer.start()
+        consumer_context = consumer.get_bundle_context()
+        placeholder = consumer_context.get_service_reference(LAZY_SPEC)
+        consumer_context.get_service(placeholder)
+        consumer_context.get_service(placeholder)
+        svc_ref = self.context.get_service_reference(LAZY_SPEC)
+        self.assertEqual(svc_ref.get_using_bundles(), [consumer])
+
+        # Stopping the consumer releases the real service
+        consumer.stop()
+        self.assertEqual(svc_ref.get_using_bundles(), [])
+        self.assertFalse(consumer_context.unget_service(placeholder))
+
+        consumer.uninstall()
+        bundle.uninstall()
+
+    def testLazyStop(self):
+        """
+        Tests the stop of a lazy bundle which has not been activated
+        """
+        sys.modules.pop(LAZY_BUNDLE, None)
+        bundle = self.context.install_lazy_bundle(LAZY_BUNDLE, [LAZY_SPEC])
+        bundle.start()
+        self.assertIsNotNone(self.context.get_service_reference(LAZY_SPEC))
+
+        bundle.stop()
+        self.assertEqual(bundle.get_state(), Bundle.RESOLVED)
+        self.assertIsNone(self.context.get_service_reference(LAZY_SPEC))
+        self.assertIsNone(bundle.get_module())
+
+        # Restart the bundle, then stop the framework
+        bundle.start()
+        self.assertEqual(bundle.get_state(), Bundle.STARTING)
+        self.framework.stop()
+        self.assertEqual(bundle.get_state(), Bundle.RESOLVED)
+        self.assertNotIn(LAZY_BUNDLE, sys.modules)
+
+        # Lazy start with the framework
+        self.framework.start()
+        self.assertEqual(bundle.get_state(), Bundle.STARTING)
+        bundle.uninstall()
+        self.assertEqual(bundle.get_state(), Bundle.UNINSTALLED)
+        self.assertIsNone(self.context.get_service_reference(LAZY_SPEC))
+        self.assertNotIn(LAZY_BUNDLE, sys.modules)
+
     def testUninstallWithStartStop(self):
         """
         Tests if a bundle is correctly uninstalled and if it is really
@@ -13,8 +13,11 @@ from tests.interfaces import IEchoService
 # Pelix
 from pelix.framework import FrameworkFactory, Bundle, BundleException, \
     BundleContext, BundleEvent, ServiceEvent
+import pelix.constants
 
 # Standard library
+import threading
+
 try:
     import unittest2 as unittest
 except ImportError:
@@ -368,6 +371,406 @@ class ServiceEventTest(unittest.TestCase):
         # Unregister from events
         context.remove_service_listener(self)
 
+
+class _Recorder(object):
+    """
+    Service listener recording the kinds of events it receives
+    """
+    def __init__(self):
+        """
+        Sets up members
+        """
+        self.received = []
+
+    def service_changed(self, event):
+        """
+        Stores the kind of the event
+        """
+        self.received.append(event.get_kind())
+
+    def pop(self):
+        """
+        Returns and clears the received events
+        """
+        received = self.received[:]
+        del self.received[:]
+        return received
+
+
+class ServiceListenerIndexTest(unittest.TestCase):
+    """
+    Tests the dispatch of service events to listeners indexed by the terms
+    of their filter
+    """
+    def setUp(self):
+        """
+        Called before each test. Initiates a framework.
+        """
+        self.framework = FrameworkFactory.get_framework()
+        self.framework.start()
+        self.context = self.framework.get_bundle_context()
+
+    def tearDown(self):
+        """
+        Called after each test
+        """
+        self.framework.stop()
+        FrameworkFactory.delete_framework()
+
+    def testTerms(self):
+        """
+        Tests listeners with equality terms in their filter
+        """
+        tenant_1 = _Recorder()
+        tenant_2 = _Recorder()
+        tenant_1_bis = _Recorder()
+        any_tenant = _Recorder()
+        no_spec = _Recorder()
+        other_spec = _Recorder()
+
+        context = self.context
+        context.add_service_listener(tenant_1, "(tenant=1)", "spec")
+        context.add_service_listener(tenant_2, "(&(tenant=2)(test=*))",
+                                     "spec")
+        context.add_service_listener(tenant_1_bis, "(|(tenant=1)(a=b))",
+                                     "spec")
+        context.add_service_listener(any_tenant, "(tenant=*)", "spec")
+        context.add_service_listener(
+            no_spec, "(&(objectClass=spec)(tenant=1))")
+        context.add_service_listener(other_spec, "(tenant=1)", "other")
+
+        # Registration
+        reg = context.register_service("spec", object(),
+                                       {"tenant": 1, "test": True})
+        for listener in (tenant_1, tenant_1_bis, any_tenant, no_spec):
+            self.assertEqual(listener.pop(), [ServiceEvent.REGISTERED])
+        for listener in (tenant_2, other_spec):
+            self.assertEqual(listener.pop(), [])
+
+        # Modification: end of match and new match
+        reg.set_properties({"tenant": 2})
+        for listener in (tenant_1, tenant_1_bis, no_spec):
+            self.assertEqual(listener.pop(), [ServiceEvent.MODIFIED_ENDMATCH])
+        for listener in (tenant_2, any_tenant):
+            self.assertEqual(listener.pop(), [ServiceEvent.MODIFIED])
+        self.assertEqual(other_spec.pop(), [])
+
+        # Properties as lists
+        reg.set_properties({"tenant": [1, 3]})
+        for listener in (tenant_1, tenant_1_bis, no_spec, any_tenant):
+            self.assertEqual(listener.pop(), [ServiceEvent.MODIFIED])
+        self.assertEqual(tenant_2.pop(), [ServiceEvent.MODIFIED_ENDMATCH])
+
+        # Remove a listener
+        self.assertTrue(context.remove_service_listener(tenant_1))
+        self.assertFalse(context.remove_service_listener(tenant_1))
+
+        reg.unregister()
+        self.assertEqual(tenant_1.pop(), [])
+        for listener in (tenant_1_bis, no_spec, any_tenant):
+            self.assertEqual(listener.pop(), [ServiceEvent.UNREGISTERING])
+        for listener in (tenant_2, other_spec):
+            self.assertEqual(listener.pop(), [])
+
+    def testSharedFilters(self):
+        """
+        Listeners with equivalent filters get the same events
+        """
+        import pelix.ldapfilter
+
+        listeners = [_Recorder() for _ in range(10)]
+        for listener in listeners:
+            # Different, but equivalent, filter objects
+            ldap_filter = pelix.ldapfilter.combine_filters(
+                ["(objectClass=spec)", "(test=*)"])
+            self.context.add_service_listener(listener, ldap_filter, "spec")
+
+        # Equivalent criterion with a non-parsed comparator
+        special = _Recorder()
+        self.context.add_service_listener(
+            special, pelix.ldapfilter.LDAPCriteria(
+                "test", "*", pelix.ldapfilter._comparator_eq), "spec")
+
+        reg = self.context.register_service("spec", object(), {"test": 1})
+        for listener in listeners:
+            self.assertEqual(listener.pop(), [ServiceEvent.REGISTERED])
+        self.assertEqual(special.pop(), [])
+
+        reg.set_properties({"test": "*"})
+        for listener in listeners:
+            self.assertEqual(listener.pop(), [ServiceEvent.MODIFIED])
+        self.assertEqual(special.pop(), [ServiceEvent.MODIFIED])
+
+        reg.set_properties({"test": ""})
+        for listener in listeners:
+            self.assertEqual(listener.pop(), [ServiceEvent.MODIFIED_ENDMATCH])
+        self.assertEqual(special.pop(), [ServiceEvent.MODIFIED_ENDMATCH])
+        reg.unregister()
+
+
+class _BatchRecorder(object):
+    """
+    Service listener recording the batches of events it receives
+    """
+    def __init__(self):
+        """
+        Sets up members
+        """
+        self.batches = []
+
+    def service_changed(self, event):
+        """
+        Stores a single event as a batch
+        """
+        self.batches.append([event])
+
+    def services_changed(self, events):
+        """
+        Stores a batch of events
+        """
+        self.batches.append(list(events))
+
+
+class BulkServicesTest(unittest.TestCase):
+    """
+    Tests the bulk registration and unregistration of services
+    """
+    def setUp(self):
+        """
+        Called before each test. Initiates a framework.
+        """
+        self.framework = FrameworkFactory.get_framework()
+        self.framework.start()
+        self.context = self.framework.get_bundle_context()
+
+    def tearDown(self):
+        """
+        Called after each test
+        """
+        self.framework.stop()
+        FrameworkFactory.delete_framework()
+
+    def testBulk(self):
+        """
+        Tests the registration and unregistration of services at once
+        """
+        context = self.context
+        recorder = _Recorder()
+        batch = _BatchRecorder()
+        filtered = _BatchRecorder()
+        self.assertTrue(context.add_service_listener(recorder))
+        self.assertTrue(context.add_service_listener(batch))
+        self.assertTrue(context.add_service_listener(
+            filtered, "(id=1)", IEchoService.__name__))
+
+        services = [object() for _ in range(3)]
+        regs = context.register_services(
+            [(IEchoService, svc, {"id": idx})
+             for idx, svc in enumerate(services)])
+        self.assertEqual(len(regs), 3)
+
+        # Registrations are given in order and are usable
+        for idx, (reg, svc) in enumerate(zip(regs, services)):
+            ref = reg.get_reference()
+            self.assertEqual(ref.get_property("id"), idx)
+            self.assertIs(context.get_service(ref), svc)
+            context.unget_service(ref)
+
+        self.assertEqual(
+            context.get_all_service_references(IEchoService),
+            [reg.get_reference() for reg in regs])
+        self.assertEqual(
+            len(self.framework.get_registered_services()), 3)
+
+        # Normal listener: one call per event
+        self.assertEqual(recorder.pop(), [ServiceEvent.REGISTERED] * 3)
+
+        # Batch listeners: a single call, in registration order
+        self.assertEqual(len(batch.batches), 1)
+        self.assertEqual([event.get_service_reference()
+                          for event in batch.batches[0]],
+                         [reg.get_reference() for reg in regs])
+        self.assertEqual(len(filtered.batches), 1)
+        self.assertEqual([event.get_service_reference()
+                          for event in filtered.batches[0]],
+                         [regs[1].get_reference()])
+        del batch.batches[:]
+        del filtered.batches[:]
+
+        # Unregister two of them
+        self.assertTrue(context.unregister_services(regs[:2]))
+        self.assertEqual(recorder.pop(), [ServiceEvent.UNREGISTERING] * 2)
+        self.assertEqual(len(batch.batches), 1)
+        self.assertEqual([event.get_kind() for event in batch.batches[0]],
+                         [ServiceEvent.UNREGISTERING] * 2)
+        self.assertEqual(len(filtered.batches), 1)
+        self.assertEqual(
+            context.get_all_service_references(IEchoService),
+            [regs[2].get_reference()])
+        self.assertEqual(
+            self.framework.get_registered_services(),
+            [regs[2].get_reference()])
+
+        # Unknown or duplicated registrations: nothing is unregistered
+        self.assertRaises(BundleException,
+                          context.unregister_services, regs)
+        self.assertRaises(BundleException,
+                          context.unregister_services, [regs[2], regs[2]])
+        self.assertEqual(
+            context.get_all_service_references(IEchoService),
+            [regs[2].get_reference()])
+
+        # Invalid registration: nothing is registered
+        self.assertRaises(BundleException, context.register_services,
+                          [(IEchoService, object(), None),
+                           (None, object(), None)])
+        self.assertEqual(
+            len(context.get_all_service_references(IEchoService)), 1)
+        self.assertEqual(recorder.pop(), [])
+
+        # No event
+        regs = context.register_services(
+            [(IEchoService, object(), None)], send_event=False)
+        self.assertEqual(recorder.pop(), [])
+        self.assertEqual(
+            len(context.get_all_service_references(IEchoService)), 2)
+
+        # Empty lists
+        self.assertEqual(context.register_services([]), [])
+        self.assertTrue(context.unregister_services([]))
+
+
+class _BlockingRecorder(_Recorder):
+    """
+    Service listener blocking until it is released
+    """
+    def __init__(self):
+        """
+        Sets up members
+        """
+        _Recorder.__init__(self)
+        self.release = threading.Event()
+        self.threads = set()
+
+    def service_changed(self, event):
+        """
+        Waits to be released then stores the kind of the event
+        """
+        self.release.wait()
+        self.threads.add(threading.current_thread())
+        _Recorder.service_changed(self, event)
+
+
+class AsyncServiceEventsTest(unittest.TestCase):
+    """
+    Tests the asynchronous delivery of service events
+    """
+    def setUp(self):
+        """
+        Called before each test. Initiates a framework.
+        """
+        self.framework = FrameworkFactory.get_framework(
+            {pelix.constants.SERVICE_EVENTS_ASYNC: "true",
+             pelix.constants.SERVICE_EVENTS_QUEUE_SIZE: 2})
+        self.framework.start()
+        self.context = self.framework.get_bundle_context()
+
+    def tearDown(self):
+        """
+        Called after each test
+        """
+        self.framework.stop()
+        FrameworkFactory.delete_framework()
+
+    def testOrder(self):
+        """
+        Tests the delivery of events in order, outside the firing thread
+        """
+        context = self.context
+        slow = _BlockingRecorder()
+        normal = _Recorder()
+        self.assertTrue(context.add_service_listener(slow, asynchronous=True))
+        self.assertTrue(context.add_service_listener(normal))
+
+        # The slow listener doesn't block the registration
+        reg = context.register_service(IEchoService, object(), {"a": 1})
+        self.assertEqual(normal.pop(), [ServiceEvent.REGISTERED])
+        self.assertFalse(context.flush_service_events(.1))
+
+        slow.release.set()
+        reg.set_properties({"a": 2})
+        reg.unregister()
+        self.assertTrue(context.flush_service_events(5))
+        self.assertEqual(normal.pop(), [ServiceEvent.MODIFIED,
+                                        ServiceEvent.UNREGISTERING])
+        self.assertEqual(slow.pop(), [ServiceEvent.REGISTERED,
+                                      ServiceEvent.MODIFIED,
+                                      ServiceEvent.UNREGISTERING])
+        self.assertNotIn(threading.current_thread(), slow.threads)
+
+    def testBoundedQueue(self):
+        """
+        Tests the firing thread waits while the queue of a listener is full
+        """
+        context = self.context
+        slow = _BlockingRecorder()
+        context.add_service_listener(slow, asynchronous=True)
+
+        # First event is being delivered, two are queued
+        regs = [context.register_service(IEchoService, object(), {})
+                for _ in range(3)]
+
+        # The fourth one waits
+        thread = threading.Thread(
+            target=context.register_service, args=(IEchoService, object(), {}))
+        thread.daemon = True
+        thread.start()
+        thread.join(.2)
+        self.assertTrue(thread.is_alive())
+
+        slow.release.set()
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+        self.assertTrue(context.flush_service_events(5))
+        self.assertEqual(slow.pop(), [ServiceEvent.REGISTERED] * 4)
+        for reg in regs:
+            reg.unregister()
+
+    def testRemove(self):
+        """
+        Tests the pending events are dropped when the listener is removed
+        """
+        context = self.context
+        slow = _BlockingRecorder()
+        context.add_service_listener(slow, asynchronous=True)
+        context.register_service(IEchoService, object(), {})
+        context.register_service(IEchoService, object(), {})
+
+        self.assertTrue(context.remove_service_listener(slow))
+        slow.release.set()
+        self.assertTrue(context.flush_service_events(5))
+        self.assertTrue(len(slow.pop()) <= 1)
+
+    def testSynchronousDefault(self):
+        """
+        Tests the events are delivered synchronously if the framework
+        property is not set
+        """
+        self.framework.stop()
+        FrameworkFactory.delete_framework()
+        self.framework = FrameworkFactory.get_framework()
+        self.framework.start()
+        context = self.framework.get_bundle_context()
+
+        listener = _BlockingRecorder()
+        listener.release.set()
+        context.add_service_listener(listener, asynchronous=True)
+        reg = context.register_service(IEchoService, object(), {})
+        self.assertEqual(listener.pop(), [ServiceEvent.REGISTERED])
+        self.assertEqual(listener.threads, {threading.current_thread()})
+        reg.unregister()
+        self.assertTrue(context.flush_service_events(0))
+
 # ------------------------------------------------------------------------------
 
 
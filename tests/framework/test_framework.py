@@ -12,13 +12,15 @@ from tests import log_on, log_off
 
 # Pelix
 from pelix.framework import FrameworkFactory, Bundle, BundleException, \
-    BundleContext
+    BundleContext, BundleEvent, create_framework
+import pelix.constants
 
 # Standard library
 import os
 import sys
 import threading
 import time
+import types
 
 try:
     import unittest2 as unittest
@@ -45,6 +47,57 @@ def _framework_killer(framework, wait_time):
     framework.stop()
 
 
+class _WaitingActivator(object):
+    """
+    Bundle activator waiting for an event while starting
+    """
+    def __init__(self, started, wait_for=None):
+        """
+        :param started: Event set when the activator starts
+        :param wait_for: Event to wait for before returning (optional)
+        """
+        self.started = started
+        self.wait_for = wait_for
+        self.waited = None
+
+    def start(self, context):
+        """
+        Bundle started
+        """
+        self.started.set()
+        if self.wait_for is not None:
+            self.waited = self.wait_for.wait(5)
+
+    def stop(self, context):
+        """
+        Bundle stopped
+        """
+        pass
+
+
+class _FrameworkCallerActivator(object):
+    """
+    Bundle activator calling the framework while starting
+    """
+    def __init__(self):
+        self.results = None
+
+    def start(self, context):
+        """
+        Bundle started
+        """
+        framework = context.get_framework()
+        self.results = (framework.stop(), framework.start(),
+                        framework.wait_for_stop(1))
+        framework.update()
+
+    def stop(self, context):
+        """
+        Bundle stopped
+        """
+        pass
+
+
 class FrameworkTest(unittest.TestCase):
     """
     Tests the framework factory properties
@@ -389,12 +442,188 @@ class FrameworkTest(unittest.TestCase):
 
         FrameworkFactory.delete_framework()
 
+    def testLdapCacheProperty(self):
+        """
+        Tests the configuration of the LDAP filters cache
+        """
+        import pelix.constants
+        import pelix.ldapfilter
+
+        try:
+            framework = FrameworkFactory.get_framework(
+                {pelix.constants.LDAP_FILTER_CACHE_SIZE: "12"})
+            self.assertEqual(
+                pelix.ldapfilter.get_cache_info()["max_size"], 12)
+            FrameworkFactory.delete_framework()
+
+            # The previous size is restored with the framework deletion
+            self.assertEqual(pelix.ldapfilter.get_cache_info()["max_size"],
+                             pelix.ldapfilter.DEFAULT_CACHE_SIZE)
+
+            # Invalid values are ignored
+            pelix.ldapfilter.set_cache_size(12)
+            framework = FrameworkFactory.get_framework(
+                {pelix.constants.LDAP_FILTER_CACHE_SIZE: "abc"})
+            self.assertEqual(
+                pelix.ldapfilter.get_cache_info()["max_size"], 12)
+            FrameworkFactory.delete_framework(framework)
+            self.assertEqual(
+                pelix.ldapfilter.get_cache_info()["max_size"], 12)
+        finally:
+            pelix.ldapfilter.set_cache_size(
+                pelix.ldapfilter.DEFAULT_CACHE_SIZE)
+
     def framework_stopping(self):
         """
         Called when framework is stopping
         """
         self.stopping = True
 
+    def testParallelStart(self):
+        """
+        Tests the start of bundles by a pool of threads
+        """
+        # name -> (activator, start level, requirements)
+        events = dict((name, threading.Event()) for name in "abcd")
+        modules = {
+            "a": (_WaitingActivator(events["a"], events["c"]), 1, None),
+            "b": (_WaitingActivator(events["b"]), 1, "tests.parallel.a"),
+            "c": (_WaitingActivator(events["c"], events["a"]), 1, ()),
+            "d": (_WaitingActivator(events["d"]), 2, None),
+        }
+        names = []
+        for name, (activator, level, requires) in modules.items():
+            module_name = "tests.parallel." + name
+            module_ = types.ModuleType(module_name)
+            setattr(module_, pelix.constants.ACTIVATOR, activator)
+            setattr(module_, pelix.constants.START_LEVEL, level)
+            setattr(module_, pelix.constants.BUNDLE_REQUIRES, requires)
+            sys.modules[module_name] = module_
+            names.append(module_name)
+
+        framework = create_framework(sorted(names), start_threads=4)
+        received = []
+
+        class Listener(object):
+            @staticmethod
+            def bundle_changed(event):
+                received.append((event.get_kind(),
+                                 event.get_bundle().get_symbolic_name()))
+
+        framework.get_bundle_context().add_bundle_listener(Listener())
+        try:
+            self.assertTrue(framework.start())
+            for bundle in framework.get_bundles():
+                self.assertEqual(bundle.get_state(), Bundle.ACTIVE)
+
+            # A and C have been started at the same time
+            self.assertTrue(modules["a"][0].waited)
+            self.assertTrue(modules["c"][0].waited)
+
+            # B after A, D after the bundles of the first level
+            def index(kind, name):
+                return received.index((kind, "tests.parallel." + name))
+
+            self.assertLess(index(BundleEvent.STARTED, "a"),
+                            index(BundleEvent.STARTING, "b"))
+            for name in "abc":
+                self.assertLess(index(BundleEvent.STARTED, name),
+                                index(BundleEvent.STARTING, "d"))
+        finally:
+            FrameworkFactory.delete_framework()
+
+    def testParallelStartFrameworkCalls(self):
+        """
+        Tests the calls to the framework by activators started by a pool of
+        threads
+        """
+        activator = _FrameworkCallerActivator()
+        names = []
+        for name, module_activator in (("caller", activator),
+                                       ("other", _WaitingActivator(
+                                           threading.Event()))):
+            module_name = "tests.parallel." + name
+            module_ = types.ModuleType(module_name)
+            setattr(module_, pelix.constants.ACTIVATOR, module_activator)
+            sys.modules[module_name] = module_
+            names.append(module_name)
+
+        framework = create_framework(names, start_threads=4)
+        results = []
+        thread = threading.Thread(
+            target=lambda: results.append(framework.start()))
+        thread.daemon = True
+        thread.start()
+        try:
+            # The start must not be blocked by the framework lock
+            thread.join(5)
+            self.assertFalse(thread.is_alive(), "Framework start deadlock")
+            self.assertEqual(results, [True])
+
+            # Calls are ignored while the framework is starting
+            self.assertEqual(activator.results, (False, False, True))
+            self.assertEqual(framework.get_state(), Bundle.ACTIVE)
+            for bundle in framework.get_bundles():
+                self.assertEqual(bundle.get_state(), Bundle.ACTIVE)
+        finally:
+            FrameworkFactory.delete_framework()
+
+    def testParallelStartOutsideStop(self):
+        """
+        Tests a call to stop() from another thread during a parallel start
+        """
+        started = threading.Event()
+        gate = threading.Event()
+        names = []
+        for name, activator in (("slow", _WaitingActivator(started, gate)),
+                                ("other", _WaitingActivator(
+                                    threading.Event()))):
+            module_name = "tests.parallel." + name
+            module_ = types.ModuleType(module_name)
+            setattr(module_, pelix.constants.ACTIVATOR, activator)
+            sys.modules[module_name] = module_
+            names.append(module_name)
+
+        framework = create_framework(names, start_threads=4)
+        start_results = []
+        stop_results = []
+        stopping = threading.Event()
+
+        def stopper():
+            stopping.set()
+            stop_results.append(framework.stop())
+
+        start_thread = threading.Thread(
+            target=lambda: start_results.append(framework.start()))
+        start_thread.daemon = True
+        stop_thread = threading.Thread(target=stopper)
+        stop_thread.daemon = True
+        try:
+            start_thread.start()
+            self.assertTrue(started.wait(5))
+
+            # The stop waits for the end of the start
+            stop_thread.start()
+            self.assertTrue(stopping.wait(5))
+            stop_thread.join(.1)
+            self.assertTrue(stop_thread.is_alive())
+            self.assertEqual(stop_results, [])
+
+            gate.set()
+            start_thread.join(5)
+            stop_thread.join(5)
+            self.assertFalse(start_thread.is_alive())
+            self.assertFalse(stop_thread.is_alive())
+
+            # The stop has been applied once the framework started
+            self.assertEqual(start_results, [True])
+            self.assertEqual(stop_results, [True])
+            for bundle in framework.get_bundles():
+                self.assertEqual(bundle.get_state(), Bundle.RESOLVED)
+        finally:
+            gate.set()
+            FrameworkFactory.delete_framework()
+
     def testStopListener(self):
         """
         Test the framework stop event
@@ -8,13 +8,17 @@ Tests the "install packages" handling.
 
 # Standard library
 import os
+import shutil
+import tempfile
 try:
     import unittest2 as unittest
 except ImportError:
     import unittest
 
 # Pelix
-from pelix.framework import FrameworkFactory, Bundle
+from pelix.constants import FRAMEWORK_MODULES_INDEX
+from pelix.framework import FrameworkFactory, Bundle, ModulesIndex
+import pelix.framework
 
 from tests import log_off, log_on
 
@@ -232,6 +236,103 @@ class PackagesTest(unittest.TestCase):
         self.assertEqual(failed.pop(), "pkg_invalid")
 
 
+class ModulesIndexTest(unittest.TestCase):
+    """
+    Tests the cache of the visited folders
+    """
+    def setUp(self):
+        """
+        Prepares a temporary folder
+        """
+        self.folder = tempfile.mkdtemp()
+        self.index_file = os.path.join(self.folder, "index.json")
+        self.root = os.path.join(self.folder, "root")
+        os.mkdir(self.root)
+        self._touch(os.path.join(self.root, "mod_a.py"))
+        os.mkdir(os.path.join(self.root, "sub"))
+
+    def tearDown(self):
+        """
+        Cleans up the temporary folder
+        """
+        shutil.rmtree(self.folder)
+
+    @staticmethod
+    def _touch(path):
+        """
+        Creates an empty file
+        """
+        with open(path, "w"):
+            pass
+
+    @staticmethod
+    def _age(path, delta=10):
+        """
+        Changes the modification time of a folder, as its precision can be
+        too low to see the changes made during the test
+        """
+        stat = os.stat(path)
+        os.utime(path, (stat.st_atime, stat.st_mtime - delta))
+
+    def test_index(self):
+        """
+        Tests the reuse and the update of the index
+        """
+        index = ModulesIndex(self.index_file)
+        self.assertEqual(index.get_modules(self.root), [("mod_a", False)])
+        self.assertTrue(index.save())
+        self.assertFalse(index.save())
+
+        # A new index reads the file instead of scanning the folder
+        original_scan = pelix.framework._scan_folder
+        try:
+            pelix.framework._scan_folder = None
+            index = ModulesIndex(self.index_file)
+            self.assertEqual(index.get_modules(self.root),
+                             [("mod_a", False)])
+        finally:
+            pelix.framework._scan_folder = original_scan
+
+        # Sub-folder converted to a package
+        sub = os.path.join(self.root, "sub")
+        self._age(sub)
+        self._touch(os.path.join(sub, "__init__.py"))
+        self.assertEqual(index.get_modules(self.root),
+                         [("mod_a", False), ("sub", True)])
+
+        # New module
+        self._age(self.root)
+        self._touch(os.path.join(self.root, "mod_b.py"))
+        self.assertEqual(index.get_modules(self.root),
+                         [("mod_a", False), ("mod_b", False),
+                          ("sub", True)])
+
+    def test_install_package(self):
+        """
+        Tests the use of the index by the framework
+        """
+        vault = os.path.join(
+            os.path.abspath(os.path.dirname(__file__)), "vault", "pkg_ok")
+        expected = None
+        for _ in range(2):
+            framework = FrameworkFactory.get_framework(
+                {FRAMEWORK_MODULES_INDEX: self.index_file})
+            try:
+                framework.start()
+                bundles, failed = framework.install_package(vault, True)
+                self.assertFalse(failed)
+                names = sorted(bundle.get_symbolic_name()
+                               for bundle in bundles)
+                if expected is None:
+                    expected = names
+                    self.assertTrue(os.path.exists(self.index_file))
+                else:
+                    self.assertEqual(names, expected)
+            finally:
+                framework.stop()
+                FrameworkFactory.delete_framework()
+
+
 if __name__ == "__main__":
     # Set logging level
     import logging
@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+# -- Content-Encoding: UTF-8 --
+"""
+Tests the boot profiler
+
+:author: Thomas Calmant
+"""
+
+# Standard library
+import json
+import threading
+import time
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+# Pelix
+from pelix.internals.profiler import BootProfiler
+
+# ------------------------------------------------------------------------------
+
+__version__ = "1.0.0"
+
+# ------------------------------------------------------------------------------
+
+
+class BootProfilerTest(unittest.TestCase):
+    """
+    Tests the boot profiler
+    """
+    def testNesting(self):
+        """
+        Tests the computation of the self time of nested steps
+        """
+        profiler = BootProfiler()
+        outer = profiler.start("activator", "outer")
+        inner = profiler.start("validate", "inner")
+        time.sleep(.1)
+        profiler.stop(inner)
+        profiler.stop(outer)
+        other = profiler.start("activator", "other")
+        profiler.stop(other)
+
+        steps = profiler.get_steps()
+        self.assertEqual([step["name"] for step in steps],
+                         ["outer", "inner", "other"])
+        self.assertEqual(steps[1]["parent"], steps[0]["index"])
+        self.assertIsNone(steps[2]["parent"])
+        self.assertGreaterEqual(steps[0]["duration"], steps[1]["duration"])
+        self.assertLess(steps[0]["self"], .1)
+
+        # Inner step is the most expensive
+        self.assertEqual(profiler.get_top(1)[0]["name"], "inner")
+        self.assertEqual([step["name"]
+                          for step in profiler.get_critical_path()],
+                         ["outer", "inner", "other"])
+
+        # JSON export
+        profile = json.loads(profiler.to_json())
+        self.assertEqual(len(profile["steps"]), 3)
+
+    def testCriticalPathThreads(self):
+        """
+        Tests the computation of the critical path across threads
+        """
+        profiler = BootProfiler()
+        started = threading.Event()
+
+        def slow_step():
+            step = profiler.start("activator", "slow")
+            started.set()
+            time.sleep(.2)
+            profiler.stop(step)
+
+        thread = threading.Thread(target=slow_step)
+        thread.start()
+        started.wait(1)
+
+        # Short step, concurrent to the slow one
+        profiler.stop(profiler.start("activator", "fast"))
+
+        # Step waiting for the slow one
+        thread.join()
+        dependent = profiler.start("activator", "dependent")
+        profiler.stop(profiler.start("validate", "nested"))
+        profiler.stop(dependent)
+
+        self.assertEqual([step["name"]
+                          for step in profiler.get_critical_path()],
+                         ["slow", "dependent", "nested"])
+
+    def testLimit(self):
+        """
+        Tests the maximum number of steps
+        """
+        profiler = BootProfiler(2)
+        for name in ("a", "b", "c"):
+            profiler.stop(profiler.start("import", name))
+
+        self.assertEqual([step["name"] for step in profiler.get_steps()],
+                         ["a", "b"])
+        self.assertEqual(profiler.to_dict()["dropped"], 1)
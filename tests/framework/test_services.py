@@ -12,8 +12,9 @@ from tests.interfaces import IEchoService
 
 # Pelix
 from pelix.framework import FrameworkFactory, Bundle, BundleException, \
-    BundleContext, ServiceReference
+    BundleContext, ServiceEvent, ServiceReference
 import pelix.constants
+import pelix.ldapfilter
 
 # Standard library
 try:
@@ -324,6 +325,44 @@ class ServicesTest(unittest.TestCase):
         self.assertEqual(ref.get_property("test"), 21,
                          "Extra property not updated")
 
+    def testPropertiesView(self):
+        """
+        Tests the read-only snapshot of the service properties
+        """
+        context = self.framework.get_bundle_context()
+        reg = context.register_service("class", self, {"test": 42})
+        ref = reg.get_reference()
+
+        view = ref.get_properties_view()
+        self.assertIs(ref.get_properties_view(), view,
+                      "The view must be shared")
+        self.assertEqual(dict(view), ref.get_properties())
+        self.assertEqual(view["test"], 42)
+
+        # The view can't be modified
+        try:
+            view["test"] = 21
+        except TypeError:
+            pass
+        else:
+            self.fail("The properties view can be modified")
+        self.assertEqual(ref.get_property("test"), 42)
+
+        # Update the properties: the snapshot is replaced
+        reg.set_properties({"test": 21, "other": True})
+        new_view = ref.get_properties_view()
+        self.assertIsNot(new_view, view, "Snapshot not replaced")
+        self.assertEqual(view["test"], 42, "Previous snapshot modified")
+        self.assertNotIn("other", view, "Previous snapshot modified")
+        self.assertEqual(new_view["test"], 21)
+        self.assertTrue(new_view["other"])
+        self.assertEqual(ref.get_property("other"), True)
+        self.assertIn("other", ref.get_property_keys())
+
+        # No update: the snapshot is kept
+        reg.set_properties({"test": 21})
+        self.assertIs(ref.get_properties_view(), new_view)
+
     def testGetAllReferences(self):
         """
         Tests get_all_service_references() method
@@ -406,6 +445,257 @@ class ServicesTest(unittest.TestCase):
         # Try to get it
         self.assertRaises(BundleException, context.get_service, reference)
 
+    def testLookupCache(self):
+        """
+        Tests the generation of the registry and the cache of lookups
+        """
+        context = self.framework.get_bundle_context()
+        registry = self.framework._registry
+
+        generation = registry.get_generation()
+        reg_1 = context.register_service("test", object(), {"a": 1})
+        self.assertEqual(registry.get_generation(), generation + 1)
+
+        # Successive lookups return equal but distinct lists
+        refs = context.get_all_service_references("test", "(a=1)")
+        self.assertEqual(refs, [reg_1.get_reference()])
+        refs.append(None)
+        self.assertEqual(context.get_all_service_references("test", "(a=1)"),
+                         [reg_1.get_reference()])
+        self.assertEqual(registry.get_generation(), generation + 1)
+
+        # Registration
+        reg_2 = context.register_service(
+            "test", object(), {"a": 1, pelix.constants.SERVICE_RANKING: 10})
+        self.assertEqual(registry.get_generation(), generation + 2)
+        self.assertEqual(context.get_all_service_references("test", "(a=1)"),
+                         [reg_2.get_reference(), reg_1.get_reference()])
+        self.assertIs(context.get_service_reference("test", "(a=1)"),
+                      reg_2.get_reference())
+
+        # Modification
+        reg_2.set_properties({"a": 2})
+        self.assertEqual(registry.get_generation(), generation + 3)
+        self.assertEqual(context.get_all_service_references("test", "(a=1)"),
+                         [reg_1.get_reference()])
+        self.assertIs(context.get_service_reference("test", "(a=1)"),
+                      reg_1.get_reference())
+
+        # Unregistration
+        reg_1.unregister()
+        self.assertEqual(registry.get_generation(), generation + 4)
+        self.assertIsNone(context.get_all_service_references("test", "(a=1)"))
+        self.assertIsNone(context.get_service_reference("test", "(a=1)"))
+        self.assertEqual(context.get_all_service_references(None),
+                         [reg_2.get_reference()])
+        reg_2.unregister()
+        self.assertEqual(context.get_all_service_references(None), [])
+
+
+class ServiceChangesTest(unittest.TestCase):
+    """
+    Tests the change feed of the service registry
+    """
+    def setUp(self):
+        """
+        Starts a framework keeping the last 4 changes
+        """
+        self.framework = FrameworkFactory.get_framework(
+            {pelix.constants.REGISTRY_CHANGES_SIZE: 4})
+        self.framework.start()
+        self.context = self.framework.get_bundle_context()
+
+    def tearDown(self):
+        """
+        Called after each test
+        """
+        self.framework.stop()
+        FrameworkFactory.delete_framework()
+
+    def testChanges(self):
+        """
+        Tests the changes returned by the registry
+        """
+        context = self.context
+        generation, changes = context.get_service_changes(0)
+        self.assertEqual(changes, [])
+
+        reg_1 = context.register_service("test", object(), {"a": 1})
+        reg_2 = context.register_service("test", object(), {"a": 2})
+        ref_1 = reg_1.get_reference()
+        ref_2 = reg_2.get_reference()
+
+        new_generation, changes = context.get_service_changes(generation)
+        self.assertEqual(new_generation, generation + 2)
+        self.assertEqual(changes,
+                         [(generation + 1, ServiceEvent.REGISTERED, ref_1),
+                          (generation + 2, ServiceEvent.REGISTERED, ref_2)])
+
+        # Incremental synchronization
+        generation = new_generation
+        reg_1.set_properties({"a": 3})
+        reg_2.unregister()
+        new_generation, changes = context.get_service_changes(generation)
+        self.assertEqual(changes,
+                         [(generation + 1, ServiceEvent.MODIFIED, ref_1),
+                          (generation + 2, ServiceEvent.UNREGISTERING, ref_2)])
+        self.assertEqual(context.get_service_changes(new_generation),
+                         (new_generation, []))
+
+        # Bulk registration: same generation for all services
+        generation = new_generation
+        regs = context.register_services(
+            [("test", object(), None), ("test", object(), None)])
+        new_generation, changes = context.get_service_changes(generation)
+        self.assertEqual(new_generation, generation + 1)
+        self.assertEqual(changes,
+                         [(new_generation, ServiceEvent.REGISTERED,
+                           reg.get_reference()) for reg in regs])
+
+        # Too old or unknown generations
+        self.assertEqual(context.get_service_changes(0),
+                         (new_generation, None))
+        self.assertEqual(context.get_service_changes(new_generation + 1),
+                         (new_generation, None))
+
+        # Changes still kept
+        self.assertEqual(len(context.get_service_changes(
+            new_generation - 2)[1]), 3)
+
+    def testBulkServices(self):
+        """
+        Tests the registration of factories and the one-pass unregistration
+        of a batch of services
+        """
+        context = self.framework.get_bundle_context()
+
+        class Factory(object):
+            def get_service(self, bundle, registration):
+                return bundle
+
+            def unget_service(self, bundle, registration):
+                pass
+
+        regs = context.register_services(
+            [("test", object(), {"a": 1}), ("test", Factory(), {"a": 2}, True),
+             ("other", object(), None, False, False)])
+        refs = [reg.get_reference() for reg in regs]
+        self.assertEqual([ref.is_factory() for ref in refs],
+                         [False, True, False])
+        self.assertIs(context.get_service(refs[1]), context.get_bundle())
+        context.unget_service(refs[1])
+
+        # Unregister part of the batch: a single generation
+        generation = context.get_service_changes(0)[0]
+        self.assertTrue(context.unregister_services(regs[:2]))
+        new_generation, changes = context.get_service_changes(generation)
+        self.assertEqual(new_generation, generation + 1)
+        self.assertEqual(changes,
+                         [(new_generation, ServiceEvent.UNREGISTERING, ref)
+                          for ref in refs[:2]])
+
+        # Specification lists are up to date
+        self.assertIsNone(context.get_all_service_references("test"))
+        self.assertEqual(context.get_all_service_references("other"),
+                         [refs[2]])
+        self.assertTrue(context.unregister_services(regs[2:]))
+        self.assertIsNone(context.get_all_service_references("other"))
+
+
+class ServiceIndexesTest(unittest.TestCase):
+    """
+    Tests the service registry property indexes
+    """
+    def setUp(self):
+        """
+        Starts a framework indexing the "tenant" and "tags" properties
+        """
+        self.framework = FrameworkFactory.get_framework(
+            {pelix.constants.REGISTRY_INDEXED_PROPERTIES: "tenant, tags"})
+        self.framework.start()
+        self.context = self.framework.get_bundle_context()
+
+    def tearDown(self):
+        """
+        Called after each test
+        """
+        self.framework.stop()
+        FrameworkFactory.delete_framework()
+
+    def _check(self, clazz, ldap_filter):
+        """
+        Compares the result of a lookup with a full scan
+        """
+        all_refs = self.context.get_all_service_references(None) or []
+        filter_obj = pelix.ldapfilter.get_ldap_filter(ldap_filter)
+        expected = [ref for ref in all_refs
+                    if (clazz is None
+                        or clazz in ref.get_property(
+                            pelix.constants.OBJECTCLASS))
+                    and filter_obj.matches(ref.get_properties())]
+
+        found = self.context.get_all_service_references(clazz, ldap_filter)
+        self.assertEqual(found, expected or None,
+                         "Invalid result for {0} - {1}"
+                         .format(clazz, ldap_filter))
+
+        # Single result
+        found = self.context.get_service_reference(clazz, ldap_filter)
+        self.assertIs(found, expected[0] if expected else None)
+        return found
+
+    def testLookups(self):
+        """
+        Tests the lookups using the indexes
+        """
+        registrations = []
+        for idx in range(20):
+            props = {"tenant": idx % 4, "tags": ["a", "b{0}".format(idx % 3)],
+                     "other": idx % 2,
+                     pelix.constants.SERVICE_RANKING: idx % 5}
+            specs = ["spec.A"] if idx % 2 else ["spec.A", "spec.B"]
+            registrations.append(
+                self.context.register_service(specs, object(), props))
+
+        filters = ("(tenant=1)", "(tenant=42)", "(tags=b2)",
+                   "(&(tenant=1)(tags=b1))", "(&(tenant=2)(other=0))",
+                   "(|(tenant=1)(tenant=3))", "(|(tenant=1)(other=0))",
+                   "(!(tenant=1))", "(tenant=*)", "(tags=b*)",
+                   "(&(tags=a)(|(tenant=0)(tags=b0)))")
+        for clazz in (None, "spec.A", "spec.B", "spec.C"):
+            for ldap_filter in filters:
+                self._check(clazz, ldap_filter)
+
+        # Update properties
+        registrations[1].set_properties({"tenant": 42})
+        self.assertIs(self._check("spec.A", "(tenant=42)"),
+                      registrations[1].get_reference())
+        self._check(None, "(tenant=1)")
+
+        registrations[2].set_properties({"tags": ["c"]})
+        self._check(None, "(tags=b2)")
+        self.assertIs(self._check(None, "(tags=c)"),
+                      registrations[2].get_reference())
+
+        # Update the ranking
+        registrations[5].set_properties(
+            {pelix.constants.SERVICE_RANKING: 100})
+        self.assertIs(self._check(None, "(tenant=1)"),
+                      registrations[5].get_reference())
+
+        # Unregister services
+        registrations[1].unregister()
+        self._check(None, "(tenant=42)")
+        for registration in registrations[2:10]:
+            registration.unregister()
+
+        for ldap_filter in filters:
+            self._check(None, ldap_filter)
+
+        # Unregistered services are not indexed anymore
+        self.assertIsNone(
+            self.context.get_all_service_references(None, "(tenant=42)"))
+
 # ------------------------------------------------------------------------------
 
 
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# -- Content-Encoding: UTF-8 --
+"""
+Bundle defining component factories with coroutine callbacks, for iPOPO tests
+(Python 3.5+ only)
+
+:author: Thomas Calmant
+"""
+
+# Standard library
+import asyncio
+import threading
+
+# iPOPO
+from pelix.ipopo.decorators import ComponentFactory, Property, Provides, \
+    Validate, Invalidate
+from pelix.ipopo.constants import IPopoEvent
+
+# ------------------------------------------------------------------------------
+
+__version__ = (1, 0, 0)
+
+FACTORY_ASYNC = "ipopo.tests.async"
+FACTORY_ASYNC_ERRONEOUS = "ipopo.tests.async.erroneous"
+SPEC_ASYNC = "ipopo.tests.async.spec"
+
+# ------------------------------------------------------------------------------
+
+
+@ComponentFactory(FACTORY_ASYNC)
+@Provides(SPEC_ASYNC)
+class AsyncComponentFactory(object):
+    """
+    Component with coroutine validation and invalidation callbacks
+    """
+    def __init__(self):
+        """
+        Sets up members
+        """
+        self.states = []
+        self.threads = []
+
+        # Set by the tests to let the validation end
+        self.gate = threading.Event()
+
+        # Set at the end of the invalidation
+        self.invalidated = threading.Event()
+
+    @Validate
+    async def validate(self, context):
+        """
+        Validation: waits for the gate to be opened
+        """
+        self.threads.append(threading.current_thread())
+        while not self.gate.is_set():
+            await asyncio.sleep(.01)
+        self.states.append(IPopoEvent.VALIDATED)
+
+    @Invalidate
+    async def invalidate(self, context):
+        """
+        Invalidation
+        """
+        await asyncio.sleep(0)
+        self.states.append(IPopoEvent.INVALIDATED)
+        self.invalidated.set()
+
+
+@ComponentFactory(FACTORY_ASYNC_ERRONEOUS)
+@Provides(SPEC_ASYNC)
+@Property("raise_exception", "erroneous", True)
+class AsyncErroneousComponentFactory(object):
+    """
+    Component with a coroutine validation callback raising an exception
+    """
+    def __init__(self):
+        """
+        Sets up members
+        """
+        self.raise_exception = True
+
+    @Validate
+    async def validate(self, context):
+        """
+        Validation
+        """
+        await asyncio.sleep(0)
+        if self.raise_exception:
+            raise OSError("Error raised")
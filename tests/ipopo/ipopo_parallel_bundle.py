@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# -- Content-Encoding: UTF-8 --
+"""
+Bundle defining component factories with slow validation callbacks, for the
+tests of the parallel validation of iPOPO
+
+:author: Thomas Calmant
+"""
+
+# Standard library
+import threading
+
+# iPOPO
+from pelix.ipopo.decorators import ComponentFactory, Property, Provides, \
+    Validate, Invalidate
+from pelix.ipopo.constants import IPopoEvent
+
+# ------------------------------------------------------------------------------
+
+__version__ = (1, 0, 0)
+
+FACTORY_SLOW = "ipopo.tests.parallel.slow"
+SPEC_SLOW = "ipopo.tests.parallel.spec"
+
+# ------------------------------------------------------------------------------
+
+
+@ComponentFactory(FACTORY_SLOW)
+@Provides(SPEC_SLOW)
+@Property("raise_exception", "erroneous", False)
+@Property("timeout", "gate.timeout", 5)
+class SlowComponentFactory(object):
+    """
+    Component with a validation callback waiting for the tests
+    """
+    def __init__(self):
+        """
+        Sets up members
+        """
+        self.raise_exception = False
+        self.timeout = 5
+        self.states = []
+        self.threads = []
+
+        # Set by the validation callback when it has been called
+        self.validating = threading.Event()
+
+        # Set by the tests to let the validation end
+        self.gate = threading.Event()
+
+    @Validate
+    def validate(self, context):
+        """
+        Validation: waits for the gate to be opened
+        """
+        self.threads.append(threading.current_thread())
+        self.validating.set()
+        self.gate.wait(self.timeout)
+        if self.raise_exception:
+            raise OSError("Error raised")
+        self.states.append(IPopoEvent.VALIDATED)
+
+    @Invalidate
+    def invalidate(self, context):
+        """
+        Invalidation
+        """
+        self.states.append(IPopoEvent.INVALIDATED)
@@ -0,0 +1,187 @@
+#!/usr/bin/env python
+# -- Content-Encoding: UTF-8 --
+"""
+Tests the coroutine callbacks of iPOPO components
+
+:author: Thomas Calmant
+"""
+
+# Standard library
+import sys
+import threading
+import time
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+# Tests
+from tests.ipopo import install_bundle, install_ipopo
+
+# Pelix
+from pelix.framework import FrameworkFactory
+
+# iPOPO
+from pelix.ipopo.constants import IPopoEvent, IPOPO_CALLBACK_VALIDATE
+from pelix.ipopo.instance import StoredInstance
+
+# ------------------------------------------------------------------------------
+
+__version__ = "1.0.0"
+
+NAME_A = "componentA"
+
+# ------------------------------------------------------------------------------
+
+
+def _wait_for(predicate, timeout=5):
+    """
+    Waits for the given predicate to be True
+    """
+    end = time.time() + timeout
+    while not predicate():
+        if time.time() > end:
+            raise AssertionError("Timeout")
+        time.sleep(.01)
+
+
+@unittest.skipIf(sys.version_info < (3, 5), "Coroutines require Python 3.5+")
+class AsyncCallbacksTest(unittest.TestCase):
+    """
+    Tests the coroutine callbacks of iPOPO components
+    """
+    def setUp(self):
+        """
+        Called before each test. Initiates a framework.
+        """
+        self.framework = FrameworkFactory.get_framework()
+        self.framework.start()
+        self.ipopo = install_ipopo(self.framework)
+        self.module = install_bundle(self.framework,
+                                     "tests.ipopo.ipopo_async_bundle")
+
+    def tearDown(self):
+        """
+        Called after each test
+        """
+        self.framework.stop()
+        FrameworkFactory.delete_framework()
+
+    def _state(self, name):
+        """
+        Returns the state of the given component
+        """
+        return self.ipopo.get_instance_details(name)["state"]
+
+    def testValidate(self):
+        """
+        Tests a coroutine validation callback
+        """
+        context = self.framework.get_bundle_context()
+        component = self.ipopo.instantiate(self.module.FACTORY_ASYNC, NAME_A)
+
+        # The component is validating, without blocking the caller
+        self.assertEqual(self._state(NAME_A), StoredInstance.VALIDATING)
+        self.assertIsNone(
+            context.get_service_reference(self.module.SPEC_ASYNC))
+        self.assertEqual(component.states, [])
+
+        # Let the coroutine end
+        component.gate.set()
+        _wait_for(lambda: self._state(NAME_A) == StoredInstance.VALID)
+        self.assertEqual(component.states, [IPopoEvent.VALIDATED])
+        self.assertIsNot(component.threads[0], threading.current_thread())
+
+        # The service has been registered
+        self.assertIsNotNone(
+            context.get_service_reference(self.module.SPEC_ASYNC))
+
+        # Coroutine invalidation callback
+        self.ipopo.invalidate(NAME_A)
+        self.assertIsNone(
+            context.get_service_reference(self.module.SPEC_ASYNC))
+        self.assertTrue(component.invalidated.wait(5))
+        self.assertEqual(component.states, [IPopoEvent.VALIDATED,
+                                            IPopoEvent.INVALIDATED])
+
+    def testValidateStatistics(self):
+        """
+        The duration of a coroutine validation callback lasts until the end
+        of its coroutine
+        """
+        component = self.ipopo.instantiate(self.module.FACTORY_ASYNC, NAME_A)
+        stats = self.ipopo.get_instance_statistics(NAME_A)
+        self.assertNotIn(IPOPO_CALLBACK_VALIDATE, stats["callbacks"])
+
+        # Let the coroutine run for a while
+        time.sleep(.2)
+        component.gate.set()
+        _wait_for(lambda: self._state(NAME_A) == StoredInstance.VALID)
+
+        entry = self.ipopo.get_instance_statistics(NAME_A)["callbacks"][
+            IPOPO_CALLBACK_VALIDATE]
+        self.assertEqual(entry["calls"], 1)
+        self.assertGreaterEqual(entry["max"], .2)
+
+    def testErroneous(self):
+        """
+        Tests a coroutine validation callback raising an exception
+        """
+        context = self.framework.get_bundle_context()
+        self.ipopo.instantiate(self.module.FACTORY_ASYNC_ERRONEOUS, NAME_A)
+        _wait_for(lambda: self._state(NAME_A) == StoredInstance.ERRONEOUS)
+
+        details = self.ipopo.get_instance_details(NAME_A)
+        self.assertIn("OSError", details["error_trace"])
+        self.assertIsNone(
+            context.get_service_reference(self.module.SPEC_ASYNC))
+
+        # Retry without error
+        self.assertEqual(
+            self.ipopo.retry_erroneous(NAME_A, {"erroneous": False}),
+            StoredInstance.VALIDATING)
+        _wait_for(lambda: self._state(NAME_A) == StoredInstance.VALID)
+        self.assertIsNotNone(
+            context.get_service_reference(self.module.SPEC_ASYNC))
+
+    def testKillValidating(self):
+        """
+        Tests the kill of a component during its validation
+        """
+        context = self.framework.get_bundle_context()
+        component = self.ipopo.instantiate(self.module.FACTORY_ASYNC, NAME_A)
+        self.assertEqual(self._state(NAME_A), StoredInstance.VALIDATING)
+
+        # Wait for the coroutine to start
+        _wait_for(lambda: component.threads)
+        self.ipopo.kill(NAME_A)
+        self.assertFalse(self.ipopo.is_registered_instance(NAME_A))
+
+        # The end of the coroutine has no effect
+        component.gate.set()
+        time.sleep(.1)
+        self.assertEqual(component.states, [])
+        self.assertIsNone(
+            context.get_service_reference(self.module.SPEC_ASYNC))
+
+    def testStopFramework(self):
+        """
+        Tests the stop of the framework while a component is validating
+        """
+        component = self.ipopo.instantiate(self.module.FACTORY_ASYNC, NAME_A)
+        _wait_for(lambda: component.threads)
+        self.framework.stop()
+        self.assertEqual(component.states, [])
+
+        # No thread left
+        self.assertFalse([thread for thread in threading.enumerate()
+                          if thread.name == "ipopo-asyncio"])
+
+
+if __name__ == "__main__":
+    # Set logging level
+    import logging
+    logging.basicConfig(level=logging.DEBUG)
+
+    unittest.main()
@@ -11,10 +11,22 @@ from tests.ipopo import install_bundle, install_ipopo
 
 # Pelix
 from pelix.framework import FrameworkFactory
+from pelix.ipopo.contexts import FactoryContext, Requirement
+from pelix.ipopo.instance import get_implemented_hooks, _get_dispatch_table, \
+    StoredInstance
+import pelix.ipopo.decorators as decorators
 import pelix.ipopo.handlers.constants as constants
+import pelix.ipopo.handlers.properties as properties
+import pelix.ipopo.handlers.provides as provides
+import pelix.ipopo.handlers.requires as requires
+import pelix.ipopo.handlers.requiresbest as requiresbest
+import pelix.ipopo.handlers.requiresmap as requiresmap
+import pelix.ipopo.handlers.temporal as temporal
 
 # Standard library
+import gc
 import sys
+import weakref
 try:
     import unittest2 as unittest
 except ImportError:
@@ -36,6 +48,12 @@ HANDLER_ID = "sample.handler.logger"
 # Name of the component instantiated in samples.handler.sample
 COMPONENT_NAME = "sample-logger-component"
 
+# ID of the handler of the validity switch test
+SWITCH_HANDLER_ID = "test.handler.switch"
+
+# Factory of the component with a validity switch
+SWITCH_FACTORY = "test-switch-factory"
+
 # ------------------------------------------------------------------------------
 
 
@@ -56,6 +74,164 @@ class DummyHandlerFactory(object):
         self.called = True
         return []
 
+
+class SwitchDependency(constants.DependencyHandler):
+    """
+    A dependency handler whose validity is changed by the test
+    """
+    def __init__(self):
+        self.valid = False
+        self.stored_instance = None
+
+    def manipulate(self, stored_instance, component_instance):
+        self.stored_instance = stored_instance
+
+    def get_kinds(self):
+        return (constants.KIND_DEPENDENCY,)
+
+    def is_valid(self):
+        return self.valid
+
+    def get_field(self):
+        return None
+
+    def try_binding(self):
+        pass
+
+    def get_bindings(self):
+        return []
+
+    def get_value(self):
+        return None
+
+
+class SwitchHandlerFactory(constants.HandlerFactory):
+    """
+    Creates the validity switch handlers
+    """
+    def __init__(self):
+        self.handlers = []
+
+    def get_handlers(self, component_context, instance):
+        handler = SwitchDependency()
+        self.handlers.append(handler)
+        return [handler]
+
+
+def _switch(clazz):
+    """
+    Configures the validity switch handler in a component factory
+    """
+    decorators.get_factory_context(clazz).set_handler(SWITCH_HANDLER_ID,
+                                                      True)
+    return clazz
+
+
+@decorators.ComponentFactory(SWITCH_FACTORY)
+@_switch
+class SwitchedComponent(object):
+    """
+    A component with a validity switch dependency
+    """
+    pass
+
+
+class PartialHandler(constants.Handler):
+    """
+    A handler implementing only some hooks
+    """
+    def is_valid(self):
+        return False
+
+    def on_hidden_property_change(self, name, old_value, new_value):
+        pass
+
+
+class DuckHandler(object):
+    """
+    A handler which doesn't inherit from the base handler class
+    """
+    def get_kinds(self):
+        return None
+
+    def start(self):
+        pass
+
+# ------------------------------------------------------------------------------
+
+
+class HandlerClassesTest(unittest.TestCase):
+    """
+    Tests the handler classes
+    """
+    def testImplementedHooks(self):
+        """
+        Only the overridden hooks must be called
+        """
+        self.assertEqual(get_implemented_hooks(constants.Handler), ())
+        self.assertEqual(get_implemented_hooks(constants.DependencyHandler),
+                         ())
+        self.assertEqual(get_implemented_hooks(PartialHandler),
+                         ('is_valid', 'on_hidden_property_change'))
+        self.assertEqual(get_implemented_hooks(DuckHandler), ('start',))
+
+        # Computed once per class
+        self.assertIs(get_implemented_hooks(PartialHandler),
+                      get_implemented_hooks(PartialHandler))
+
+        # ... without keeping the class alive
+        handler_class = type("TemporaryHandler", (PartialHandler,),
+                             {"start": lambda self: None})
+        self.assertEqual(get_implemented_hooks(handler_class),
+                         ('is_valid', 'on_hidden_property_change', 'start'))
+        class_ref = weakref.ref(handler_class)
+        del handler_class
+        gc.collect()
+        self.assertIsNone(class_ref())
+
+    def testDispatchTables(self):
+        """
+        Dispatch tables are stored in the factory context
+        """
+        composition = ((PartialHandler, False), (DuckHandler, True))
+        context = FactoryContext()
+        table = _get_dispatch_table(context, composition)
+        self.assertEqual(
+            sorted(table),
+            ['is_valid', 'on_hidden_property_change', 'start'])
+        self.assertEqual([idx for idx, _ in table['start']], [1])
+        self.assertIs(context.get_dispatch_tables()[composition], table)
+        self.assertIs(_get_dispatch_table(context, composition), table)
+
+        # Dependency handlers are not checked with is_valid()
+        table = _get_dispatch_table(context, ((PartialHandler, True),))
+        self.assertNotIn('is_valid', table)
+
+        # Not shared with other factories
+        other = FactoryContext()
+        self.assertEqual(other.get_dispatch_tables(), {})
+        self.assertIsNot(_get_dispatch_table(other, composition),
+                         context.get_dispatch_tables()[composition])
+
+    def testSlots(self):
+        """
+        The core handlers must not have a __dict__
+        """
+        requirement = Requirement("spec")
+        for handler in (
+                properties.PropertiesHandler(),
+                provides.ServiceRegistrationHandler(("spec",), None, False),
+                requires.SimpleDependency("field", requirement),
+                requires.AggregateDependency("field", requirement),
+                requiresbest.BestDependency("field", requirement),
+                requiresmap.SimpleDependency("field", requirement, "key",
+                                             False),
+                requiresmap.AggregateDependency("field", requirement, "key",
+                                                False),
+                temporal.TemporalDependency("field", requirement, 1)):
+            self.assertFalse(hasattr(handler, "__dict__"),
+                             "{0} has a __dict__".format(type(handler)))
+
 # ------------------------------------------------------------------------------
 
 
@@ -136,6 +312,49 @@ class LifeCycleTest(unittest.TestCase):
         # Remove the handler
         self.framework.get_bundle_by_name(HANDLER_BUNDLE_NAME).stop()
 
+    def testCustomDependencyValidity(self):
+        """
+        Tests a custom dependency handler changing its own validity
+        """
+        ipopo = install_ipopo(self.framework)
+        context = self.framework.get_bundle_context()
+        factory = SwitchHandlerFactory()
+        svc_reg = context.register_service(
+            constants.SERVICE_IPOPO_HANDLER_FACTORY, factory,
+            {constants.PROP_HANDLER_ID: SWITCH_HANDLER_ID})
+        ipopo.register_factory(context, SwitchedComponent)
+        ipopo.instantiate(SWITCH_FACTORY, "switched")
+
+        handler = factory.handlers[-1]
+        stored_instance = handler.stored_instance
+
+        def get_state():
+            return stored_instance.state
+
+        self.assertEqual(get_state(), StoredInstance.INVALID)
+
+        # Validity pushed by the handler
+        handler.valid = True
+        stored_instance.dependency_validity_changed(handler)
+        self.assertEqual(get_state(), StoredInstance.VALID)
+
+        handler.valid = False
+        stored_instance.dependency_validity_changed(handler)
+        self.assertEqual(get_state(), StoredInstance.INVALID)
+
+        # Validity polled by check_lifecycle()
+        handler.valid = True
+        stored_instance.check_lifecycle()
+        self.assertEqual(get_state(), StoredInstance.VALID)
+
+        handler.valid = False
+        stored_instance.check_lifecycle()
+        self.assertEqual(get_state(), StoredInstance.INVALID)
+
+        ipopo.kill("switched")
+        ipopo.unregister_factory(SWITCH_FACTORY)
+        svc_reg.unregister()
+
     def testWaitingFactoryDetails(self):
         """
         Tests the "handlers" entry of factory details dictionary
@@ -9,6 +9,7 @@ Tests the iPOPO core service.
 # Tests
 from tests import log_on, log_off
 from tests.ipopo import install_bundle, install_ipopo
+from tests.interfaces import IEchoService
 from tests.ipopo.ipopo_bundle import BASIC_INSTANCE
 
 # Pelix
@@ -251,6 +252,76 @@ class IPopoServiceTest(unittest.TestCase):
                           INSTANCE)
         log_on()
 
+    def test_instantiate_many(self):
+        """
+        Tests the instantiate_many method
+        """
+        module = install_bundle(self.framework)
+
+        # Invalid parameters: nothing is instantiated
+        for components in (
+                [(module.FACTORY_A, "a", None), (module.FACTORY_A, "a", None)],
+                [(module.FACTORY_A, "a", None), (None, "b", None)],
+                [(module.FACTORY_A, "a", None), (module.FACTORY_A, "", None)]):
+            self.assertRaises(ValueError, self.ipopo.instantiate_many,
+                              components)
+            self.assertFalse(self.ipopo.is_registered_instance("a"))
+
+        self.assertRaises(TypeError, self.ipopo.instantiate_many,
+                          [(module.FACTORY_A, "a", None),
+                           ("unknown-factory", "b", None)])
+        self.assertFalse(self.ipopo.is_registered_instance("a"))
+
+        # Listener of the batches of service events
+        class BatchListener(object):
+            """
+            Records the batches of service events
+            """
+            def __init__(self):
+                self.batches = []
+
+            def service_changed(self, event):
+                self.batches.append([event])
+
+            def services_changed(self, events):
+                self.batches.append(list(events))
+
+        listener = BatchListener()
+        context = self.framework.get_bundle_context()
+        context.add_service_listener(listener, None, IEchoService.__name__)
+
+        # Consumers are given first
+        compo_c, compo_b, compo_a1, compo_a2 = self.ipopo.instantiate_many(
+            [(module.FACTORY_C, "c", None),
+             (module.FACTORY_B, "b", None),
+             (module.FACTORY_A, "a1", {"prop.1": 1}),
+             (module.FACTORY_A, "a2", None)])
+        self.assertEqual(compo_a1.prop_1, 1)
+
+        # Providers have been started first: consumers are bound before
+        # being validated
+        self.assertEqual(compo_c.states[:3],
+                         [IPopoEvent.INSTANTIATED, IPopoEvent.BOUND,
+                          IPopoEvent.VALIDATED])
+        self.assertEqual(compo_c.states.count(IPopoEvent.BOUND), 2)
+        self.assertEqual(compo_b.states,
+                         [IPopoEvent.INSTANTIATED, IPopoEvent.BOUND,
+                          IPopoEvent.VALIDATED])
+        self.assertEqual(len(compo_c.services), 2)
+        self.assertIn(compo_a1, compo_c.services)
+        self.assertIn(compo_a2, compo_c.services)
+
+        # The services of the providers have been registered at once
+        self.assertEqual(len(listener.batches), 1)
+        self.assertEqual(
+            set(event.get_service_reference() for event in listener.batches[0]),
+            set(context.get_all_service_references(IEchoService)))
+        context.remove_service_listener(listener)
+
+        # Names are still checked against running instances
+        self.assertRaises(ValueError, self.ipopo.instantiate_many,
+                          [(module.FACTORY_A, "a1", None)])
+
     def test_ipopo_events(self):
         """
         Tests iPOPO event listener
@@ -0,0 +1,219 @@
+#!/usr/bin/env python
+# -- Content-Encoding: UTF-8 --
+"""
+Tests the parallel validation of iPOPO components
+
+:author: Thomas Calmant
+"""
+
+# Standard library
+import threading
+import time
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+# Tests
+from tests.ipopo import install_bundle, install_ipopo
+
+# Pelix
+from pelix.framework import FrameworkFactory
+
+# iPOPO
+from pelix.ipopo.constants import IPopoEvent, IPOPO_CALLBACK_VALIDATE, \
+    IPOPO_PARALLEL_VALIDATION
+from pelix.ipopo.instance import StoredInstance
+
+# ------------------------------------------------------------------------------
+
+__version__ = "1.0.0"
+
+NAME_A = "componentA"
+
+# ------------------------------------------------------------------------------
+
+
+def _wait_for(predicate, timeout=5):
+    """
+    Waits for the given predicate to be True
+    """
+    end = time.time() + timeout
+    while not predicate():
+        if time.time() > end:
+            raise AssertionError("Timeout")
+        time.sleep(.01)
+
+
+class ParallelValidationTest(unittest.TestCase):
+    """
+    Tests the parallel validation of iPOPO components
+    """
+    def setUp(self):
+        """
+        Called before each test. Initiates a framework.
+        """
+        self.framework = None
+        self.ipopo = None
+        self.module = None
+
+    def tearDown(self):
+        """
+        Called after each test
+        """
+        if self.framework is not None:
+            self.framework.stop()
+            FrameworkFactory.delete_framework()
+
+    def _start(self, properties=None):
+        """
+        Starts the framework with iPOPO and the test bundle
+        """
+        self.framework = FrameworkFactory.get_framework(properties)
+        self.framework.start()
+        self.ipopo = install_ipopo(self.framework)
+        self.module = install_bundle(self.framework,
+                                     "tests.ipopo.ipopo_parallel_bundle")
+
+    def _state(self, name):
+        """
+        Returns the state of the given component
+        """
+        return self.ipopo.get_instance_details(name)["state"]
+
+    def _count_services(self):
+        """
+        Returns the number of registered test services
+        """
+        context = self.framework.get_bundle_context()
+        return len(context.get_all_service_references(
+            self.module.SPEC_SLOW) or [])
+
+    def testSequential(self):
+        """
+        Tests the default, sequential, validation
+        """
+        self._start()
+
+        # Without the property, the callback is called by the caller thread
+        component = self.ipopo.instantiate(self.module.FACTORY_SLOW, NAME_A,
+                                           {"gate.timeout": 0})
+        self.assertFalse(component.gate.is_set())
+        self.assertEqual(component.threads, [threading.current_thread()])
+        self.assertEqual(self._state(NAME_A), StoredInstance.VALID)
+
+    def testComponentProperty(self):
+        """
+        Tests the parallel validation of components with the property
+        """
+        self._start()
+        names = ["component-{0}".format(idx) for idx in range(3)]
+        components = [
+            self.ipopo.instantiate(self.module.FACTORY_SLOW, name,
+                                   {IPOPO_PARALLEL_VALIDATION: True})
+            for name in names]
+
+        # The caller isn't blocked and all callbacks run concurrently
+        for component in components:
+            self.assertTrue(component.validating.wait(5))
+            self.assertIsNot(component.threads[0],
+                             threading.current_thread())
+
+        self.assertEqual(
+            len(set(component.threads[0] for component in components)), 3)
+        for name in names:
+            self.assertEqual(self._state(name), StoredInstance.VALIDATING)
+        self.assertEqual(self._count_services(), 0)
+
+        # Services are registered as soon as each validation ends
+        for idx, (name, component) in enumerate(zip(names, components)):
+            component.gate.set()
+            _wait_for(lambda: self._state(name) == StoredInstance.VALID)
+            self.assertEqual(component.states, [IPopoEvent.VALIDATED])
+            self.assertEqual(self._count_services(), idx + 1)
+
+        # Invalidation is still synchronous
+        self.ipopo.invalidate(names[0])
+        self.assertEqual(components[0].states, [IPopoEvent.VALIDATED,
+                                                IPopoEvent.INVALIDATED])
+        self.assertEqual(self._count_services(), 2)
+
+    def testFrameworkProperty(self):
+        """
+        Tests the parallel validation of all components
+        """
+        self._start({IPOPO_PARALLEL_VALIDATION: "true"})
+        component = self.ipopo.instantiate(self.module.FACTORY_SLOW, NAME_A)
+        self.assertTrue(component.validating.wait(5))
+        self.assertIsNot(component.threads[0], threading.current_thread())
+
+        component.gate.set()
+        _wait_for(lambda: self._state(NAME_A) == StoredInstance.VALID)
+
+        # The component property has priority
+        component = self.ipopo.instantiate(
+            self.module.FACTORY_SLOW, "componentB",
+            {IPOPO_PARALLEL_VALIDATION: False, "gate.timeout": 0})
+        self.assertEqual(component.threads, [threading.current_thread()])
+        self.assertEqual(self._state("componentB"), StoredInstance.VALID)
+
+    def testStatistics(self):
+        """
+        Tests the statistics of a parallel validation callback
+        """
+        self._start({IPOPO_PARALLEL_VALIDATION: "true"})
+        component = self.ipopo.instantiate(self.module.FACTORY_SLOW, NAME_A)
+        self.assertTrue(component.validating.wait(5))
+
+        # Let the callback run for a while
+        time.sleep(.2)
+        component.gate.set()
+        _wait_for(lambda: self._state(NAME_A) == StoredInstance.VALID)
+
+        entry = self.ipopo.get_instance_statistics(NAME_A)["callbacks"][
+            IPOPO_CALLBACK_VALIDATE]
+        self.assertEqual(entry["calls"], 1)
+        self.assertGreaterEqual(entry["max"], .2)
+
+    def testErroneous(self):
+        """
+        Tests a parallel validation callback raising an exception
+        """
+        self._start({IPOPO_PARALLEL_VALIDATION: "true"})
+        component = self.ipopo.instantiate(self.module.FACTORY_SLOW, NAME_A,
+                                           {"erroneous": True})
+        component.gate.set()
+        _wait_for(lambda: self._state(NAME_A) == StoredInstance.ERRONEOUS)
+
+        details = self.ipopo.get_instance_details(NAME_A)
+        self.assertIn("OSError", details["error_trace"])
+        self.assertEqual(self._count_services(), 0)
+
+    def testKill(self):
+        """
+        Tests the kill of a component during its parallel validation
+        """
+        self._start({IPOPO_PARALLEL_VALIDATION: "true"})
+        component = self.ipopo.instantiate(self.module.FACTORY_SLOW, NAME_A)
+        self.assertTrue(component.validating.wait(5))
+
+        self.ipopo.kill(NAME_A)
+        self.assertFalse(self.ipopo.is_registered_instance(NAME_A))
+
+        # The component is invalidated once its callback has returned
+        component.gate.set()
+        _wait_for(lambda: len(component.states) == 2)
+        self.assertEqual(component.states, [IPopoEvent.VALIDATED,
+                                            IPopoEvent.INVALIDATED])
+        self.assertEqual(self._count_services(), 0)
+
+# ------------------------------------------------------------------------------
+
+
+if __name__ == "__main__":
+    # Set logging level
+    import logging
+    logging.basicConfig(level=logging.DEBUG)
+
+    unittest.main()
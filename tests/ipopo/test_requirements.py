@@ -12,10 +12,12 @@ from tests.interfaces import IEchoService
 from tests.ipopo import install_bundle, install_ipopo
 
 # Pelix
-from pelix.framework import FrameworkFactory, Bundle
+from pelix.framework import FrameworkFactory, Bundle, BundleException
 
 # iPOPO
 from pelix.ipopo.constants import IPopoEvent
+from pelix.ipopo.decorators import ComponentFactory, Requires, Validate, \
+    Invalidate
 import pelix.ipopo.constants as constants
 
 # Standard library
@@ -32,6 +34,36 @@ NAME_A = "componentA"
 NAME_B = "componentB"
 NAME_C = "componentC"
 
+FACTORY_MULTI = "ipopo.tests.multi"
+SPEC_1 = "spec.multi.1"
+SPEC_2 = "spec.multi.2"
+SPEC_3 = "spec.multi.3"
+
+# ------------------------------------------------------------------------------
+
+
+@ComponentFactory(FACTORY_MULTI)
+@Requires('svc_1', SPEC_1)
+@Requires('svc_2', SPEC_2)
+@Requires('svc_3', SPEC_3, optional=True)
+class MultiRequirementsFactory(object):
+    """
+    Component with many requirements
+    """
+    def __init__(self):
+        self.svc_1 = None
+        self.svc_2 = None
+        self.svc_3 = None
+        self.states = []
+
+    @Validate
+    def validate(self, context):
+        self.states.append(IPopoEvent.VALIDATED)
+
+    @Invalidate
+    def invalidate(self, context):
+        self.states.append(IPopoEvent.INVALIDATED)
+
 # ------------------------------------------------------------------------------
 
 
@@ -288,6 +320,141 @@ class RequirementTest(unittest.TestCase):
         self.assertEqual([IPopoEvent.INVALIDATED], compoC.states,
                          "Invalid component states: {0}".format(compoC.states))
 
+    def testAggregateSnapshot(self):
+        """
+        Tests the immutable snapshots injected by an aggregate dependency
+        """
+        module = install_bundle(self.framework)
+        compoC = self.ipopo.instantiate(module.FACTORY_C, NAME_C)
+        context = self.framework.get_bundle_context()
+
+        # Services are injected in their order of arrival
+        services = [object() for _ in range(5)]
+        registrations = [context.register_service(IEchoService, svc, None)
+                         for svc in services]
+        self.assertEqual(compoC.services, tuple(services))
+
+        # A snapshot kept by the component isn't modified
+        snapshot = compoC.services
+        registrations[2].unregister()
+        self.assertEqual(snapshot, tuple(services))
+        self.assertEqual(compoC.services,
+                         tuple(services[:2] + services[3:]))
+
+        svc = object()
+        context.register_service(IEchoService, svc, None)
+        self.assertEqual(compoC.services,
+                         tuple(services[:2] + services[3:] + [svc]))
+
+    def testSharedListener(self):
+        """
+        Tests the sharing of service listeners by equivalent dependencies
+        """
+        module = install_bundle(self.framework)
+        tracker = self.ipopo._dependency_tracker
+        self.assertEqual(tracker.get_listeners_count(), 0)
+
+        names = ["{0}-{1}".format(NAME_C, idx) for idx in range(3)]
+        components = [self.ipopo.instantiate(module.FACTORY_C, name)
+                      for name in names]
+        self.assertEqual(tracker.get_listeners_count(), 1)
+
+        # All components are notified
+        context = self.framework.get_bundle_context()
+        reg = context.register_service(IEchoService, self, None)
+        for component in components:
+            self.assertEqual(component.services, (self,))
+
+        # The listener is kept until the last dependency is stopped
+        for name in names[:-1]:
+            self.ipopo.kill(name)
+        self.assertEqual(tracker.get_listeners_count(), 1)
+
+        reg.unregister()
+        self.assertIsNone(components[-1].services)
+
+        self.ipopo.kill(names[-1])
+        self.assertEqual(tracker.get_listeners_count(), 0)
+
+    def testSharedListenerError(self):
+        """
+        Tests the isolation of the handlers sharing a service listener
+        """
+        class Handler(object):
+            """
+            Dependency handler recording events
+            """
+            def __init__(self, raise_error):
+                self.raise_error = raise_error
+                self.events = []
+
+            def service_changed(self, event):
+                self.events.append(event)
+                if self.raise_error:
+                    raise BundleException("Error raised")
+
+        handlers = [Handler(True), Handler(False), Handler(True)]
+        tracker = self.ipopo._dependency_tracker
+        for handler in handlers:
+            tracker.add(handler, "tracker.test.spec")
+
+        context = self.framework.get_bundle_context()
+        log_off()
+        try:
+            context.register_service("tracker.test.spec", self, None)
+        finally:
+            log_on()
+
+        # All handlers have been notified
+        for handler in handlers:
+            self.assertEqual(len(handler.events), 1)
+            tracker.remove(handler)
+
+    def testManyRequirements(self):
+        """
+        Tests the validity transitions of a component with many requirements
+        """
+        context = self.framework.get_bundle_context()
+        self.ipopo.register_factory(context, MultiRequirementsFactory)
+        compo = self.ipopo.instantiate(FACTORY_MULTI, NAME_A)
+
+        # Missing requirements
+        self.assertEqual(compo.states, [])
+        reg_1 = context.register_service(SPEC_1, self, None)
+        self.assertEqual(compo.states, [])
+
+        # All mandatory requirements are satisfied
+        reg_2 = context.register_service(SPEC_2, self, None)
+        self.assertEqual(compo.states, [IPopoEvent.VALIDATED])
+        del compo.states[:]
+
+        # Optional requirement: no change
+        reg_3 = context.register_service(SPEC_3, self, None)
+        reg_3.unregister()
+        self.assertEqual(compo.states, [])
+
+        # Lose one requirement, then get a replacement
+        reg_1.unregister()
+        self.assertEqual(compo.states, [IPopoEvent.INVALIDATED])
+        self.assertIsNone(compo.svc_1)
+        del compo.states[:]
+
+        reg_1 = context.register_service(SPEC_1, self, None)
+        self.assertEqual(compo.states, [IPopoEvent.VALIDATED])
+        self.assertIs(compo.svc_1, self)
+        del compo.states[:]
+
+        # Unregistration with a replacement available: immediate rebind
+        reg_1b = context.register_service(SPEC_1, compo, None)
+        reg_1.unregister()
+        self.assertEqual(compo.states, [IPopoEvent.INVALIDATED,
+                                        IPopoEvent.VALIDATED])
+        self.assertIs(compo.svc_1, compo)
+
+        reg_1b.unregister()
+        reg_2.unregister()
+        self.ipopo.kill(NAME_A)
+
     def testAggregateDependencyLate(self):
         """
         Tests a component that aggregates dependencies, with one dependency
@@ -17,6 +17,8 @@ from pelix.framework import FrameworkFactory, BundleContext
 from pelix.constants import SERVICE_RANKING
 
 # Standard library
+import random
+
 try:
     import unittest2 as unittest
 except ImportError:
@@ -193,6 +195,48 @@ class RequiresBestTest(unittest.TestCase):
                              [IPopoEvent.INVALIDATED, IPopoEvent.UNBOUND,
                               IPopoEvent.BOUND, IPopoEvent.VALIDATED])
 
+    def test_ranking_churn(self):
+        """
+        Tests the injection of the best service while the rankings of many
+        services are modified
+        """
+        module = install_bundle(self.framework)
+        context = self.framework.get_bundle_context()
+        consumer = self.ipopo.instantiate(module.FACTORY_REQUIRES_BEST, NAME_A)
+
+        registrations = []
+        for idx in range(20):
+            registrations.append(context.register_service(
+                IEchoService, object(), {SERVICE_RANKING: idx % 7}))
+
+        def check_best():
+            """
+            Checks that the best service of the registry is injected
+            """
+            best_ref = context.get_service_reference(IEchoService)
+            if best_ref is None:
+                self.assertIsNone(consumer.service)
+            else:
+                self.assertIs(consumer.service, context.get_service(best_ref))
+                context.unget_service(best_ref)
+
+        check_best()
+
+        # Modify the rankings, many times
+        rnd = random.Random(42)
+        for _ in range(200):
+            rnd.choice(registrations).set_properties(
+                {SERVICE_RANKING: rnd.randint(-10, 10)})
+            check_best()
+
+        # Remove services: the next best must be injected
+        rnd.shuffle(registrations)
+        for registration in registrations:
+            registration.unregister()
+            check_best()
+
+        self.assertIsNone(consumer.service)
+
 # ------------------------------------------------------------------------------
 
 if __name__ == "__main__":
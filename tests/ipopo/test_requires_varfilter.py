@@ -103,8 +103,8 @@ class RequiresVarFilterTest(unittest.TestCase):
             consumer.reset()
 
         self.assertIs(consumer_single.service, svc1, "Wrong service injected")
-        self.assertListEqual(consumer_multi.service, [svc1],
-                             "Wrong service injected")
+        self.assertTupleEqual(consumer_multi.service, (svc1,),
+                              "Wrong service injected")
 
         # New service, still matching
         svc2 = object()
@@ -122,8 +122,8 @@ class RequiresVarFilterTest(unittest.TestCase):
         self.assertListEqual([IPopoEvent.BOUND], consumer_multi.states,
                              "Invalid component states: {0}"
                              .format(consumer_multi.states))
-        self.assertListEqual(consumer_multi.service, [svc1, svc2],
-                             "Second service not injected")
+        self.assertTupleEqual(consumer_multi.service, (svc1, svc2),
+                              "Second service not injected")
 
         # Reset states
         for consumer in consumers:
@@ -142,8 +142,8 @@ class RequiresVarFilterTest(unittest.TestCase):
         self.assertListEqual([IPopoEvent.UNBOUND], consumer_multi.states,
                              "Invalid component states: {0}"
                              .format(consumer_multi.states))
-        self.assertListEqual(consumer_multi.service, [svc1],
-                             "Second service not removed")
+        self.assertTupleEqual(consumer_multi.service, (svc1,),
+                              "Second service not removed")
 
         # Change the filter property to the exact same value
         for consumer in consumers:
@@ -157,8 +157,8 @@ class RequiresVarFilterTest(unittest.TestCase):
             consumer.reset()
 
         self.assertIs(consumer_single.service, svc1, "Wrong service injected")
-        self.assertListEqual(consumer_multi.service, [svc1],
-                             "Wrong service injected")
+        self.assertTupleEqual(consumer_multi.service, (svc1,),
+                              "Wrong service injected")
 
         # Change the filter property to a new value
         for consumer in consumers:
@@ -202,8 +202,8 @@ class RequiresVarFilterTest(unittest.TestCase):
             consumer.reset()
 
         self.assertIs(consumer_single.service, svc4, "Wrong service injected")
-        self.assertListEqual(consumer_multi.service, [svc4],
-                             "Wrong service injected")
+        self.assertTupleEqual(consumer_multi.service, (svc4,),
+                              "Wrong service injected")
 
         # New service, matching the new filer
         svc5 = object()
@@ -221,8 +221,8 @@ class RequiresVarFilterTest(unittest.TestCase):
         self.assertListEqual([IPopoEvent.BOUND], consumer_multi.states,
                              "Invalid component states: {0}"
                              .format(consumer_multi.states))
-        self.assertListEqual(consumer_multi.service, [svc4, svc5],
-                             "Second service not injected")
+        self.assertTupleEqual(consumer_multi.service, (svc4, svc5),
+                              "Second service not injected")
 
         # Reset states
         for consumer in consumers:
@@ -242,8 +242,8 @@ class RequiresVarFilterTest(unittest.TestCase):
         self.assertListEqual([IPopoEvent.UNBOUND], consumer_multi.states,
                              "Invalid component states: {0}"
                              .format(consumer_multi.states))
-        self.assertListEqual(consumer_multi.service, [svc5],
-                             "First service not removed")
+        self.assertTupleEqual(consumer_multi.service, (svc5,),
+                              "First service not removed")
 
         # Reset states
         for consumer in consumers:
@@ -410,8 +410,8 @@ class RequiresVarFilterTest(unittest.TestCase):
             consumer.reset()
 
         self.assertIs(consumer_single.service, svc1, "Wrong service injected")
-        self.assertListEqual(consumer_multi.service, [svc1],
-                             "Wrong service injected")
+        self.assertTupleEqual(consumer_multi.service, (svc1,),
+                              "Wrong service injected")
 
     def test_incomplete_properties(self):
         """
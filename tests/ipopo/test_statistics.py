@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+# -- Content-Encoding: UTF-8 --
+"""
+Tests the life cycle statistics of iPOPO components
+
+:author: Thomas Calmant
+"""
+
+# Standard library
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+# Tests
+from tests.ipopo import install_bundle, install_ipopo
+
+# Pelix
+from pelix.framework import FrameworkFactory
+
+# iPOPO
+from pelix.ipopo.constants import IPOPO_CALLBACK_BIND, \
+    IPOPO_CALLBACK_INVALIDATE, IPOPO_CALLBACK_UNBIND, \
+    IPOPO_CALLBACK_VALIDATE
+from pelix.ipopo.instance import StoredInstance
+from pelix.ipopo.statistics import InstanceStatistics
+
+# ------------------------------------------------------------------------------
+
+__version__ = "1.0.0"
+
+NAME_A = "componentA"
+NAME_B = "componentB"
+
+# ------------------------------------------------------------------------------
+
+
+class InstanceStatisticsTest(unittest.TestCase):
+    """
+    Tests the InstanceStatistics class
+    """
+    def testEmpty(self):
+        """
+        Tests the statistics of a new component
+        """
+        stats = InstanceStatistics(StoredInstance.INVALID).to_dict()
+        self.assertEqual(stats["state"], StoredInstance.INVALID)
+        self.assertEqual(list(stats["state_times"]), [StoredInstance.INVALID])
+        self.assertGreaterEqual(
+            stats["state_times"][StoredInstance.INVALID], 0)
+        self.assertEqual(stats["flaps"], 0)
+        self.assertEqual(stats["dependencies"], {})
+        self.assertEqual(stats["callbacks"], {})
+
+    def testCallbacks(self):
+        """
+        Tests the aggregation of callback durations
+        """
+        stats = InstanceStatistics(StoredInstance.INVALID)
+        stats.callback_called(IPOPO_CALLBACK_VALIDATE, .5)
+        stats.callback_called(IPOPO_CALLBACK_VALIDATE, 1.5)
+        stats.callback_called(IPOPO_CALLBACK_VALIDATE, 1.)
+
+        entry = stats.to_dict()["callbacks"][IPOPO_CALLBACK_VALIDATE]
+        self.assertEqual(entry, {"calls": 3, "total": 3., "max": 1.5})
+
+    def testStates(self):
+        """
+        Tests the time spent in each state
+        """
+        stats = InstanceStatistics(StoredInstance.INVALID)
+        stats.state_changed(StoredInstance.VALID)
+        stats.state_changed(StoredInstance.VALID)
+        stats.state_changed(StoredInstance.INVALID)
+
+        result = stats.to_dict()
+        self.assertEqual(result["state"], StoredInstance.INVALID)
+        self.assertEqual(set(result["state_times"]),
+                         set((StoredInstance.INVALID, StoredInstance.VALID)))
+
+
+class ComponentStatisticsTest(unittest.TestCase):
+    """
+    Tests the statistics given by the iPOPO service
+    """
+    def setUp(self):
+        """
+        Called before each test. Initiates a framework.
+        """
+        self.framework = FrameworkFactory.get_framework()
+        self.framework.start()
+        self.ipopo = install_ipopo(self.framework)
+        self.module = install_bundle(self.framework)
+
+    def tearDown(self):
+        """
+        Called after each test
+        """
+        self.framework.stop()
+        FrameworkFactory.delete_framework()
+
+    def testLifeCycle(self):
+        """
+        Tests the statistics of a component losing its dependency
+        """
+        self.ipopo.instantiate(self.module.FACTORY_B, NAME_B)
+        stats = self.ipopo.get_instance_statistics(NAME_B)
+        self.assertEqual(stats["state"], StoredInstance.INVALID)
+        self.assertEqual(stats["dependencies"], {})
+        self.assertEqual(stats["flaps"], 0)
+
+        # Validate the component, then remove its dependency
+        self.ipopo.instantiate(self.module.FACTORY_A, NAME_A)
+        self.ipopo.kill(NAME_A)
+
+        stats = self.ipopo.get_instance_statistics(NAME_B)
+        self.assertEqual(stats["state"], StoredInstance.INVALID)
+        self.assertEqual(stats["flaps"], 1)
+        self.assertEqual(stats["dependencies"],
+                         {"service": {"bind": 1, "update": 0, "unbind": 1}})
+        self.assertIn(StoredInstance.VALID, stats["state_times"])
+        self.assertIn(StoredInstance.VALIDATING, stats["state_times"])
+
+        for event in (IPOPO_CALLBACK_BIND, IPOPO_CALLBACK_UNBIND,
+                      IPOPO_CALLBACK_VALIDATE, IPOPO_CALLBACK_INVALIDATE):
+            entry = stats["callbacks"][event]
+            self.assertEqual(entry["calls"], 1)
+            self.assertGreaterEqual(entry["total"], entry["max"])
+
+        # A manual invalidation isn't a flap
+        self.ipopo.instantiate(self.module.FACTORY_A, NAME_A)
+        self.ipopo.invalidate(NAME_B)
+        stats = self.ipopo.get_instance_statistics(NAME_B)
+        self.assertEqual(stats["flaps"], 1)
+        self.assertEqual(stats["callbacks"][IPOPO_CALLBACK_VALIDATE]["calls"],
+                         2)
+
+    def testUnknown(self):
+        """
+        Tests the statistics of an unknown component
+        """
+        self.assertRaises(ValueError, self.ipopo.get_instance_statistics,
+                          "<unknown>")
+        self.assertRaises(ValueError, self.ipopo.get_instance_statistics,
+                          None)
+
+# ------------------------------------------------------------------------------
+
+
+if __name__ == "__main__":
+    # Set logging level
+    import logging
+    logging.basicConfig(level=logging.DEBUG)
+
+    unittest.main()
@@ -147,6 +147,24 @@ class IPopoShellTest(unittest.TestCase):
                 self.assertIn(name, subout)
                 self.assertIn(factory, subout)
 
+    def testStatistics(self):
+        """
+        Tests the statistics command
+        """
+        with use_ipopo(self.framework.get_bundle_context()) as ipopo:
+            output = self._run_command('stats')
+            for name, _, _ in ipopo.get_instances():
+                self.assertIn(name, output)
+
+                # Details of an instance
+                subout = self._run_command('stats {0}', name)
+                self.assertIn(name, subout)
+                self.assertIn("Callbacks:", subout)
+
+            # Filter
+            output = self._run_command('stats <unknown>')
+            self.assertIn("0 filtered components", output)
+
     def testUnknownDetails(self):
         """
         Tests details of unknown factory or instance
@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+# -- Content-Encoding: UTF-8 --
+"""
+Tests the boot profiler shell commands
+
+:author: Thomas Calmant
+"""
+
+# Pelix
+from pelix.constants import FRAMEWORK_PROFILE
+import pelix.framework
+import pelix.shell
+import pelix.shell.beans as beans
+
+# Standard library
+import json
+import os
+import tempfile
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+# ------------------------------------------------------------------------------
+
+__version__ = "1.0.0"
+
+BUNDLES = ('pelix.ipopo.core', 'pelix.shell.core', 'pelix.shell.profiler')
+
+# ------------------------------------------------------------------------------
+
+
+class ProfilerShellTest(unittest.TestCase):
+    """
+    Tests the boot profiler shell commands
+    """
+    def setUp(self):
+        """
+        Prepares a framework with the boot profiler
+        """
+        self.framework = None
+
+    def tearDown(self):
+        """
+        Cleans up for next test
+        """
+        # Stop the framework
+        pelix.framework.FrameworkFactory.delete_framework(self.framework)
+        self.framework = None
+
+    def _start(self, properties=None):
+        """
+        Starts the framework and gets the shell service
+        """
+        self.framework = pelix.framework.create_framework(BUNDLES, properties)
+        self.framework.start()
+
+        context = self.framework.get_bundle_context()
+        svc_ref = context.get_service_reference(pelix.shell.SERVICE_SHELL)
+        self.shell = context.get_service(svc_ref)
+
+    def _run_command(self, command):
+        """
+        Runs the given command and returns the output stream
+        """
+        str_output = StringIO()
+        session = beans.ShellSession(beans.IOHandler(None, str_output))
+        self.shell.execute(command, session)
+        return str_output.getvalue()
+
+    def test_disabled(self):
+        """
+        Tests the commands when the profiler is disabled
+        """
+        self._start()
+        self.assertIsNone(self.framework.get_profiler())
+
+        for command in ("boot.profile", "boot.export dummy.json"):
+            self.assertIn("disabled", self._run_command(command))
+
+    def test_profile(self):
+        """
+        Tests the boot.profile command
+        """
+        self._start({FRAMEWORK_PROFILE: "true"})
+
+        profiler = self.framework.get_profiler()
+        steps = profiler.get_steps()
+        kinds = set((step["kind"], step["name"]) for step in steps)
+        for bundle in BUNDLES:
+            self.assertIn(("import", bundle), kinds)
+        self.assertIn(("activator", "pelix.shell.core"), kinds)
+        self.assertIn(("instantiate", "pelix-shell-profiler"), kinds)
+        self.assertIn(("validate", "pelix-shell-profiler"), kinds)
+
+        # The validation happens during the instantiation of the component
+        validation = [step for step in steps if step["kind"] == "validate"
+                      and step["name"] == "pelix-shell-profiler"][0]
+        parents = [step for step in steps
+                   if step["index"] == validation["parent"]]
+        self.assertEqual(parents[0]["kind"], "instantiate")
+
+        critical_path = profiler.get_critical_path()
+        self.assertTrue(critical_path)
+
+        output = self._run_command("boot.profile 3")
+        self.assertIn("Top 3 boot steps", output)
+        self.assertIn("Critical path", output)
+        self.assertIn(critical_path[0]["name"], output)
+
+    def test_export(self):
+        """
+        Tests the boot.export command
+        """
+        self._start({FRAMEWORK_PROFILE: True})
+
+        fd, filename = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        try:
+            output = self._run_command("boot.export {0}".format(filename))
+            self.assertIn(filename, output)
+
+            with open(filename) as filep:
+                profile = json.load(filep)
+        finally:
+            os.remove(filename)
+
+        self.assertEqual(profile["dropped"], 0)
+        self.assertEqual(
+            len(profile["steps"]),
+            len(self.framework.get_profiler().get_steps()))
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# -- Content-Encoding: UTF-8 --
+"""
+Tests the benchmark suite
+
+:author: Thomas Calmant
+"""
+
+# Standard library
+import json
+import os
+import sys
+import tempfile
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+# Pelix
+from pelix.benchmarks.__main__ import main
+import pelix.benchmarks.memory as memory
+import pelix.benchmarks.startup as startup
+
+# ------------------------------------------------------------------------------
+
+__version__ = "1.0.0"
+
+# ------------------------------------------------------------------------------
+
+
+class BenchmarksTest(unittest.TestCase):
+    """
+    Tests the benchmark suite
+    """
+    def test_startup(self):
+        """
+        Tests the startup benchmark
+        """
+        results = startup.run_benchmark(5, 3, 2, 2)
+        self.assertEqual(len(results["runs"]), 2)
+        for phase in startup.PHASES:
+            summary = results["summary"][phase]
+            self.assertLessEqual(summary["min"], summary["mean"])
+            self.assertLessEqual(summary["mean"], summary["max"])
+
+        # Generated modules have been cleaned up
+        self.assertFalse([name for name in sys.modules
+                          if name.startswith("_pelix_benchmark_")])
+
+    @unittest.skipIf(memory.tracemalloc is None, "tracemalloc is missing")
+    def test_memory(self):
+        """
+        Tests the memory benchmark
+        """
+        results = memory.run_benchmark(50)
+        self.assertEqual(results["parameters"]["instances"], 50)
+        self.assertGreater(results["per_instance"], 0)
+        self.assertAlmostEqual(results["per_instance"] * 50, results["total"])
+
+        # The benchmark can be run again
+        memory.run_benchmark(10)
+
+    def test_main(self):
+        """
+        Tests the command line entry point
+        """
+        fd, filename = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        try:
+            main(["-b", "3", "-c", "2", "-d", "1", "-r", "1", "-o", filename,
+                  "-p", "pelix.framework.start.threads=2"])
+            with open(filename) as filep:
+                results = json.load(filep)
+        finally:
+            os.remove(filename)
+
+        self.assertEqual(results["parameters"]["bundles"], 3)
+        self.assertEqual(results["parameters"]["properties"],
+                         {"pelix.framework.start.threads": "2"})
+        self.assertIn("python", results["environment"])
+        self.assertEqual(set(results["summary"]), set(startup.PHASES))
+
+
+if __name__ == "__main__":
+    unittest.main()
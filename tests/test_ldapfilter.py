@@ -104,6 +104,33 @@ class LDAPUtilitiesTest(unittest.TestCase):
                              "Invalid operator conversion '{0}': '{1}'"
                              .format(operator, conv_operator))
 
+    def testIsEquality(self):
+        """
+        Tests is_equality() and is_parsable()
+        """
+        for ldap_filter in ("(a=1)", "(a=abc)", "(&(a=1)(b=2))"):
+            parsed = get_ldap_filter(ldap_filter)
+            self.assertEqual(pelix.ldapfilter.is_equality(parsed),
+                             isinstance(parsed, pelix.ldapfilter.LDAPCriteria))
+
+        for ldap_filter in ("(a=*)", "(a=a*)", "(a~=1)", "(a<=1)", "(a>1)"):
+            self.assertFalse(pelix.ldapfilter.is_equality(
+                get_ldap_filter(ldap_filter)))
+
+        for ldap_filter in ("(a=1)", "(a=*)", "(a=a*)", "(a~=b*)", "(a<=1)",
+                            "(a>1)", "(a~=1)"):
+            self.assertTrue(pelix.ldapfilter.is_parsable(
+                get_ldap_filter(ldap_filter)))
+
+        # Criteria built by hand
+        self.assertFalse(pelix.ldapfilter.is_equality(None))
+        self.assertFalse(pelix.ldapfilter.is_parsable(
+            pelix.ldapfilter.LDAPCriteria(
+                "a", 1, pelix.ldapfilter._comparator_eq)))
+        self.assertFalse(pelix.ldapfilter.is_parsable(
+            pelix.ldapfilter.LDAPCriteria(
+                "a", "b*", pelix.ldapfilter._comparator_eq)))
+
     def testEscapeLDAP(self):
         """
         Tests escape_LDAP() and unescape_LDAP()
@@ -836,6 +863,162 @@ class LDAPFilterTest(unittest.TestCase):
                          "Filter '{0}' should not match {1}"
                          .format(ldap_filter, props))
 
+
+class LDAPCompileTest(unittest.TestCase):
+    """
+    Tests the compiled form of LDAP filters
+    """
+    def testEquivalence(self):
+        """
+        Checks that compiled matchers give the same results as the
+        interpretation of the filter tree
+        """
+        filters = ("(a=1)", "(a=abc)", "(a=*)", "(a=ab*)", "(a=*bc)",
+                   "(a=*b*)", "(a=a*b*c)", "(a~=ABC)", "(a~=*B*)",
+                   "(a<10)", "(a<=10)", "(a>10)", "(a>=10)", "(a<10.5)",
+                   "(a>=abc)", "(a=True)", "(!(a=1))", "(&(a=1)(b=2))",
+                   "(|(a=1)(b=2))", "(|(a=1)(b=2)(a=abc))",
+                   "(&(a>=1)(a<=10)(!(b=*)))",
+                   "(|(&(a=1)(b=2))(!(|(a=abc)(b~=x*))))")
+        values = (None, 1, 2, 10, 11, -5, 10.5, 9.5, 1 + 1j, True, False,
+                  "1", "2", "10", "abc", "ABC", "aXbYc", "b", "", "x",
+                  [], [1, 2], ["abc", "def"], ("1",), ["ABC", 12],
+                  set(["2"]), {"key": "value"})
+
+        for filter_str in filters:
+            ldap_filter = get_ldap_filter(filter_str)
+            for value_a in values:
+                for value_b in (None, 2, "x1", ["2"]):
+                    props = {"a": value_a}
+                    if value_b is not None:
+                        props["b"] = value_b
+
+                    self.assertEqual(
+                        ldap_filter.matches(props),
+                        bool(ldap_filter.interpret(props)),
+                        "Different results for {0} with {1}"
+                        .format(filter_str, props))
+
+        # Missing properties
+        for filter_str in filters:
+            ldap_filter = get_ldap_filter(filter_str)
+            self.assertEqual(ldap_filter.matches({}),
+                             bool(ldap_filter.interpret({})),
+                             "Different results for {0} without properties"
+                             .format(filter_str))
+
+    def testCache(self):
+        """
+        Tests the caching of the compiled matcher
+        """
+        ldap_filter = pelix.ldapfilter.LDAPFilter(pelix.ldapfilter.OR)
+        ldap_filter.append(get_ldap_filter("(a=1)"))
+        ldap_filter.append(get_ldap_filter("(b=2)"))
+        matcher = ldap_filter.compile()
+        self.assertIs(ldap_filter.compile(), matcher,
+                      "Matcher not cached")
+        self.assertTrue(ldap_filter.matches({"b": 2}))
+        self.assertFalse(ldap_filter.matches({"c": 3}))
+
+        # Append a criterion: the matcher must be updated
+        ldap_filter.append(get_ldap_filter("(c=3)"))
+        self.assertIsNot(ldap_filter.compile(), matcher,
+                         "Matcher not reset")
+        self.assertTrue(ldap_filter.matches({"c": 3}))
+
+        # Normalizing a normalized filter keeps the matcher
+        matcher = ldap_filter.compile()
+        self.assertIs(ldap_filter.normalize(), ldap_filter)
+        self.assertIs(ldap_filter.compile(), matcher,
+                      "Matcher reset by an idempotent normalization")
+
+        # Criteria are compiled too
+        criteria = get_ldap_filter("(a=*b*)")
+        self.assertIs(criteria.compile(), criteria.compile())
+        self.assertTrue(criteria.matches({"a": "abc"}))
+
+
+class LDAPCacheTest(unittest.TestCase):
+    """
+    Tests the cache of parsed filter strings
+    """
+    def setUp(self):
+        """
+        Starts with an empty cache
+        """
+        pelix.ldapfilter.clear_cache()
+
+    def tearDown(self):
+        """
+        Restores the default cache configuration
+        """
+        pelix.ldapfilter.set_cache_size(pelix.ldapfilter.DEFAULT_CACHE_SIZE)
+        pelix.ldapfilter.clear_cache()
+
+    def testHitsMisses(self):
+        """
+        Tests the cache statistics
+        """
+        info = pelix.ldapfilter.get_cache_info()
+        self.assertEqual(info["hits"], 0)
+        self.assertEqual(info["misses"], 0)
+        self.assertEqual(info["size"], 0)
+
+        ldap_filter = get_ldap_filter("(&(a=1)(b=2))")
+        self.assertIs(get_ldap_filter("(&(a=1)(b=2))"), ldap_filter,
+                      "Filter not cached")
+
+        info = pelix.ldapfilter.get_cache_info()
+        self.assertEqual(info["hits"], 1)
+        self.assertEqual(info["misses"], 1)
+        self.assertEqual(info["size"], 1)
+
+        # Invalid filters are not stored
+        self.assertRaises(ValueError, get_ldap_filter, "(&(a=1)")
+        self.assertRaises(ValueError, get_ldap_filter, "(&(a=1)")
+        info = pelix.ldapfilter.get_cache_info()
+        self.assertEqual(info["misses"], 3)
+        self.assertEqual(info["size"], 1)
+
+    def testBounds(self):
+        """
+        Tests the LRU eviction and the size configuration
+        """
+        pelix.ldapfilter.set_cache_size(2)
+        first = get_ldap_filter("(a=1)")
+        get_ldap_filter("(a=2)")
+
+        # Use the first one: the second one will be evicted
+        self.assertIs(get_ldap_filter("(a=1)"), first)
+        get_ldap_filter("(a=3)")
+        self.assertEqual(pelix.ldapfilter.get_cache_info()["size"], 2)
+        self.assertIs(get_ldap_filter("(a=1)"), first)
+
+        # Reduce the size
+        pelix.ldapfilter.set_cache_size(1)
+        self.assertEqual(pelix.ldapfilter.get_cache_info()["size"], 1)
+
+        # Disable the cache
+        pelix.ldapfilter.set_cache_size(0)
+        self.assertEqual(pelix.ldapfilter.get_cache_info()["size"], 0)
+        self.assertIsNot(get_ldap_filter("(a=1)"), get_ldap_filter("(a=1)"))
+
+    def testReadOnly(self):
+        """
+        Cached filters can't be modified
+        """
+        ldap_filter = get_ldap_filter("(|(a=1)(&(b=2)(c=3)))")
+        self.assertRaises(TypeError, ldap_filter.append,
+                          get_ldap_filter("(d=4)"))
+        self.assertRaises(TypeError, ldap_filter.subfilters[1].append,
+                          get_ldap_filter("(d=4)"))
+
+        # ... but they can still be combined
+        combined = pelix.ldapfilter.combine_filters(
+            [ldap_filter, "(d=4)"])
+        self.assertTrue(combined.matches({"a": 1, "d": 4}))
+        self.assertEqual(str(ldap_filter), "(|(a=1)(&(b=2)(c=3)))")
+
 # ------------------------------------------------------------------------------
 
 if __name__ == "__main__":